@@ -0,0 +1,191 @@
+"""
+Campañas de email a un segmento de clientes, con progreso reanudable
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from api_integrations.mime import ConstructorMensajes, construir_lote, iniciar_proceso
+from api_integrations.smtp_sesion import SesionSMTP
+from utils.limitador import LimitadorTasa
+
+class CampanaEmail:
+    """Envía un mensaje personalizado a todos los clientes de un segmento.
+
+    Los destinatarios se leen del DatabaseManager página a página (keyset
+    sobre id) y cada página se envía por un pool de sesiones SMTP bajo un
+    límite global de mensajes por segundo. Con procesos_mime > 0 los mensajes
+    se construyen y serializan en un pool de procesos (una página por delante
+    del envío) y los hilos solo los pasan a sendmail. Al terminar cada página se guarda
+    un checkpoint; si la campaña se interrumpe, volver a ejecutarla continúa
+    desde la última página completa, así que como máximo se repite una página.
+    """
+
+    def __init__(self, nombre, servicio, db_manager, segmento, asunto, plantilla, formato='html',
+                 directorio="campanas", tamaño_pagina=500, num_conexiones=4, mensajes_por_segundo=None,
+                 procesos_mime=0, tamaño_lote_mime=50):
+        self.nombre = nombre
+        self.servicio = servicio
+        self.db_manager = db_manager
+        self.segmento = segmento
+        self.asunto = asunto
+        self.plantilla = plantilla
+        self.formato = formato
+        self.procesos_mime = procesos_mime
+        self.tamaño_lote_mime = tamaño_lote_mime
+        self.remitente = servicio.config["sender_email"]
+        # Los campos que un cliente no tiene quedan vacíos
+        self._constructor = ConstructorMensajes(self.remitente, asunto, plantilla, formato)
+        self.tamaño_pagina = tamaño_pagina
+        self.num_conexiones = num_conexiones
+        self.limitador = (LimitadorTasa(mensajes_por_segundo,
+                                        capacidad=max(1, min(mensajes_por_segundo, num_conexiones)))
+                          if mensajes_por_segundo else None)
+        self.ruta_checkpoint = os.path.join(directorio, f"{nombre}.json")
+        self.ruta_fallidos = os.path.join(directorio, f"{nombre}.fallidos")
+        self._detener = threading.Event()
+        self._local = threading.local()
+        self._sesiones = []
+        self._lock = threading.Lock()
+
+    def _cargar_checkpoint(self):
+        if os.path.exists(self.ruta_checkpoint):
+            with open(self.ruta_checkpoint, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+            if checkpoint.get('segmento') != self.segmento:
+                raise ValueError(f"El checkpoint de la campaña '{self.nombre}' es de otro segmento")
+            return checkpoint
+
+        return {
+            'nombre': self.nombre,
+            'segmento': self.segmento,
+            'ultimo_id': 0,
+            'enviados': 0,
+            'fallidos': 0,
+            'completada': False,
+            'inicio': datetime.now().isoformat()
+        }
+
+    def _guardar_checkpoint(self, checkpoint):
+        os.makedirs(os.path.dirname(self.ruta_checkpoint) or ".", exist_ok=True)
+        checkpoint['actualizado'] = datetime.now().isoformat()
+        temporal = self.ruta_checkpoint + ".tmp"
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f, indent=2, ensure_ascii=False)
+        os.replace(temporal, self.ruta_checkpoint)
+
+    def progreso(self):
+        return self._cargar_checkpoint()
+
+    def renderizar(self, info):
+        return self._constructor.renderizar(info)
+
+    def _sesion_del_hilo(self):
+        sesion = getattr(self._local, 'sesion', None)
+        if sesion is None:
+            sesion = self._local.sesion = SesionSMTP(self.servicio.config)
+            with self._lock:
+                self._sesiones.append(sesion)
+        return sesion
+
+    def _enviar_construido(self, construido):
+        cliente_id, email, datos = construido
+        if not isinstance(datos, bytes):
+            return f"{cliente_id}\t{email}\t{datos}"
+        try:
+            if self.limitador:
+                self.limitador.adquirir()
+            self._sesion_del_hilo().enviar_bytes(self.remitente, [email], datos)
+            return None
+        except Exception as e:
+            return f"{cliente_id}\t{email}\t{e}"
+
+    def _enviar(self, fila):
+        return self._enviar_construido(self._constructor.construir(fila))
+
+    def _construir_por_adelantado(self, paginas, pool):
+        """Envía cada página a construir antes de devolver la anterior"""
+        anterior = None
+        for filas in paginas:
+            lotes = [pool.submit(construir_lote, filas[i:i + self.tamaño_lote_mime])
+                     for i in range(0, len(filas), self.tamaño_lote_mime)]
+            if anterior is not None:
+                yield anterior
+            anterior = (filas, lotes)
+        if anterior is not None:
+            yield anterior
+
+    def _paginas_con_errores(self, paginas, executor, pool):
+        """(filas, errores) de cada página enviada"""
+        if pool is None:
+            for filas in paginas:
+                yield filas, [error for error in executor.map(self._enviar, filas) if error]
+            return
+
+        for filas, lotes in self._construir_por_adelantado(paginas, pool):
+            envios = [executor.submit(self._enviar_construido, construido)
+                      for lote in lotes for construido in lote.result()]
+            yield filas, [error for error in (envio.result() for envio in envios) if error]
+
+    def detener(self):
+        """Pide detener la campaña al terminar la página en curso"""
+        self._detener.set()
+
+    def ejecutar(self, progreso=None):
+        """Envía (o continúa) la campaña; devuelve el checkpoint final"""
+        from concurrent.futures import ThreadPoolExecutor
+        from contextlib import nullcontext
+
+        checkpoint = self._cargar_checkpoint()
+        if checkpoint['completada']:
+            return checkpoint
+
+        self._detener.clear()
+        inicio = time.perf_counter()
+        paginas = self.db_manager.iterar_segmento(
+            tipo=self.segmento.get('tipo'), datos=self.segmento.get('datos'),
+            solo_activos=self.segmento.get('solo_activos', True),
+            desde_id=checkpoint['ultimo_id'], tamaño_pagina=self.tamaño_pagina)
+
+        pool = None
+        if self.procesos_mime:
+            from concurrent.futures import ProcessPoolExecutor
+            pool = ProcessPoolExecutor(max_workers=self.procesos_mime, initializer=iniciar_proceso,
+                                       initargs=(self.remitente, self.asunto, self.plantilla, self.formato))
+
+        try:
+            with pool or nullcontext(), ThreadPoolExecutor(max_workers=self.num_conexiones) as executor:
+                for filas, errores in self._paginas_con_errores(paginas, executor, pool):
+                    if errores:
+                        os.makedirs(os.path.dirname(self.ruta_fallidos) or ".", exist_ok=True)
+                        with open(self.ruta_fallidos, 'a', encoding='utf-8') as f:
+                            f.write("\n".join(errores) + "\n")
+
+                    checkpoint['ultimo_id'] = filas[-1][0]
+                    checkpoint['enviados'] += len(filas) - len(errores)
+                    checkpoint['fallidos'] += len(errores)
+                    self._guardar_checkpoint(checkpoint)
+
+                    if progreso:
+                        progreso(checkpoint)
+                    if self._detener.is_set():
+                        break
+                else:
+                    checkpoint['completada'] = True
+                    self._guardar_checkpoint(checkpoint)
+        finally:
+            paginas.close()
+            with self._lock:
+                for sesion in self._sesiones:
+                    sesion.cerrar()
+                self._sesiones = []
+            self._local = threading.local()
+
+        segundos = time.perf_counter() - inicio
+        estado = "completada" if checkpoint['completada'] else "pausada"
+        print(f"Campaña '{self.nombre}' {estado}: {checkpoint['enviados']} enviados, "
+              f"{checkpoint['fallidos']} fallidos ({segundos:.1f} s)")
+        return checkpoint
@@ -0,0 +1,229 @@
+"""
+Veredictos de email a nivel de dominio: índice offline de dominios
+desechables/bloqueados y caché persistente con TTL
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+RUTA_DESECHABLES = os.path.join("config", "dominios_desechables.txt")
+RUTA_BLOQUEADOS = os.path.join("config", "dominios_bloqueados.txt")
+
+def normalizar_dominio(dominio):
+    return dominio.strip().strip('.').lower()
+
+class IndiceDominios:
+    """Conjunto de dominios con coincidencia por sufijo (incluye subdominios)"""
+
+    def __init__(self, dominios=()):
+        self._dominios = set()
+        self.consultas = 0
+        self.aciertos = 0
+        for dominio in dominios:
+            self.agregar(dominio)
+
+    @classmethod
+    def desde_archivo(cls, ruta):
+        if not os.path.exists(ruta):
+            return cls()
+        with open(ruta, 'r', encoding='utf-8') as f:
+            return cls(linea.split('#', 1)[0] for linea in f)
+
+    def agregar(self, dominio):
+        dominio = normalizar_dominio(dominio)
+        if dominio:
+            self._dominios.add(dominio)
+
+    def contiene(self, dominio):
+        self.consultas += 1
+        partes = normalizar_dominio(dominio).split('.')
+        for i in range(len(partes) - 1):
+            if '.'.join(partes[i:]) in self._dominios:
+                self.aciertos += 1
+                return True
+        return False
+
+    def __len__(self):
+        return len(self._dominios)
+
+    def estadisticas(self):
+        return {
+            'dominios': len(self._dominios),
+            'consultas': self.consultas,
+            'aciertos': self.aciertos,
+            'tasa_aciertos': self.aciertos / self.consultas if self.consultas else 0.0
+        }
+
+class CacheDominios:
+    """Veredictos por dominio en memoria, respaldados en SQLite con expiración"""
+
+    def __init__(self, db_name="cache_dominios.db", ttl_segundos=7 * 86400):
+        self.db_name = db_name
+        self.ttl_segundos = ttl_segundos
+        self._memoria = {}
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self._init_database()
+
+    def _init_database(self):
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS veredictos_dominio (
+                dominio TEXT PRIMARY KEY,
+                veredicto TEXT NOT NULL,
+                expira REAL NOT NULL
+            )
+        ''')
+        cursor.execute('DELETE FROM veredictos_dominio WHERE expira <= ?', (time.time(),))
+        cursor.execute('SELECT dominio, veredicto, expira FROM veredictos_dominio')
+        self._memoria = {dominio: (json.loads(veredicto), expira)
+                         for dominio, veredicto, expira in cursor.fetchall()}
+        conn.commit()
+        conn.close()
+
+    def obtener(self, dominio):
+        dominio = normalizar_dominio(dominio)
+        with self._lock:
+            entrada = self._memoria.get(dominio)
+            if entrada is not None and entrada[1] > time.time():
+                self.aciertos += 1
+                return entrada[0]
+            if entrada is not None:
+                del self._memoria[dominio]
+            self.fallos += 1
+            return None
+
+    def guardar(self, dominio, veredicto, ttl_segundos=None):
+        dominio = normalizar_dominio(dominio)
+        expira = time.time() + (ttl_segundos or self.ttl_segundos)
+        with self._lock:
+            self._memoria[dominio] = (veredicto, expira)
+
+        try:
+            conn = sqlite3.connect(self.db_name)
+            conn.execute('INSERT OR REPLACE INTO veredictos_dominio VALUES (?, ?, ?)',
+                         (dominio, json.dumps(veredicto), expira))
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            print(f"Error guardando veredicto de dominio {dominio}: {e}")
+
+    def purgar_expirados(self):
+        ahora = time.time()
+        with self._lock:
+            for dominio in [d for d, (_, expira) in self._memoria.items() if expira <= ahora]:
+                del self._memoria[dominio]
+
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM veredictos_dominio WHERE expira <= ?', (ahora,))
+        eliminados = cursor.rowcount
+        conn.commit()
+        conn.close()
+        return eliminados
+
+    def invalidar(self, dominio=None):
+        with self._lock:
+            if dominio is None:
+                self._memoria.clear()
+            else:
+                self._memoria.pop(normalizar_dominio(dominio), None)
+
+        conn = sqlite3.connect(self.db_name)
+        if dominio is None:
+            conn.execute('DELETE FROM veredictos_dominio')
+        else:
+            conn.execute('DELETE FROM veredictos_dominio WHERE dominio = ?',
+                         (normalizar_dominio(dominio),))
+        conn.commit()
+        conn.close()
+
+    def estadisticas(self):
+        total = self.aciertos + self.fallos
+        return {
+            'dominios': len(self._memoria),
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'tasa_aciertos': self.aciertos / total if total else 0.0
+        }
+
+_indices = {}
+_lock_indices = threading.Lock()
+
+def indice_por_defecto(ruta):
+    """Índice cargado una sola vez por proceso para la ruta dada"""
+    with _lock_indices:
+        if ruta not in _indices:
+            _indices[ruta] = IndiceDominios.desde_archivo(ruta)
+        return _indices[ruta]
+
+def actualizar_lista(origen, destino=RUTA_DESECHABLES):
+    """Descarga (http/https) o copia una lista de dominios y la reemplaza de forma atómica"""
+    if origen.startswith(("http://", "https://")):
+        import requests
+        respuesta = requests.get(origen, timeout=30)
+        respuesta.raise_for_status()
+        contenido = respuesta.text
+    else:
+        with open(origen, 'r', encoding='utf-8') as f:
+            contenido = f.read()
+
+    dominios = sorted({normalizar_dominio(linea.split('#', 1)[0]) for linea in contenido.splitlines()} - {''})
+
+    directorio = os.path.dirname(destino)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    temporal = destino + ".tmp"
+    with open(temporal, 'w', encoding='utf-8') as f:
+        f.write("\n".join(dominios) + "\n")
+    os.replace(temporal, destino)
+
+    with _lock_indices:
+        _indices.pop(destino, None)
+    return len(dominios)
+
+def main():
+    parser = argparse.ArgumentParser(description="Mantenimiento de listas y caché de dominios de email")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    actualizar = subparsers.add_parser("actualizar", help="Actualiza la lista de dominios desechables")
+    actualizar.add_argument("origen", help="URL o archivo con un dominio por línea")
+    actualizar.add_argument("--destino", default=RUTA_DESECHABLES)
+
+    purgar = subparsers.add_parser("purgar", help="Elimina veredictos expirados (o todos con --todo)")
+    purgar.add_argument("--cache", default="cache_dominios.db")
+    purgar.add_argument("--todo", action="store_true")
+
+    estadisticas = subparsers.add_parser("estadisticas", help="Muestra el tamaño de listas y caché")
+    estadisticas.add_argument("--cache", default="cache_dominios.db")
+
+    args = parser.parse_args()
+
+    if args.comando == "actualizar":
+        total = actualizar_lista(args.origen, args.destino)
+        print(f"Lista actualizada: {total:,} dominios en {args.destino}")
+    elif args.comando == "purgar":
+        cache = CacheDominios(args.cache)
+        if args.todo:
+            cache.invalidar()
+            print("Caché de dominios vaciada")
+        else:
+            print(f"Veredictos expirados eliminados: {cache.purgar_expirados()}")
+    else:
+        print(f"Dominios desechables: {len(IndiceDominios.desde_archivo(RUTA_DESECHABLES)):,}")
+        print(f"Dominios bloqueados:  {len(IndiceDominios.desde_archivo(RUTA_BLOQUEADOS)):,}")
+        print(f"Veredictos en caché:  {CacheDominios(args.cache).estadisticas()['dominios']:,}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,16 +2,146 @@
 Integración con API de validación de emails
 """
 
-import requests
 import re
+import time
+import random
+import threading
 from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+
+from utils.configuracion import obtener_configuracion
+from utils.limitador import LimitadorTasa
+from api_integrations.dominios import RUTA_DESECHABLES, RUTA_BLOQUEADOS, CacheDominios, indice_por_defecto
+
+PATRON_EMAIL = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
 
 class EmailValidator(ABC):
     """Clase abstracta para validación de emails"""
     
+    def __init__(self, indice_desechables=None, indice_bloqueados=None, cache_dominios=None):
+        self.indice_desechables = (indice_desechables if indice_desechables is not None
+                                   else indice_por_defecto(RUTA_DESECHABLES))
+        self.indice_bloqueados = (indice_bloqueados if indice_bloqueados is not None
+                                  else indice_por_defecto(RUTA_BLOQUEADOS))
+        self.cache_dominios = cache_dominios
+    
     @abstractmethod
     def validar_email(self, email):
         pass
+    
+    @staticmethod
+    def _formato_invalido(email):
+        """Resultado de rechazo si el email no tiene formato válido, o None"""
+        if isinstance(email, str) and PATRON_EMAIL.match(email):
+            return None
+        return {
+            'valido': False,
+            'mensaje': 'Formato de email inválido',
+            'detalles': {}
+        }
+    
+    def _veredicto_local(self, email):
+        """Rechazo decidido sin salir del proceso (formato o dominio), o None si hay que consultar"""
+        return self._formato_invalido(email) or self._veredicto_dominio_local(email.rsplit('@', 1)[-1])
+    
+    def _veredicto_dominio_local(self, dominio):
+        """Rechazo del dominio decidido sin salir del proceso, o None si el dominio debe consultarse"""
+        if self.indice_bloqueados.contiene(dominio):
+            return {
+                'valido': False,
+                'mensaje': 'Dominio bloqueado',
+                'detalles': {'dominio': dominio, 'bloqueado': True}
+            }
+        
+        if self.indice_desechables.contiene(dominio):
+            return {
+                'valido': False,
+                'mensaje': 'Email detectado como temporal/falso',
+                'detalles': {
+                    'dominio': dominio,
+                    'score': 0.1,
+                    'disposable': True,
+                    'risk_level': 'high'
+                }
+            }
+        
+        if self.cache_dominios is not None:
+            # Solo se reutilizan veredictos negativos: un dominio válido no garantiza que lo sea cada dirección
+            veredicto = self.cache_dominios.obtener(dominio)
+            if veredicto is not None and not veredicto['valido']:
+                return {
+                    'valido': veredicto['valido'],
+                    'mensaje': veredicto['mensaje'],
+                    'detalles': dict(veredicto['detalles'], en_cache=True)
+                }
+        
+        return None
+    
+    async def validar_email_async(self, email):
+        """Variante asíncrona de validar_email; por defecto la ejecuta en un hilo"""
+        import asyncio
+        
+        return await asyncio.get_running_loop().run_in_executor(None, self.validar_email, email)
+    
+    async def validar_lote_async(self, emails, max_concurrencia=50, max_por_dominio=5, timeout=10.0):
+        """Valida una lista de emails de forma concurrente; devuelve los resultados en el mismo orden"""
+        resultados = await self._validar_concurrente(
+            list(dict.fromkeys(emails)), self.validar_email_async,
+            max_concurrencia, max_por_dominio, timeout)
+        return [resultados[email] for email in emails]
+    
+    @staticmethod
+    def _intercalar_por_dominio(emails):
+        colas = defaultdict(deque)
+        for email in emails:
+            colas[email.rsplit('@', 1)[-1].lower()].append(email)
+        
+        colas = deque(colas.values())
+        while colas:
+            cola = colas.popleft()
+            yield cola.popleft()
+            if cola:
+                colas.append(cola)
+    
+    async def _validar_concurrente(self, emails, validar, max_concurrencia, max_por_dominio, timeout):
+        """Reparte los emails entre max_concurrencia tareas, turnando dominios y
+        limitando a max_por_dominio las validaciones simultáneas de un mismo dominio"""
+        import asyncio
+        
+        resultados = {}
+        pendientes = self._intercalar_por_dominio(emails)
+        semaforos = defaultdict(lambda: asyncio.Semaphore(max_por_dominio))
+        
+        async def trabajador():
+            for email in pendientes:
+                async with semaforos[email.rsplit('@', 1)[-1].lower()]:
+                    try:
+                        if timeout is None:
+                            resultados[email] = await validar(email)
+                        else:
+                            resultados[email] = await asyncio.wait_for(validar(email), timeout)
+                    except asyncio.TimeoutError:
+                        resultados[email] = {
+                            'valido': False,
+                            'mensaje': 'Tiempo de espera agotado',
+                            'detalles': {}
+                        }
+                    except Exception as e:
+                        resultados[email] = {
+                            'valido': False,
+                            'mensaje': f'Error en validación: {str(e)}',
+                            'detalles': {}
+                        }
+        
+        await asyncio.gather(*(trabajador() for _ in range(min(max_concurrencia, len(emails)))))
+        return resultados
+    
+    def estadisticas_dominios(self):
+        return {
+            'desechables': self.indice_desechables.estadisticas(),
+            'bloqueados': self.indice_bloqueados.estadisticas(),
+            'cache': self.cache_dominios.estadisticas() if self.cache_dominios is not None else None
+        }
 
 class SimpleEmailValidator(EmailValidator):
     """Validador simple de emails (sin API real)"""
@@ -19,17 +149,13 @@ class SimpleEmailValidator(EmailValidator):
     def validar_email(self, email):
         """Valida el formato y dominio del email"""
         try:
-            # Validación básica de formato
-            patron = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-            if not re.match(patron, email):
-                return {
-                    'valido': False,
-                    'mensaje': 'Formato de email inválido',
-                    'detalles': {}
-                }
+            resultado = self._veredicto_local(email)
+            if resultado is not None:
+                return resultado
             
-            # Simular validación de dominio
             dominio = email.split('@')[1]
+            
+            # Simular validación de dominio
             dominios_populares = ['gmail.com', 'hotmail.com', 'yahoo.com', 'outlook.com']
             
             if dominio in dominios_populares:
@@ -59,20 +185,300 @@ class SimpleEmailValidator(EmailValidator):
                 'mensaje': f'Error en validación: {str(e)}',
                 'detalles': {}
             }
+    
+    async def validar_email_async(self, email):
+        """La validación es local y no bloquea, así que se ejecuta en el propio bucle"""
+        return self.validar_email(email)
+    
+    async def validar_lote_async(self, emails, max_concurrencia=50, max_por_dominio=5, timeout=None):
+        return await super().validar_lote_async(emails, max_concurrencia, max_por_dominio, timeout)
 
 class APIBasedEmailValidator(EmailValidator):
-    """Validador de emails con API externa (simulada)"""
+    """Validador de emails con API externa
     
-    def __init__(self, api_key=None):
+    Sin api_key se usa la respuesta simulada. Con api_key las peticiones van
+    por una sesión HTTP persistente (pool de conexiones), limitadas por una
+    cubeta de tokens y con reintentos con backoff exponencial y jitter.
+    
+    Los emails mal formados y los de dominios desechables o bloqueados se
+    rechazan sin consultar la API; con cache_dominios también los dominios que
+    la API marcó como desechables, mientras dure su TTL. El resto de los emails
+    se consulta siempre, cada uno por su cuenta.
+    """
+    
+    ESTADOS_REINTENTABLES = (429, 500, 502, 503, 504)
+    
+    def __init__(self, api_key=None, base_url="https://api.emailvalidator.com/v1/",
+                 max_conexiones=10, peticiones_por_segundo=None, max_reintentos=3,
+                 backoff_base=0.5, backoff_maximo=30.0, timeout=10.0,
+                 modo_lote=True, tamaño_lote=100, indice_desechables=None,
+                 indice_bloqueados=None, cache_dominios=None):
+        super().__init__(indice_desechables, indice_bloqueados, cache_dominios)
         self.api_key = api_key
-        self.base_url = "https://api.emailvalidator.com/v1/"  # URL simulada
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+        self.max_conexiones = max_conexiones
+        self.max_reintentos = max_reintentos
+        self.backoff_base = backoff_base
+        self.backoff_maximo = backoff_maximo
+        self.timeout = timeout
+        self.modo_lote = modo_lote
+        self.tamaño_lote = tamaño_lote
+        self.limitador = LimitadorTasa(peticiones_por_segundo) if peticiones_por_segundo else None
+        self.estadisticas = {'peticiones': 0, 'reintentos': 0, 'errores': 0}
+        self._sesion = None
+        self._executor = None
+        self._lock = threading.Lock()
+    
+    def _contar(self, clave):
+        with self._lock:
+            self.estadisticas[clave] += 1
+    
+    def _obtener_sesion(self):
+        with self._lock:
+            if self._sesion is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                
+                sesion = requests.Session()
+                adaptador = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_conexiones)
+                sesion.mount("http://", adaptador)
+                sesion.mount("https://", adaptador)
+                sesion.headers.update({
+                    'Authorization': f'Bearer {self.api_key}',
+                    'Accept': 'application/json'
+                })
+                self._sesion = sesion
+            return self._sesion
+    
+    def _espera_reintento(self, intento, respuesta=None):
+        if respuesta is not None:
+            retry_after = respuesta.headers.get('Retry-After')
+            if retry_after:
+                try:
+                    return min(self.backoff_maximo, float(retry_after))
+                except ValueError:
+                    pass
+        return random.uniform(0, min(self.backoff_maximo, self.backoff_base * 2 ** intento))
+    
+    def _solicitar(self, metodo, ruta, **kwargs):
+        import requests
+        
+        sesion = self._obtener_sesion()
+        url = self.base_url + ruta
+        
+        for intento in range(self.max_reintentos + 1):
+            if self.limitador:
+                self.limitador.adquirir()
+            
+            respuesta = None
+            self._contar('peticiones')
+            try:
+                respuesta = sesion.request(metodo, url, timeout=self.timeout, **kwargs)
+                if respuesta.status_code not in self.ESTADOS_REINTENTABLES:
+                    respuesta.raise_for_status()
+                    return respuesta.json()
+                error = requests.HTTPError(f"HTTP {respuesta.status_code}", response=respuesta)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            
+            if intento == self.max_reintentos:
+                raise error
+            self._contar('reintentos')
+            time.sleep(self._espera_reintento(intento, respuesta))
+    
+    @staticmethod
+    def _convertir_respuesta(datos):
+        valido = bool(datos.get('valid', False))
+        detalles = {
+            'score': datos.get('score'),
+            'disposable': datos.get('disposable', False),
+            'risk_level': datos.get('risk_level'),
+            'deliverable': datos.get('deliverable', valido)
+        }
+        mensaje = datos.get('message') or ('Email válido' if valido else 'Email no válido según API')
+        return {'valido': valido, 'mensaje': mensaje, 'detalles': detalles}
+    
+    def _resultado_error(self, error):
+        self._contar('errores')
+        return {
+            'valido': False,
+            'mensaje': f'Error en API: {str(error)}',
+            'detalles': {}
+        }
+    
+    def _recordar_dominio(self, dominio, resultado):
+        detalles = resultado['detalles']
+        if self.cache_dominios is None or not detalles.get('disposable'):
+            return
+        
+        self.cache_dominios.guardar(dominio, {
+            'valido': False,
+            'mensaje': 'Email detectado como temporal/falso',
+            'detalles': {
+                'dominio': dominio,
+                'score': detalles.get('score'),
+                'disposable': True,
+                'risk_level': detalles.get('risk_level')
+            }
+        })
+    
+    def _validar_remoto(self, email):
+        try:
+            return self._convertir_respuesta(self._solicitar('GET', 'validate', params={'email': email}))
+        except Exception as e:
+            return self._resultado_error(e)
     
     def validar_email(self, email):
-        """Valida email usando API externa (simulación)"""
+        """Valida email usando la API externa (o la simulación si no hay api_key)"""
+        resultado = self._veredicto_local(email)
+        if resultado is not None:
+            return resultado
+        
+        if self.api_key is None:
+            return self._simular_validacion(email)
+        
+        resultado = self._validar_remoto(email)
+        self._recordar_dominio(email.rsplit('@', 1)[-1], resultado)
+        return resultado
+    
+    def _validar_bloque(self, emails):
+        try:
+            datos = self._solicitar('POST', 'validate/batch', json={'emails': emails})
+            por_email = {r.get('email'): r for r in datos.get('results', [])}
+        except Exception as e:
+            respuesta = getattr(e, 'response', None)
+            if respuesta is not None and respuesta.status_code in (404, 405, 501):
+                print("Endpoint de lote no disponible, validando email por email")
+                self.modo_lote = False
+                return [self._validar_remoto(email) for email in emails]
+            return [self._resultado_error(e) for _ in emails]
+        
+        return [self._convertir_respuesta(por_email[email]) if email in por_email
+                else self._resultado_error(f"Sin resultado para {email}")
+                for email in emails]
+    
+    def _consultar_api(self, emails, max_concurrencia):
+        from concurrent.futures import ThreadPoolExecutor
+        
+        resultados = {}
+        if not emails:
+            return resultados
+        
+        with ThreadPoolExecutor(max_workers=max_concurrencia) as executor:
+            if self.modo_lote:
+                bloques = [emails[i:i + self.tamaño_lote]
+                           for i in range(0, len(emails), self.tamaño_lote)]
+                for bloque, resultados_bloque in zip(bloques, executor.map(self._validar_bloque, bloques)):
+                    resultados.update(zip(bloque, resultados_bloque))
+            else:
+                resultados.update(zip(emails, executor.map(self._validar_remoto, emails)))
+        
+        for email, resultado in resultados.items():
+            self._recordar_dominio(email.rsplit('@', 1)[-1], resultado)
+        return resultados
+    
+    def _resolver_localmente(self, emails, resultados):
+        pendientes = []
+        for email in emails:
+            resultado = self._veredicto_local(email)
+            if resultado is not None:
+                resultados[email] = resultado
+            else:
+                pendientes.append(email)
+        return pendientes
+    
+    def validar_lote(self, emails, max_concurrencia=None):
+        """Valida una lista de emails; devuelve los resultados en el mismo orden"""
+        if self.api_key is None:
+            resultados = {email: self.validar_email(email) for email in dict.fromkeys(emails)}
+            return [resultados[email] for email in emails]
+        
+        max_concurrencia = max_concurrencia or self.max_conexiones
+        resultados = {}
+        pendientes = self._resolver_localmente(dict.fromkeys(emails), resultados)
+        resultados.update(self._consultar_api(pendientes, max_concurrencia))
+        return [resultados[email] for email in emails]
+    
+    def _obtener_executor(self):
+        from concurrent.futures import ThreadPoolExecutor
+        
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_conexiones)
+            return self._executor
+    
+    async def _en_executor(self, funcion, *args):
+        import asyncio
+        
+        return await asyncio.get_running_loop().run_in_executor(self._obtener_executor(), funcion, *args)
+    
+    async def validar_email_async(self, email):
+        """Como validar_email, pero la petición HTTP se hace sin bloquear el bucle de eventos"""
+        resultado = self._veredicto_local(email)
+        if resultado is not None:
+            return resultado
+        
+        if self.api_key is None:
+            return self._simular_validacion(email)
+        
+        resultado = await self._en_executor(self._validar_remoto, email)
+        self._recordar_dominio(email.rsplit('@', 1)[-1], resultado)
+        return resultado
+    
+    async def _consultar_api_async(self, emails, max_concurrencia, max_por_dominio, timeout):
+        import asyncio
+        
+        if not emails:
+            return {}
+        
+        if not self.modo_lote:
+            return await self._validar_concurrente(
+                emails, self.validar_email_async, max_concurrencia, max_por_dominio, timeout)
+        
+        semaforo = asyncio.Semaphore(max_concurrencia)
+        
+        async def validar_bloque(bloque):
+            async with semaforo:
+                try:
+                    return await asyncio.wait_for(self._en_executor(self._validar_bloque, bloque), timeout)
+                except asyncio.TimeoutError:
+                    return [self._resultado_error("Tiempo de espera agotado") for _ in bloque]
+        
+        bloques = [emails[i:i + self.tamaño_lote] for i in range(0, len(emails), self.tamaño_lote)]
+        resultados = {}
+        for bloque, resultados_bloque in zip(bloques, await asyncio.gather(*map(validar_bloque, bloques))):
+            resultados.update(zip(bloque, resultados_bloque))
+        
+        for email, resultado in resultados.items():
+            self._recordar_dominio(email.rsplit('@', 1)[-1], resultado)
+        return resultados
+    
+    async def validar_lote_async(self, emails, max_concurrencia=None, max_por_dominio=5, timeout=None):
+        """Variante asíncrona de validar_lote con concurrencia acotada y reparto justo por dominio"""
+        max_concurrencia = max_concurrencia or self.max_conexiones
+        timeout = timeout or self.timeout * (self.max_reintentos + 1)
+        
+        if self.api_key is None:
+            return await super().validar_lote_async(emails, max_concurrencia, max_por_dominio, timeout)
+        
+        resultados = {}
+        pendientes = self._resolver_localmente(dict.fromkeys(emails), resultados)
+        resultados.update(await self._consultar_api_async(
+            pendientes, max_concurrencia, max_por_dominio, timeout))
+        return [resultados[email] for email in emails]
+    
+    def cerrar(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            if self._sesion is not None:
+                self._sesion.close()
+                self._sesion = None
+    
+    def _simular_validacion(self, email):
+        """Respuesta simulada usada cuando no hay api_key configurada"""
         try:
-            # En una implementación real, aquí haríamos una petición HTTP
-            # Por ahora simulamos la respuesta
-            
             # Simular diferentes casos
             if 'test' in email or 'fake' in email:
                 return {
@@ -112,4 +518,20 @@ class APIBasedEmailValidator(EmailValidator):
                 'valido': False,
                 'mensaje': f'Error en API: {str(e)}',
                 'detalles': {}
-            }
\ No newline at end of file
+            }
+
+def crear_validador(config_file=None):
+    """Validador según config/validacion_config.json: con api_key usa la API, si no el simple"""
+    config = obtener_configuracion('validacion', config_file).actual()
+    if not config.get("api_key"):
+        return SimpleEmailValidator()
+    
+    return APIBasedEmailValidator(
+        api_key=config["api_key"],
+        base_url=config["base_url"],
+        max_conexiones=config["max_conexiones"],
+        peticiones_por_segundo=config["peticiones_por_segundo"],
+        max_reintentos=config["max_reintentos"],
+        timeout=config["timeout"],
+        cache_dominios=CacheDominios(config["cache_dominios"]) if config.get("cache_dominios") else None
+    )
@@ -0,0 +1,53 @@
+"""
+Construcción y serialización de mensajes MIME, también desde procesos aparte
+"""
+
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+
+from api_integrations.plantillas import PlantillaCompilada
+from database.mapeo import fila_a_dict
+
+def construir_mime(remitente, destinatario, asunto, cuerpo, formato='plain'):
+    msg = MIMEMultipart()
+    msg['Subject'] = asunto
+    msg['From'] = remitente
+    msg['To'] = destinatario
+    msg.attach(MIMEText(cuerpo, formato))
+    return msg
+
+def serializar(mensaje):
+    """Bytes listos para sendmail (saltos de línea CRLF, como los escribe send_message)"""
+    return mensaje.as_bytes(policy=mensaje.policy.clone(linesep='\r\n'))
+
+class ConstructorMensajes:
+    """Convierte filas de clientes en mensajes personalizados ya serializados"""
+
+    def __init__(self, remitente, asunto, plantilla, formato='html'):
+        self.remitente = remitente
+        self.formato = formato
+        self._asunto = PlantillaCompilada(asunto)
+        self._cuerpo = PlantillaCompilada(plantilla, escapar_html=(formato == 'html'))
+
+    def renderizar(self, info):
+        return self._asunto.renderizar(info), self._cuerpo.renderizar(info)
+
+    def construir(self, fila):
+        """(id, email, bytes), o (id, email, texto del error) si el mensaje no se pudo construir"""
+        info = fila_a_dict(fila)
+        try:
+            asunto, cuerpo = self.renderizar(info)
+            mensaje = construir_mime(self.remitente, info['email'], asunto, cuerpo, self.formato)
+            return info['id'], info['email'], serializar(mensaje)
+        except Exception as e:
+            return info['id'], info['email'], str(e)
+
+# Cada proceso del pool compila las plantillas una sola vez al arrancar
+_constructor = None
+
+def iniciar_proceso(remitente, asunto, plantilla, formato):
+    global _constructor
+    _constructor = ConstructorMensajes(remitente, asunto, plantilla, formato)
+
+def construir_lote(filas):
+    return [_constructor.construir(fila) for fila in filas]
@@ -2,71 +2,194 @@
 Servicio de notificaciones por email
 """
 
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-import json
-from datetime import datetime
+import threading
+
+from api_integrations.smtp_sesion import SesionSMTP
+from api_integrations.outbox import BandejaSalida, TrabajadoresOutbox
+from api_integrations.plantillas import crear_registro_por_defecto
+from api_integrations.resumen import ResumenNotificaciones
+from utils.configuracion import obtener_configuracion
 
 class NotificationService:
     """Servicio para enviar notificaciones por email"""
     
-    def __init__(self, config_file="config/email_config.json"):
-        self.config = self._cargar_configuracion(config_file)
-    
-    def _cargar_configuracion(self, config_file):
-        """Carga la configuración del servidor de email"""
-        config_default = {
-            "smtp_server": "smtp.gmail.com",
-            "smtp_port": 587,
-            "sender_email": "notificaciones@solutiontech.com",
-            "sender_password": "",
-            "use_tls": True
-        }
+    def __init__(self, config_file="config/email_config.json", bandeja=None):
+        self._configuracion = obtener_configuracion('email', config_file)
+        self._sesion = None
+        self._lock_sesion = threading.Lock()
+        self._bandeja = bandeja
+        self._trabajadores = None
+        self._resumen = None
+        self.plantillas = crear_registro_por_defecto(self.config.get("directorio_plantillas", "plantillas"))
+    
+    @property
+    def config(self):
+        """Configuración de email vigente (compartida por el proceso, se recarga si cambia el archivo)"""
+        return self._configuracion.actual()
+    
+    def _obtener_sesion(self):
+        """Sesión SMTP compartida por todos los envíos de este servicio"""
+        with self._lock_sesion:
+            config = self.config
+            if self._sesion is None:
+                self._sesion = SesionSMTP(config, tiempo_inactividad=config.get("smtp_idle_timeout", 60))
+            else:
+                self._sesion.actualizar_configuracion(config)
+            return self._sesion
+    
+    def _construir_mime(self, destinatario, asunto, cuerpo, formato='plain'):
+        from api_integrations.mime import construir_mime
         
-        try:
-            with open(config_file, 'r') as f:
-                user_config = json.load(f)
-                config_default.update(user_config)
-        except FileNotFoundError:
-            print(f"Archivo de configuración no encontrado: {config_file}")
-            print("Usando configuración por defecto (requiere ajustes)")
+        return construir_mime(self.config["sender_email"], destinatario, asunto, cuerpo, formato)
+    
+    def obtener_bandeja(self):
+        """Bandeja de salida persistente (se crea al primer uso)"""
+        with self._lock_sesion:
+            if self._bandeja is None:
+                self._bandeja = BandejaSalida(
+                    self.config.get("outbox_db", "outbox.db"),
+                    max_intentos=self.config.get("outbox_max_intentos", 5),
+                    backoff_base=self.config.get("outbox_backoff_segundos", 30),
+                    tiempo_reclamo=self.config.get("outbox_tiempo_reclamo_segundos", 600)
+                )
+            return self._bandeja
+    
+    def email_configurado(self):
+        """False (e informa) si falta la contraseña: cada intento de envío sería rechazado"""
+        if not self.config.get("sender_password"):
+            print("Error: Contraseña de email no configurada")
+            return False
+        return True
+    
+    def encolar_email_bienvenida(self, cliente, asunto=None, mensaje_personalizado=None,
+                                 clave_idempotencia=None):
+        """Deja el email de bienvenida en la bandeja de salida y vuelve de inmediato (None si no se encoló).
+        
+        Cada llamada es un envío nuevo; para que los reintentos de una misma solicitud
+        no dupliquen el email, pasar la misma clave_idempotencia.
+        """
+        if not self.email_configurado():
+            return None
+        return self.obtener_bandeja().encolar(
+            cliente.email,
+            asunto or f"¡Bienvenido a SolutionTech, {cliente.nombre}!",
+            mensaje_personalizado or self._construir_mensaje_bienvenida(cliente),
+            formato='html',
+            clave_idempotencia=clave_idempotencia
+        )
+    
+    def encolar_notificacion(self, destinatario, asunto, mensaje, formato='plain', clave_idempotencia=None):
+        """Deja una notificación en la bandeja de salida y vuelve de inmediato (None si no se encoló)"""
+        if not self.email_configurado():
+            return None
+        return self.obtener_bandeja().encolar(destinatario, asunto, mensaje, formato, clave_idempotencia)
+    
+    def obtener_resumen(self):
+        """Agrupador de eventos por destinatario, o None si resumen_ventana_segundos no está configurado"""
+        ventana = self.config.get("resumen_ventana_segundos", 0)
+        if not ventana:
+            return None
+        with self._lock_sesion:
+            if self._resumen is None:
+                self._resumen = ResumenNotificaciones(
+                    self._encolar_resumen,
+                    ventana=ventana,
+                    max_eventos=self.config.get("resumen_max_eventos", 50)
+                )
+            return self._resumen
+    
+    def _encolar_resumen(self, destinatario, asunto, mensaje, clave):
+        # Una excepción hace que ResumenNotificaciones conserve los eventos para reintentarlos
+        if self.encolar_notificacion(destinatario, asunto, mensaje, clave_idempotencia=clave) is None:
+            raise RuntimeError("el resumen no se pudo encolar")
+    
+    def notificar_evento(self, destinatario, asunto, mensaje):
+        """Notificación de un evento del cliente; en modo resumen se agrupa con las demás del destinatario"""
+        if not self.email_configurado():
+            return None
+        resumen = self.obtener_resumen()
+        if resumen is None:
+            return self.encolar_notificacion(destinatario, asunto, mensaje)
+        resumen.agregar(destinatario, asunto, mensaje)
+        return None
+    
+    def vaciar_resumenes(self):
+        """Encola ya los resúmenes pendientes; devuelve cuántos"""
+        return self._resumen.vaciar() if self._resumen is not None else 0
+    
+    def _crear_emisor(self):
+        """Emisor para un hilo de la bandeja de salida, con su propia sesión SMTP"""
+        sesion = SesionSMTP(self.config, tiempo_inactividad=self.config.get("smtp_idle_timeout", 60))
         
-        return config_default
+        def enviar(mensaje):
+            sesion.actualizar_configuracion(self.config)
+            sesion.enviar(self._construir_mime(
+                mensaje['destinatario'], mensaje['asunto'], mensaje['cuerpo'], mensaje['formato']))
+        
+        enviar.cerrar = sesion.cerrar
+        return enviar
+    
+    def iniciar_trabajadores(self, num_trabajadores=None):
+        """Arranca el pool de hilos que vacía la bandeja de salida"""
+        if self._trabajadores is None:
+            self._trabajadores = TrabajadoresOutbox(
+                self.obtener_bandeja(),
+                self._crear_emisor,
+                num_trabajadores=num_trabajadores or self.config.get("outbox_trabajadores", 2)
+            )
+        self._trabajadores.iniciar()
+    
+    def detener_trabajadores(self):
+        if self._trabajadores is not None:
+            self._trabajadores.detener()
+            self._trabajadores = None
+    
+    def crear_campana(self, nombre, db_manager, segmento, asunto, plantilla, **opciones):
+        """Campaña de email a un segmento, p. ej. {'tipo': 'Premium', 'datos': {'nivel': 'platino'}}.
+        
+        asunto y plantilla usan campos del cliente entre llaves ({nombre}, {email}, {nivel}...).
+        """
+        from api_integrations.campanas import CampanaEmail
+        
+        return CampanaEmail(nombre, self, db_manager, segmento, asunto, plantilla, **opciones)
+    
+    def estadisticas_outbox(self):
+        """Profundidad de la cola y latencia de envío (segundos desde que se encoló)"""
+        return self.obtener_bandeja().estadisticas()
+    
+    def fallidos_outbox(self):
+        """Mensajes que agotaron sus intentos, con el último error"""
+        return self.obtener_bandeja().listar_fallidos()
+    
+    def cerrar(self):
+        """Encola los resúmenes pendientes, detiene los trabajadores y cierra la sesión SMTP abierta"""
+        self.vaciar_resumenes()
+        self.detener_trabajadores()
+        with self._lock_sesion:
+            if self._sesion is not None:
+                self._sesion.cerrar()
+                self._sesion = None
     
     def enviar_email_bienvenida(self, cliente, asunto=None, mensaje_personalizado=None):
         """Envía email de bienvenida a un nuevo cliente"""
         
-        if not self.config.get("sender_password"):
-            print("Error: Contraseña de email no configurada")
+        if not self.email_configurado():
             return False
         
         try:
-            # Construir el mensaje
-            msg = MIMEMultipart()
-            
             if not asunto:
                 asunto = f"¡Bienvenido a SolutionTech, {cliente.nombre}!"
             
-            msg['Subject'] = asunto
-            msg['From'] = self.config["sender_email"]
-            msg['To'] = cliente.email
-            
             # Construir cuerpo del mensaje
             if not mensaje_personalizado:
                 mensaje = self._construir_mensaje_bienvenida(cliente)
             else:
                 mensaje = mensaje_personalizado
             
-            msg.attach(MIMEText(mensaje, 'html'))
+            msg = self._construir_mime(cliente.email, asunto, mensaje, 'html')
             
-            # Conectar y enviar
-            with smtplib.SMTP(self.config["smtp_server"], self.config["smtp_port"]) as server:
-                if self.config.get("use_tls", True):
-                    server.starttls()
-                
-                server.login(self.config["sender_email"], self.config["sender_password"])
-                server.send_message(msg)
+            # Enviar por la sesión SMTP persistente
+            self._obtener_sesion().enviar(msg)
             
             print(f"Email de bienvenida enviado a: {cliente.email}")
             return True
@@ -76,84 +199,13 @@ class NotificationService:
             return False
     
     def _construir_mensaje_bienvenida(self, cliente):
-        """Construye el mensaje HTML de bienvenida"""
-        
-        tipo_cliente = cliente.obtener_tipo()
-        
-        mensaje_html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background-color: #4CAF50; color: white; padding: 10px; text-align: center; }}
-                .content {{ padding: 20px; }}
-                .benefits {{ background-color: #f9f9f9; padding: 15px; margin: 15px 0; }}
-                .footer {{ text-align: center; margin-top: 30px; color: #666; font-size: 0.9em; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>¡Bienvenido a SolutionTech!</h1>
-                </div>
-                
-                <div class="content">
-                    <p>Estimado/a <strong>{cliente.nombre}</strong>,</p>
-                    
-                    <p>Nos complace darle la bienvenida como nuestro nuevo cliente.</p>
-                    
-                    <div class="benefits">
-                        <h3>Detalles de su cuenta:</h3>
-                        <ul>
-                            <li><strong>Tipo de cliente:</strong> {tipo_cliente}</li>
-                            <li><strong>Email registrado:</strong> {cliente.email}</li>
-                            <li><strong>Fecha de registro:</strong> {datetime.now().strftime('%d/%m/%Y')}</li>
-                        </ul>
-                    </div>
-                    
-                    <p>Como cliente {tipo_cliente.lower()}, usted tiene acceso a:</p>
-                    <ul>
-                        <li>Gestión completa de su perfil</li>
-                        <li>Soporte técnico prioritario</li>
-                        <li>Actualizaciones regulares del sistema</li>
-                        <li>Beneficios exclusivos según su tipo de cliente</li>
-                    </ul>
-                    
-                    <p>Si tiene alguna pregunta, no dude en contactarnos.</p>
-                    
-                    <p>Atentamente,<br>
-                    <strong>El equipo de SolutionTech</strong></p>
-                </div>
-                
-                <div class="footer">
-                    <p>Este es un mensaje automático, por favor no responda a este email.</p>
-                    <p>© {datetime.now().year} SolutionTech. Todos los derechos reservados.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        
-        return mensaje_html
+        """Construye el mensaje HTML de bienvenida con la plantilla del tipo de cliente"""
+        return self.plantillas.renderizar_bienvenida(cliente)
     
     def enviar_notificacion_general(self, destinatario, asunto, mensaje):
         """Envía una notificación general por email"""
         try:
-            msg = MIMEMultipart()
-            msg['Subject'] = asunto
-            msg['From'] = self.config["sender_email"]
-            msg['To'] = destinatario
-            
-            msg.attach(MIMEText(mensaje, 'plain'))
-            
-            with smtplib.SMTP(self.config["smtp_server"], self.config["smtp_port"]) as server:
-                if self.config.get("use_tls", True):
-                    server.starttls()
-                
-                server.login(self.config["sender_email"], self.config["sender_password"])
-                server.send_message(msg)
+            self._obtener_sesion().enviar(self._construir_mime(destinatario, asunto, mensaje, 'plain'))
             
             return True
             
@@ -0,0 +1,286 @@
+"""
+Bandeja de salida persistente (SQLite) para notificaciones por email
+"""
+
+import random
+import sqlite3
+import threading
+import time
+
+class BandejaSalida:
+    """Cola durable de mensajes con reintentos, backoff y dead-letter.
+
+    Estados: pendiente -> enviando -> enviado, o fallido cuando se agotan
+    los intentos. Una clave de idempotencia repetida no encola de nuevo.
+    Un mensaje 'enviando' solo se da por huérfano cuando su reclamo tiene más
+    de `tiempo_reclamo` segundos, así no se reenvía lo que otro proceso sigue enviando.
+    """
+
+    def __init__(self, db_name="outbox.db", max_intentos=5, backoff_base=30.0, backoff_maximo=3600.0,
+                 tiempo_reclamo=600.0):
+        self.db_name = db_name
+        self.max_intentos = max_intentos
+        self.backoff_base = backoff_base
+        self.backoff_maximo = backoff_maximo
+        self.tiempo_reclamo = tiempo_reclamo
+        self._nuevo_mensaje = threading.Event()
+        self._init_database()
+        self.recuperar_huerfanos()
+
+    def _conectar(self):
+        return sqlite3.connect(self.db_name, timeout=30)
+
+    def _init_database(self):
+        conn = self._conectar()
+        cursor = conn.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                clave_idempotencia TEXT UNIQUE,
+                destinatario TEXT NOT NULL,
+                asunto TEXT NOT NULL,
+                cuerpo TEXT NOT NULL,
+                formato TEXT NOT NULL DEFAULT 'plain',
+                estado TEXT NOT NULL DEFAULT 'pendiente',
+                intentos INTEGER NOT NULL DEFAULT 0,
+                proximo_intento REAL NOT NULL,
+                creado REAL NOT NULL,
+                enviado REAL,
+                ultimo_error TEXT,
+                reclamado REAL
+            )
+        ''')
+        cursor.execute('PRAGMA table_info(outbox)')
+        if 'reclamado' not in {fila[1] for fila in cursor.fetchall()}:
+            cursor.execute('ALTER TABLE outbox ADD COLUMN reclamado REAL')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_outbox_pendientes
+            ON outbox(estado, proximo_intento)
+        ''')
+        conn.commit()
+        conn.close()
+
+    def encolar(self, destinatario, asunto, cuerpo, formato='plain', clave_idempotencia=None):
+        """Encola un mensaje; devuelve su id (el existente si la clave ya estaba encolada)"""
+        ahora = time.time()
+        conn = self._conectar()
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT OR IGNORE INTO outbox
+            (clave_idempotencia, destinatario, asunto, cuerpo, formato, proximo_intento, creado)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (clave_idempotencia, destinatario, asunto, cuerpo, formato, ahora, ahora))
+
+        if cursor.rowcount:
+            mensaje_id = cursor.lastrowid
+        else:
+            cursor.execute('SELECT id FROM outbox WHERE clave_idempotencia = ?', (clave_idempotencia,))
+            mensaje_id = cursor.fetchone()[0]
+
+        conn.commit()
+        conn.close()
+        self._nuevo_mensaje.set()
+        return mensaje_id
+
+    def reclamar(self, limite=1):
+        """Marca como 'enviando' hasta `limite` mensajes listos y los devuelve"""
+        # Se limpia antes de consultar: un encolar posterior volverá a despertar a los hilos
+        self._nuevo_mensaje.clear()
+        ahora = time.time()
+        conn = self._conectar()
+        conn.isolation_level = None
+        cursor = conn.cursor()
+        try:
+            cursor.execute('BEGIN IMMEDIATE')
+            cursor.execute('''
+                SELECT id, destinatario, asunto, cuerpo, formato, intentos, creado
+                FROM outbox
+                WHERE estado = 'pendiente' AND proximo_intento <= ?
+                ORDER BY proximo_intento, id
+                LIMIT ?
+            ''', (ahora, limite))
+            filas = cursor.fetchall()
+            cursor.executemany("UPDATE outbox SET estado = 'enviando', reclamado = ? WHERE id = ?",
+                               [(ahora, fila[0]) for fila in filas])
+            cursor.execute('COMMIT')
+        except Exception:
+            cursor.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+        columnas = ('id', 'destinatario', 'asunto', 'cuerpo', 'formato', 'intentos', 'creado')
+        return [dict(zip(columnas, fila)) for fila in filas]
+
+    def marcar_enviado(self, mensaje_id):
+        conn = self._conectar()
+        conn.execute('''
+            UPDATE outbox SET estado = 'enviado', enviado = ?, intentos = intentos + 1, ultimo_error = NULL
+            WHERE id = ?
+        ''', (time.time(), mensaje_id))
+        conn.commit()
+        conn.close()
+
+    def marcar_fallo(self, mensaje_id, error):
+        """Reprograma el mensaje con backoff exponencial o lo pasa a 'fallido'"""
+        conn = self._conectar()
+        cursor = conn.cursor()
+        cursor.execute('SELECT intentos FROM outbox WHERE id = ?', (mensaje_id,))
+        intentos = cursor.fetchone()[0] + 1
+
+        if intentos >= self.max_intentos:
+            cursor.execute('''
+                UPDATE outbox SET estado = 'fallido', intentos = ?, ultimo_error = ? WHERE id = ?
+            ''', (intentos, str(error), mensaje_id))
+        else:
+            espera = min(self.backoff_maximo, self.backoff_base * 2 ** (intentos - 1))
+            espera *= random.uniform(0.5, 1.0)
+            cursor.execute('''
+                UPDATE outbox SET estado = 'pendiente', intentos = ?, ultimo_error = ?, proximo_intento = ?
+                WHERE id = ?
+            ''', (intentos, str(error), time.time() + espera, mensaje_id))
+
+        conn.commit()
+        conn.close()
+        return intentos < self.max_intentos
+
+    def recuperar_huerfanos(self):
+        """Devuelve a 'pendiente' los mensajes que quedaron 'enviando' tras un cierre abrupto"""
+        conn = self._conectar()
+        cursor = conn.cursor()
+        cursor.execute('''
+            UPDATE outbox SET estado = 'pendiente'
+            WHERE estado = 'enviando' AND (reclamado IS NULL OR reclamado <= ?)
+        ''', (time.time() - self.tiempo_reclamo,))
+        recuperados = cursor.rowcount
+        conn.commit()
+        conn.close()
+        return recuperados
+
+    def reintentar_fallidos(self):
+        """Reencola los mensajes en dead-letter"""
+        conn = self._conectar()
+        cursor = conn.cursor()
+        cursor.execute('''
+            UPDATE outbox SET estado = 'pendiente', intentos = 0, proximo_intento = ?
+            WHERE estado = 'fallido'
+        ''', (time.time(),))
+        reencolados = cursor.rowcount
+        conn.commit()
+        conn.close()
+        if reencolados:
+            self._nuevo_mensaje.set()
+        return reencolados
+
+    def listar_fallidos(self):
+        conn = self._conectar()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT id, destinatario, asunto, intentos, ultimo_error
+            FROM outbox WHERE estado = 'fallido' ORDER BY id
+        ''')
+        columnas = ('id', 'destinatario', 'asunto', 'intentos', 'ultimo_error')
+        fallidos = [dict(zip(columnas, fila)) for fila in cursor.fetchall()]
+        conn.close()
+        return fallidos
+
+    def esperar_mensajes(self, timeout):
+        """Bloquea hasta que se encole algo o pase `timeout`"""
+        return self._nuevo_mensaje.wait(timeout)
+
+    def despertar(self):
+        self._nuevo_mensaje.set()
+
+    def estadisticas(self, ultimos=1000):
+        conn = self._conectar()
+        cursor = conn.cursor()
+        cursor.execute('SELECT estado, COUNT(*) FROM outbox GROUP BY estado')
+        por_estado = dict(cursor.fetchall())
+        cursor.execute('''
+            SELECT enviado - creado FROM outbox
+            WHERE estado = 'enviado' ORDER BY enviado DESC LIMIT ?
+        ''', (ultimos,))
+        latencias = sorted(fila[0] for fila in cursor.fetchall())
+        conn.close()
+
+        return {
+            'pendientes': por_estado.get('pendiente', 0),
+            'enviando': por_estado.get('enviando', 0),
+            'enviados': por_estado.get('enviado', 0),
+            'fallidos': por_estado.get('fallido', 0),
+            'profundidad': por_estado.get('pendiente', 0) + por_estado.get('enviando', 0),
+            'latencia_media': sum(latencias) / len(latencias) if latencias else 0.0,
+            'latencia_p95': latencias[int(len(latencias) * 0.95) - 1] if latencias else 0.0
+        }
+
+class TrabajadoresOutbox:
+    """Pool de hilos que vacía una BandejaSalida.
+
+    `crear_emisor` se llama una vez por hilo y debe devolver una función
+    enviar(mensaje) que lance una excepción si el envío falla; si el objeto
+    devuelto tiene cerrar(), se llama al detener el hilo.
+    """
+
+    def __init__(self, bandeja, crear_emisor, num_trabajadores=2, intervalo_sondeo=5.0):
+        self.bandeja = bandeja
+        self.crear_emisor = crear_emisor
+        self.num_trabajadores = num_trabajadores
+        self.intervalo_sondeo = intervalo_sondeo
+        self._detener = threading.Event()
+        self._hilos = []
+
+    @property
+    def activo(self):
+        return any(hilo.is_alive() for hilo in self._hilos)
+
+    def iniciar(self):
+        if self.activo:
+            return
+        self._detener.clear()
+        self._hilos = [threading.Thread(target=self._trabajar, name=f"outbox-{i}", daemon=True)
+                       for i in range(self.num_trabajadores)]
+        for hilo in self._hilos:
+            hilo.start()
+
+    def _trabajar(self):
+        emisor = self.crear_emisor()
+        errores_seguidos = 0
+        try:
+            while not self._detener.is_set():
+                try:
+                    self._procesar(emisor)
+                    errores_seguidos = 0
+                except Exception as e:
+                    # p. ej. "database is locked": el hilo sigue vivo y reintenta con backoff
+                    errores_seguidos += 1
+                    espera = min(60.0, self.intervalo_sondeo * 2 ** (errores_seguidos - 1))
+                    print(f"Error en la bandeja de salida (reintento en {espera:.1f}s): {e}")
+                    self._detener.wait(espera)
+        finally:
+            if hasattr(emisor, 'cerrar'):
+                emisor.cerrar()
+
+    def _procesar(self, emisor):
+        mensajes = self.bandeja.reclamar()
+        if not mensajes:
+            self.bandeja.recuperar_huerfanos()
+            self.bandeja.esperar_mensajes(self.intervalo_sondeo)
+            return
+
+        for mensaje in mensajes:
+            try:
+                emisor(mensaje)
+            except Exception as e:
+                if not self.bandeja.marcar_fallo(mensaje['id'], e):
+                    print(f"Mensaje {mensaje['id']} a {mensaje['destinatario']} "
+                          f"movido a fallidos: {e}")
+                continue
+            self.bandeja.marcar_enviado(mensaje['id'])
+
+    def detener(self, timeout=10.0):
+        self._detener.set()
+        self.bandeja.despertar()
+        for hilo in self._hilos:
+            hilo.join(timeout)
+        self._hilos = []
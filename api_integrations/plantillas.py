@@ -0,0 +1,255 @@
+"""
+Plantillas de email compiladas una sola vez y recargadas cuando cambia el archivo
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+from html import escape
+from string import Formatter
+
+BIENVENIDA_POR_DEFECTO = """
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <style>
+                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
+                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
+                .header {{ background-color: #4CAF50; color: white; padding: 10px; text-align: center; }}
+                .content {{ padding: 20px; }}
+                .benefits {{ background-color: #f9f9f9; padding: 15px; margin: 15px 0; }}
+                .footer {{ text-align: center; margin-top: 30px; color: #666; font-size: 0.9em; }}
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <div class="header">
+                    <h1>¡Bienvenido a SolutionTech!</h1>
+                </div>
+
+                <div class="content">
+                    <p>Estimado/a <strong>{nombre}</strong>,</p>
+
+                    <p>Nos complace darle la bienvenida como nuestro nuevo cliente.</p>
+
+                    <div class="benefits">
+                        <h3>Detalles de su cuenta:</h3>
+                        <ul>
+                            <li><strong>Tipo de cliente:</strong> {tipo}</li>
+                            <li><strong>Email registrado:</strong> {email}</li>
+                            <li><strong>Fecha de registro:</strong> {fecha}</li>
+                        </ul>
+                    </div>
+
+                    <p>Como cliente {tipo_minusculas}, usted tiene acceso a:</p>
+                    <ul>
+                        <li>Gestión completa de su perfil</li>
+                        <li>Soporte técnico prioritario</li>
+                        <li>Actualizaciones regulares del sistema</li>
+                        <li>Beneficios exclusivos según su tipo de cliente</li>
+                    </ul>
+
+                    <p>Si tiene alguna pregunta, no dude en contactarnos.</p>
+
+                    <p>Atentamente,<br>
+                    <strong>El equipo de SolutionTech</strong></p>
+                </div>
+
+                <div class="footer">
+                    <p>Este es un mensaje automático, por favor no responda a este email.</p>
+                    <p>© {año} SolutionTech. Todos los derechos reservados.</p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+
+def _texto(valor):
+    return "" if valor is None else str(valor)
+
+def _html(valor):
+    return "" if valor is None else escape(str(valor))
+
+def _formatear(valor, especificacion):
+    return None if valor is None else format(valor, especificacion)
+
+class PlantillaCompilada:
+    """Plantilla con campos {campo} (sintaxis de str.format, llaves dobles para literales).
+
+    El texto se analiza una vez y se compila a una función que concatena los
+    fragmentos estáticos con los campos del contexto; los campos ausentes
+    quedan vacíos y, si escapar_html es True, los valores se escapan.
+    """
+
+    def __init__(self, texto, escapar_html=False, _partes=None):
+        self.texto = texto
+        self.escapar_html = escapar_html
+        self._escapar = _html if escapar_html else _texto
+
+        if _partes is None:
+            _partes = []
+            for literal, campo, especificacion, conversion in Formatter().parse(texto):
+                if literal:
+                    _partes.append(literal)
+                if campo is None:
+                    continue
+                if not campo.isidentifier():
+                    raise ValueError(f"Campo de plantilla no soportado: {{{campo}}}")
+                _partes.append((campo, especificacion, conversion))
+
+        self._partes = _partes
+        self.campos = [parte[0] for parte in _partes if isinstance(parte, tuple)]
+        self._renderizar = self._compilar()
+
+    def _compilar(self):
+        codigo = []
+        for parte in self._partes:
+            if isinstance(parte, str):
+                codigo.append(repr(parte))
+                continue
+
+            campo, especificacion, conversion = parte
+            valor = f"c.get({campo!r})"
+            if conversion == 'r':
+                valor = f"repr({valor})"
+            if especificacion:
+                valor = f"_formatear({valor}, {especificacion!r})"
+            codigo.append(f"_v({valor})")
+
+        fuente = (
+            "def renderizar(c):\n"
+            f"    return ''.join(({', '.join(codigo) or repr('')},))\n"
+        )
+        espacio = {'_v': self._escapar, '_formatear': _formatear}
+        exec(fuente, espacio)
+        return espacio['renderizar']
+
+    def especializar(self, fijos):
+        """Nueva plantilla con los campos de `fijos` ya sustituidos en los fragmentos estáticos"""
+        partes = []
+        for parte in self._partes:
+            if isinstance(parte, tuple) and parte[0] in fijos:
+                campo, especificacion, conversion = parte
+                valor = fijos[campo]
+                if conversion == 'r':
+                    valor = repr(valor)
+                if especificacion:
+                    valor = _formatear(valor, especificacion)
+                parte = self._escapar(valor)
+
+            if isinstance(parte, str) and partes and isinstance(partes[-1], str):
+                partes[-1] += parte
+            elif parte != "":
+                partes.append(parte)
+
+        return PlantillaCompilada(self.texto, self.escapar_html, _partes=partes)
+
+    def renderizar(self, contexto):
+        return self._renderizar(contexto)
+
+class RegistroPlantillas:
+    """Plantillas por nombre, leídas de `directorio` y recompiladas cuando cambia su mtime.
+
+    Para `nombre` se busca `<directorio>/<nombre>.html` (o `.txt`); si no
+    existe se usa la plantilla integrada registrada con ese nombre. La mtime se
+    consulta como mucho una vez cada `intervalo_verificacion` segundos.
+    """
+
+    EXTENSIONES = ('.html', '.txt')
+
+    def __init__(self, directorio="plantillas", intervalo_verificacion=2.0):
+        self.directorio = directorio
+        self.intervalo_verificacion = intervalo_verificacion
+        self._integradas = {}
+        self._cache = {}
+        self._lock = threading.Lock()
+        self._fecha = None
+        self._fin_dia = 0.0
+        self._especializadas = {}
+
+    def registrar(self, nombre, texto, escapar_html=True):
+        with self._lock:
+            self._integradas[nombre] = PlantillaCompilada(texto, escapar_html)
+            self._cache.pop(nombre, None)
+
+    def _buscar_archivo(self, nombre):
+        for extension in self.EXTENSIONES:
+            ruta = os.path.join(self.directorio, nombre + extension)
+            try:
+                return ruta, os.stat(ruta).st_mtime_ns
+            except OSError:
+                continue
+        return None, None
+
+    def obtener(self, nombre):
+        """Plantilla compilada, o None si no hay archivo ni plantilla integrada"""
+        ahora = time.monotonic()
+        entrada = self._cache.get(nombre)
+        if entrada is not None and ahora < entrada[2]:
+            return entrada[0]
+
+        with self._lock:
+            ruta, mtime = self._buscar_archivo(nombre)
+            entrada = self._cache.get(nombre)
+
+            if entrada is not None and entrada[1] == (ruta, mtime):
+                plantilla = entrada[0]
+            elif ruta is not None:
+                with open(ruta, 'r', encoding='utf-8') as f:
+                    plantilla = PlantillaCompilada(f.read(), escapar_html=ruta.endswith('.html'))
+            else:
+                plantilla = self._integradas.get(nombre)
+
+            self._cache[nombre] = (plantilla, (ruta, mtime), ahora + self.intervalo_verificacion)
+            return plantilla
+
+    def obtener_primera(self, nombres):
+        """Primera plantilla disponible de `nombres`"""
+        for nombre in nombres:
+            plantilla = self.obtener(nombre)
+            if plantilla is not None:
+                return plantilla
+        raise KeyError(f"No hay plantilla para: {', '.join(nombres)}")
+
+    def fecha_actual(self):
+        """(dd/mm/aaaa, año) de hoy, recalculado una vez por día"""
+        ahora = time.time()
+        if ahora >= self._fin_dia:
+            hoy = datetime.now()
+            manana = hoy.replace(hour=0, minute=0, second=0, microsecond=0).timestamp() + 86400
+            self._fecha = (hoy.strftime('%d/%m/%Y'), hoy.year)
+            self._fin_dia = manana
+        return self._fecha
+
+    def renderizar_bienvenida(self, cliente):
+        tipo = cliente.obtener_tipo()
+        plantilla = self.obtener_primera((f"bienvenida_{tipo.split()[0].lower()}", "bienvenida"))
+        fecha, año = self.fecha_actual()
+
+        # Tipo y fecha son iguales para muchos clientes: se fijan una vez por plantilla, tipo y día
+        clave = (tipo, fecha)
+        especializada = self._especializadas.get(clave)
+        if especializada is None or especializada[0] is not plantilla:
+            if len(self._especializadas) > 64:
+                self._especializadas.clear()
+            especializada = self._especializadas[clave] = (plantilla, plantilla.especializar({
+                'tipo': tipo,
+                'tipo_minusculas': tipo.lower(),
+                'fecha': fecha,
+                'año': año
+            }))
+        especializada = especializada[1]
+
+        contexto = {'nombre': cliente.nombre, 'email': cliente.email}
+        # Campos propios de cada tipo ({nivel}, {empresa}...) solo si la plantilla los usa
+        for campo in especializada.campos:
+            if campo not in contexto:
+                contexto[campo] = getattr(cliente, campo, None)
+
+        return especializada.renderizar(contexto)
+
+def crear_registro_por_defecto(directorio="plantillas"):
+    registro = RegistroPlantillas(directorio)
+    registro.registrar("bienvenida", BIENVENIDA_POR_DEFECTO)
+    return registro
@@ -0,0 +1,124 @@
+"""
+Resúmenes de notificaciones: un único email por destinatario y ventana de tiempo
+"""
+
+import threading
+import time
+from datetime import datetime
+
+class ResumenNotificaciones:
+    """Agrupa los eventos de cada destinatario y los envía juntos.
+
+    El primer evento de un destinatario abre su ventana de `ventana` segundos;
+    al cerrarse (o al llegar a `max_eventos`) se llama a
+    enviar(destinatario, asunto, mensaje, clave_idempotencia) con un solo
+    mensaje que reúne todos los eventos. Un evento solitario se envía tal cual.
+    Si enviar lanza una excepción, los eventos vuelven al búfer y se
+    reintentan al cerrarse la siguiente ventana.
+    """
+
+    def __init__(self, enviar, ventana=3600.0, max_eventos=50):
+        self.enviar = enviar
+        self.ventana = ventana
+        self.max_eventos = max_eventos
+        # Las ventanas duran lo mismo, así que el orden de inserción es el de vencimiento
+        self._pendientes = {}
+        self._lock = threading.Lock()
+        self._temporizador = None
+        self.estadisticas = {'eventos': 0, 'mensajes': 0, 'reintentos': 0}
+
+    def agregar(self, destinatario, asunto, mensaje):
+        clave = destinatario.strip().lower()
+        completo = None
+
+        with self._lock:
+            grupo = self._pendientes.get(clave)
+            if grupo is None:
+                grupo = self._pendientes[clave] = {
+                    'destinatario': destinatario,
+                    'vence': time.monotonic() + self.ventana,
+                    'eventos': []
+                }
+            grupo['eventos'].append((datetime.now(), asunto, mensaje))
+            self.estadisticas['eventos'] += 1
+
+            if len(grupo['eventos']) >= self.max_eventos:
+                completo = self._pendientes.pop(clave)
+            self._programar()
+
+        if completo:
+            self._enviar_grupo(completo)
+
+    @property
+    def pendientes(self):
+        with self._lock:
+            return sum(len(grupo['eventos']) for grupo in self._pendientes.values())
+
+    def _programar(self):
+        if self._temporizador is not None or not self._pendientes:
+            return
+        primero = next(iter(self._pendientes.values()))
+        self._temporizador = threading.Timer(max(0.0, primero['vence'] - time.monotonic()), self._vencer)
+        self._temporizador.daemon = True
+        self._temporizador.start()
+
+    def _vencer(self):
+        ahora = time.monotonic()
+        with self._lock:
+            self._temporizador = None
+            vencidos = []
+            for clave, grupo in list(self._pendientes.items()):
+                if grupo['vence'] > ahora:
+                    break
+                vencidos.append(self._pendientes.pop(clave))
+            self._programar()
+
+        for grupo in vencidos:
+            self._enviar_grupo(grupo)
+
+    def vaciar(self):
+        """Envía ya todos los resúmenes pendientes"""
+        with self._lock:
+            if self._temporizador is not None:
+                self._temporizador.cancel()
+                self._temporizador = None
+            grupos = list(self._pendientes.values())
+            self._pendientes = {}
+
+        for grupo in grupos:
+            self._enviar_grupo(grupo)
+        return len(grupos)
+
+    @staticmethod
+    def componer(eventos):
+        """(asunto, mensaje) que reúne los eventos en orden de llegada"""
+        if len(eventos) == 1:
+            return eventos[0][1], eventos[0][2]
+
+        partes = [f"Tiene {len(eventos)} notificaciones nuevas de SolutionTech:\n"]
+        for i, (momento, asunto, mensaje) in enumerate(eventos, 1):
+            partes.append(f"{i}. [{momento.strftime('%d/%m/%Y %H:%M')}] {asunto}\n{mensaje}\n")
+        return f"Resumen: {len(eventos)} notificaciones de SolutionTech", "\n".join(partes)
+
+    def _enviar_grupo(self, grupo):
+        asunto, mensaje = self.componer(grupo['eventos'])
+        clave = f"resumen:{grupo['destinatario'].strip().lower()}:{grupo['eventos'][0][0].isoformat()}"
+        try:
+            self.enviar(grupo['destinatario'], asunto, mensaje, clave)
+            self.estadisticas['mensajes'] += 1
+        except Exception as e:
+            print(f"Error al enviar resumen a {grupo['destinatario']}: {e}")
+            self._devolver(grupo)
+
+    def _devolver(self, grupo):
+        """Reinserta un grupo no enviado delante de los eventos que llegaron mientras tanto"""
+        clave = grupo['destinatario'].strip().lower()
+        with self._lock:
+            self.estadisticas['reintentos'] += 1
+            actual = self._pendientes.get(clave)
+            if actual is None:
+                grupo['vence'] = time.monotonic() + self.ventana
+                self._pendientes[clave] = grupo
+            else:
+                actual['eventos'][:0] = grupo['eventos']
+            self._programar()
@@ -0,0 +1,171 @@
+"""
+Sesión SMTP persistente reutilizable entre mensajes
+"""
+
+import threading
+import time
+
+_clase_smtp = None
+
+def _clase_smtp_con_marca():
+    """smtplib.SMTP que recuerda si la transacción en curso llegó a DATA (se crea al primer uso)"""
+    global _clase_smtp
+    if _clase_smtp is None:
+        import smtplib
+
+        class SMTPConMarca(smtplib.SMTP):
+            en_data = False
+
+            def data(self, msg):
+                self.en_data = True
+                return super().data(msg)
+
+        _clase_smtp = SMTPConMarca
+    return _clase_smtp
+
+class SesionSMTP:
+    """Mantiene abierta una conexión SMTP autenticada entre envíos.
+
+    Antes de reutilizar una conexión que estuvo quieta más de `verificar_tras`
+    segundos se envía NOOP; si el servidor la cerró se reconecta y se reintenta
+    el envío una vez, solo si el fallo ocurrió antes de DATA (después el mensaje
+    pudo haberse entregado). Los rechazos del servidor (550, etc.) se propagan
+    sin tocar la conexión. Tras `tiempo_inactividad` segundos sin uso se cierra sola.
+    """
+
+    def __init__(self, config, tiempo_inactividad=60.0, verificar_tras=5.0, timeout=30.0):
+        self.config = config
+        self.tiempo_inactividad = tiempo_inactividad
+        self.verificar_tras = verificar_tras
+        self.timeout = timeout
+        self._smtp = None
+        self._ultimo_uso = 0.0
+        self._lock = threading.RLock()
+        self._temporizador = None
+        self.estadisticas = {'conexiones': 0, 'reconexiones': 0, 'noops': 0, 'mensajes': 0}
+
+    @property
+    def conectada(self):
+        return self._smtp is not None
+
+    def _conectar(self):
+        smtp = _clase_smtp_con_marca()(self.config["smtp_server"], self.config["smtp_port"], timeout=self.timeout)
+        try:
+            if self.config.get("use_tls", True):
+                smtp.starttls()
+            if self.config.get("sender_password"):
+                smtp.login(self.config["sender_email"], self.config["sender_password"])
+        except Exception:
+            smtp.close()
+            raise
+
+        self._smtp = smtp
+        self.estadisticas['conexiones'] += 1
+
+    def _descartar(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.close()
+            except Exception:
+                pass
+            self._smtp = None
+
+    def _sigue_viva(self):
+        self.estadisticas['noops'] += 1
+        try:
+            return self._smtp.noop()[0] == 250
+        except Exception:
+            return False
+
+    def _asegurar_conexion(self):
+        if self._smtp is not None:
+            inactiva = time.monotonic() - self._ultimo_uso
+            if inactiva >= self.tiempo_inactividad or (inactiva >= self.verificar_tras and not self._sigue_viva()):
+                self._descartar()
+                self.estadisticas['reconexiones'] += 1
+
+        if self._smtp is None:
+            self._conectar()
+
+    def _programar_cierre(self):
+        if self._temporizador is None and self.tiempo_inactividad:
+            self._temporizador = threading.Timer(self.tiempo_inactividad, self._cerrar_si_inactiva)
+            self._temporizador.daemon = True
+            self._temporizador.start()
+
+    def _cerrar_si_inactiva(self):
+        with self._lock:
+            self._temporizador = None
+            if self._smtp is None:
+                return
+            restante = self.tiempo_inactividad - (time.monotonic() - self._ultimo_uso)
+            if restante <= 0:
+                self._cerrar_conexion()
+            else:
+                self._temporizador = threading.Timer(restante, self._cerrar_si_inactiva)
+                self._temporizador.daemon = True
+                self._temporizador.start()
+
+    def _ejecutar(self, operacion):
+        import smtplib
+
+        with self._lock:
+            self._asegurar_conexion()
+            self._smtp.en_data = False
+            try:
+                resultado = operacion(self._smtp)
+            except OSError as e:
+                # SMTPException hereda de OSError: un rechazo del servidor deja la conexión usable
+                if isinstance(e, smtplib.SMTPException) and not isinstance(e, smtplib.SMTPServerDisconnected):
+                    self._ultimo_uso = time.monotonic()
+                    raise
+                en_data = self._smtp.en_data
+                self._descartar()
+                if en_data:
+                    raise
+                self.estadisticas['reconexiones'] += 1
+                self._conectar()
+                resultado = operacion(self._smtp)
+
+            self._ultimo_uso = time.monotonic()
+            self.estadisticas['mensajes'] += 1
+            self._programar_cierre()
+            return resultado
+
+    def enviar(self, mensaje, remitente=None, destinatarios=None):
+        """Envía un objeto email.message.Message por la sesión abierta"""
+        return self._ejecutar(lambda smtp: smtp.send_message(mensaje, remitente, destinatarios))
+
+    def enviar_bytes(self, remitente, destinatarios, datos):
+        """Envía un mensaje ya serializado con sendmail"""
+        return self._ejecutar(lambda smtp: smtp.sendmail(remitente, destinatarios, datos))
+
+    def actualizar_configuracion(self, config):
+        """Usa `config` desde el próximo envío; si cambió, la conexión actual se cierra"""
+        if config is self.config:
+            return
+        with self._lock:
+            self.config = config
+            self._cerrar_conexion()
+
+    def _cerrar_conexion(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                pass
+            self._descartar()
+
+    def cerrar(self):
+        with self._lock:
+            if self._temporizador is not None:
+                self._temporizador.cancel()
+                self._temporizador = None
+            self._cerrar_conexion()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.cerrar()
+        return False
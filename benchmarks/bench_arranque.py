@@ -0,0 +1,87 @@
+"""
+Benchmark de arranque de la aplicación
+
+Ejecuta `python -X importtime` sobre gui.main_window en un proceso limpio,
+muestra los módulos más costosos y falla si el tiempo total supera el límite
+o si se cargan dependencias pesadas que deberían importarse bajo demanda.
+
+Uso: python benchmarks/bench_arranque.py [--limite-ms 150] [--repeticiones 5] [--ventana]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+MODULOS_DIFERIDOS = ('requests', 'smtplib', 'phonenumbers', 'email.mime.multipart',
+                     'multiprocessing', 'asyncio')
+
+CODIGO_VENTANA = """
+import time
+inicio = time.perf_counter()
+from gui.main_window import GICApp
+app = GICApp()
+app.root.update()
+print(f"VENTANA {(time.perf_counter() - inicio) * 1000:.1f}")
+app.root.destroy()
+"""
+
+def medir_importacion():
+    resultado = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         "import sys, gui.main_window; print(','.join(sorted(sys.modules)))"],
+        cwd=RAIZ, capture_output=True, text=True, check=True)
+
+    tiempos = {}
+    for linea in resultado.stderr.splitlines():
+        if not linea.startswith("import time:"):
+            continue
+        propio, acumulado, modulo = linea[len("import time:"):].split("|")
+        if propio.strip().isdigit():
+            tiempos[modulo.strip()] = (int(propio), int(acumulado))
+
+    modulos = set(resultado.stdout.strip().split(","))
+    return tiempos, modulos
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--limite-ms", type=float, default=150.0)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--ventana", action="store_true",
+                        help="Mide también el tiempo hasta la primera ventana (requiere display)")
+    args = parser.parse_args()
+
+    totales = []
+    for _ in range(args.repeticiones):
+        tiempos, modulos = medir_importacion()
+        totales.append(tiempos["gui.main_window"][1] / 1000)
+
+    print("Módulos más costosos (acumulado, ms):")
+    for modulo, (_, acumulado) in sorted(tiempos.items(), key=lambda t: -t[1][1])[:15]:
+        print(f"  {acumulado / 1000:8.1f}  {modulo}")
+
+    mejor = min(totales)
+    print(f"\nImportación de gui.main_window: {mejor:.1f} ms (mejor de {args.repeticiones})")
+
+    if args.ventana:
+        resultado = subprocess.run([sys.executable, "-c", CODIGO_VENTANA], cwd=RAIZ,
+                                   capture_output=True, text=True)
+        for linea in resultado.stdout.splitlines():
+            if linea.startswith("VENTANA"):
+                print(f"Tiempo hasta la primera ventana: {linea.split()[1]} ms")
+
+    cargados = [modulo for modulo in MODULOS_DIFERIDOS if modulo in modulos]
+    if cargados:
+        print(f"ERROR: módulos que deberían cargarse bajo demanda: {', '.join(cargados)}")
+        return 1
+
+    if mejor > args.limite_ms:
+        print(f"ERROR: el arranque supera el límite de {args.limite_ms:.0f} ms")
+        return 1
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
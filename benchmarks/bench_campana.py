@@ -0,0 +1,63 @@
+"""
+Benchmark de campañas: throughput y memoria máxima según el tamaño del segmento
+
+Envía una campaña al segmento Premium contra un servidor SMTP local. La
+memoria máxima (tracemalloc) debe mantenerse constante aunque crezca el
+número de destinatarios, porque solo se mantiene una página en memoria.
+
+Uso: python benchmarks/bench_campana.py [clientes,clientes,...]
+"""
+
+import os
+import sys
+import time
+import json
+import shutil
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from database.db_manager import DatabaseManager
+from api_integrations.notification_service import NotificationService
+from tests.servidores_prueba import ServidorSMTPPrueba
+from bench_exportacion import generar_filas
+
+def main():
+    cantidades = [int(c) for c in (sys.argv[1] if len(sys.argv) > 1 else "6000,30000").split(",")]
+    tmp_dir = tempfile.mkdtemp()
+
+    try:
+        with ServidorSMTPPrueba(guardar_mensajes=False) as servidor:
+            ruta_config = os.path.join(tmp_dir, "email_config.json")
+            with open(ruta_config, 'w') as f:
+                json.dump(servidor.config(), f)
+            servicio = NotificationService(ruta_config)
+
+            for cantidad in cantidades:
+                db_manager = DatabaseManager(os.path.join(tmp_dir, f"clientes_{cantidad}.db"))
+                db_manager.aplicar_cambios(list(generar_filas(cantidad)), [])
+
+                campana = servicio.crear_campana(
+                    f"bench_{cantidad}", db_manager, {'tipo': 'Premium'},
+                    "Novedades para {nombre}", "<p>Hola {nombre}, su nivel es {nivel}.</p>",
+                    directorio=os.path.join(tmp_dir, "campanas"), tamaño_pagina=500, num_conexiones=4)
+
+                previos = servidor.total_mensajes
+                tracemalloc.start()
+                inicio = time.perf_counter()
+                checkpoint = campana.ejecutar()
+                segundos = time.perf_counter() - inicio
+                _, pico = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                enviados = checkpoint['enviados']
+                assert enviados == servidor.total_mensajes - previos
+                print(f"{enviados:8,} destinatarios  {segundos:7.2f} s  {enviados / segundos:7,.0f} mensajes/s  "
+                      f"memoria máxima {pico / 1024 / 1024:6.2f} MB")
+    finally:
+        shutil.rmtree(tmp_dir)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+Benchmark del formato columnar frente a CSV
+
+Mide el tamaño de cada archivo y el tiempo de una consulta analítica típica
+(facturación total por empresa) leyendo solo las columnas necesarias.
+
+Uso: python benchmarks/bench_columnar.py [cantidad_clientes]
+"""
+
+import os
+import sys
+import csv
+import time
+import tempfile
+import shutil
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from database.db_manager import DatabaseManager
+from database.json_manager import JSONManager
+from database.columnar import LectorColumnar
+from bench_exportacion import generar_filas
+
+def facturacion_por_empresa_csv(ruta):
+    totales = defaultdict(float)
+    with open(ruta, 'r', newline='', encoding='utf-8') as f:
+        for fila in csv.DictReader(f):
+            if fila['empresa']:
+                totales[fila['empresa']] += float(fila['facturacion_mensual'])
+    return totales
+
+def facturacion_por_empresa_columnar(ruta):
+    totales = defaultdict(float)
+    with LectorColumnar(ruta) as lector:
+        diccionario = lector.diccionario('empresa')
+        codigos = lector.valores('empresa')
+        facturacion = lector.valores('facturacion_mensual')
+        for codigo, monto in zip(codigos, facturacion):
+            empresa = diccionario[codigo]
+            if empresa:
+                totales[empresa] += monto
+        codigos.release()
+        facturacion.release()
+    return totales
+
+def medir(nombre, funcion):
+    inicio = time.perf_counter()
+    resultado = funcion()
+    print(f"{nombre:<35} {time.perf_counter() - inicio:8.3f} s")
+    return resultado
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    tmp_dir = tempfile.mkdtemp()
+
+    try:
+        db_manager = DatabaseManager(os.path.join(tmp_dir, "clientes.db"))
+        json_manager = JSONManager(os.path.join(tmp_dir, "backups"))
+        db_manager.aplicar_cambios(list(generar_filas(cantidad)), [])
+
+        print(f"{cantidad:,} clientes\n")
+        ruta_csv = medir("Exportar CSV stream",
+                         lambda: json_manager.exportar_clientes_csv_stream(db_manager))
+        ruta_col = medir("Exportar columnar",
+                         lambda: json_manager.exportar_clientes_columnar(db_manager))
+
+        print(f"\nTamaño CSV:      {os.path.getsize(ruta_csv) / 1048576:8.1f} MB")
+        print(f"Tamaño columnar: {os.path.getsize(ruta_col) / 1048576:8.1f} MB\n")
+
+        total_csv = medir("Facturación por empresa (CSV)",
+                          lambda: facturacion_por_empresa_csv(ruta_csv))
+        total_col = medir("Facturación por empresa (columnar)",
+                          lambda: facturacion_por_empresa_columnar(ruta_col))
+        assert total_csv.keys() == total_col.keys()
+
+    finally:
+        shutil.rmtree(tmp_dir)
+
+if __name__ == "__main__":
+    main()
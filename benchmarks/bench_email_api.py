@@ -0,0 +1,52 @@
+"""
+Benchmark de APIBasedEmailValidator contra un servidor HTTP local con latencia
+
+Compara validación serial, concurrente con pool de conexiones y por lotes.
+
+Uso: python benchmarks/bench_email_api.py [cantidad_emails] [latencia_ms]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from api_integrations.email_validator import APIBasedEmailValidator
+from tests.servidores_prueba import ServidorAPIEmailPrueba
+
+def medir(descripcion, servidor, emails, **opciones):
+    max_concurrencia = opciones.pop('max_concurrencia')
+    validator = APIBasedEmailValidator(api_key="bench", base_url=servidor.url, **opciones)
+    peticiones_previas = len(servidor.peticiones)
+
+    inicio = time.perf_counter()
+    resultados = validator.validar_lote(emails, max_concurrencia=max_concurrencia)
+    segundos = time.perf_counter() - inicio
+    validator.cerrar()
+
+    assert len(resultados) == len(emails)
+    peticiones = len(servidor.peticiones) - peticiones_previas
+    print(f"{descripcion:<34} {segundos:8.2f} s  {len(emails) / segundos:10,.0f} emails/s  "
+          f"{peticiones:6,} peticiones")
+    return segundos
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    latencia = (float(sys.argv[2]) if len(sys.argv) > 2 else 20) / 1000
+    emails = [f"cliente{i}@dominio{i % 50}.cl" for i in range(cantidad)]
+
+    with ServidorAPIEmailPrueba(latencia=latencia) as servidor:
+        print(f"Validando {cantidad:,} emails (latencia simulada {latencia * 1000:.0f} ms)\n")
+        serial = medir("Serial (1 conexión)", servidor, emails[:min(cantidad, 500)],
+                       modo_lote=False, max_concurrencia=1)
+        serial *= cantidad / min(cantidad, 500)
+        medir("Pool de 16 conexiones", servidor, emails, modo_lote=False, max_concurrencia=16)
+        lote = medir("Endpoint batch (100 por petición)", servidor, emails,
+                     modo_lote=True, tamaño_lote=100, max_concurrencia=4)
+        print(f"\nSerial estimado para {cantidad:,}: {serial:.1f} s "
+              f"({serial / lote:.0f}x más lento que por lotes)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""
+Benchmark de validación asíncrona de emails a 1k/10k/100k direcciones
+
+SimpleEmailValidator se mide en síncrono y asíncrono; APIBasedEmailValidator
+se mide contra un servidor HTTP local con latencia, email por email
+(concurrencia acotada) y por lotes.
+
+Uso: python benchmarks/bench_email_async.py [cantidades] [latencia_ms]
+     python benchmarks/bench_email_async.py 1000,10000,100000 20
+"""
+
+import os
+import sys
+import time
+import asyncio
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from api_integrations.email_validator import SimpleEmailValidator, APIBasedEmailValidator
+from tests.servidores_prueba import ServidorAPIEmailPrueba
+
+MAXIMO_EMAIL_POR_EMAIL = 10000
+
+def generar_emails(cantidad):
+    return [f"cliente{i}@dominio{i % 200}.cl" for i in range(cantidad)]
+
+def medir(descripcion, cantidad, funcion):
+    inicio = time.perf_counter()
+    resultados = funcion()
+    segundos = time.perf_counter() - inicio
+    assert len(resultados) == cantidad
+    print(f"  {descripcion:<38} {segundos:8.2f} s  {cantidad / segundos:12,.0f} emails/s")
+
+def main():
+    cantidades = [int(c) for c in (sys.argv[1] if len(sys.argv) > 1 else "1000,10000,100000").split(",")]
+    latencia = (float(sys.argv[2]) if len(sys.argv) > 2 else 20) / 1000
+
+    simple = SimpleEmailValidator()
+    with ServidorAPIEmailPrueba(latencia=latencia) as servidor:
+        for cantidad in cantidades:
+            emails = generar_emails(cantidad)
+            print(f"\n{cantidad:,} emails (latencia API {latencia * 1000:.0f} ms)")
+
+            medir("Simple síncrono", cantidad, lambda: [simple.validar_email(e) for e in emails])
+            medir("Simple validar_lote_async", cantidad,
+                  lambda: asyncio.run(simple.validar_lote_async(emails)))
+
+            if cantidad <= MAXIMO_EMAIL_POR_EMAIL:
+                api = APIBasedEmailValidator(api_key="bench", base_url=servidor.url,
+                                             modo_lote=False, max_conexiones=32)
+                medir("API async email por email (32)", cantidad,
+                      lambda: asyncio.run(api.validar_lote_async(emails, max_por_dominio=4)))
+                api.cerrar()
+            else:
+                print(f"  {'API async email por email':<38} omitido (> {MAXIMO_EMAIL_POR_EMAIL:,})")
+
+            api = APIBasedEmailValidator(api_key="bench", base_url=servidor.url,
+                                         modo_lote=True, tamaño_lote=500, max_conexiones=8)
+            medir("API async por lotes (500)", cantidad,
+                  lambda: asyncio.run(api.validar_lote_async(emails)))
+            api.cerrar()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+Benchmark de exportación: modelos vs. stream CSV vs. exportación particionada
+
+Uso: python benchmarks/bench_exportacion.py [cantidad_clientes]
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import shutil
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from database.db_manager import DatabaseManager
+from database.json_manager import JSONManager
+
+def generar_filas(cantidad):
+    """Genera filas sintéticas con el formato de la tabla clientes"""
+    for i in range(1, cantidad + 1):
+        if i % 3 == 0:
+            tipo, datos = "Regular", {'rut': '11.111.111-1', 'puntos_fidelidad': i}
+        elif i % 3 == 1:
+            tipo, datos = "Premium (oro)", {'rut': '22.222.222-2', 'nivel': 'oro',
+                                            'beneficios_extra': ['envio gratis']}
+        else:
+            tipo, datos = "Corporativo", {'rut': '76.123.456-7', 'empresa': f'Empresa {i % 50}',
+                                          'contacto_alterno': None, 'facturacion_mensual': i * 1.5}
+        yield (i, tipo, f"Cliente {i}", f"cliente{i}@email.com", "+56912345678",
+               "Calle 123", "2026-01-01 00:00:00", 1, json.dumps(datos))
+
+def medir(nombre, funcion, cantidad):
+    inicio = time.perf_counter()
+    funcion()
+    duracion = time.perf_counter() - inicio
+    print(f"{nombre:<35} {duracion:8.2f} s   {cantidad / duracion:12,.0f} filas/s")
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    tmp_dir = tempfile.mkdtemp()
+
+    try:
+        db_manager = DatabaseManager(os.path.join(tmp_dir, "clientes.db"))
+        json_manager = JSONManager(os.path.join(tmp_dir, "backups"))
+        db_manager.aplicar_cambios(list(generar_filas(cantidad)), [])
+
+        print(f"Exportando {cantidad:,} clientes\n")
+        medir("JSON con modelos", lambda: json_manager.exportar_clientes(
+            db_manager.obtener_todos_clientes()), cantidad)
+        medir("CSV con modelos", lambda: json_manager.exportar_clientes_csv(
+            db_manager.obtener_todos_clientes(), "clientes_export_modelos.csv"), cantidad)
+        medir("CSV stream", lambda: json_manager.exportar_clientes_csv_stream(
+            db_manager, "clientes_export_stream.csv"), cantidad)
+
+        for procesos in (1, 2, 4, 8):
+            medir(f"JSON particionado ({procesos} procesos)",
+                  lambda: json_manager.exportar_clientes_particionado(
+                      db_manager, num_particiones=procesos, procesos=procesos,
+                      nombre_archivo=f"clientes_export_p{procesos}.json"), cantidad)
+
+    finally:
+        shutil.rmtree(tmp_dir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark de logging: llamadas por segundo en el hilo que llama
+
+Compara la configuración anterior (RotatingFileHandler y StreamHandler
+atendidos en el mismo hilo) con utils.logger.Logger, que solo encola el
+registro y deja la escritura a un QueueListener. La consola se redirige a
+os.devnull en ambos casos; con una terminal real la diferencia es mayor.
+
+Uso: python benchmarks/bench_logger.py [cantidad_llamadas]
+"""
+
+import os
+import sys
+import time
+import shutil
+import logging
+import tempfile
+from logging.handlers import RotatingFileHandler
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from utils.logger import Logger
+
+def logger_sincrono(log_dir):
+    """Configuración previa de Logger: handlers directos sobre el logger"""
+    logger = logging.getLogger('GIC_SINCRONO')
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                                  datefmt='%Y-%m-%d %H:%M:%S')
+
+    file_handler = RotatingFileHandler(os.path.join(log_dir, "sincrono.log"), maxBytes=10485760, backupCount=5)
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(formatter)
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+    console_handler.setFormatter(formatter)
+
+    logger.addHandler(file_handler)
+    logger.addHandler(console_handler)
+    return logger, [file_handler, console_handler]
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    tmp_dir = tempfile.mkdtemp()
+    stderr = sys.stderr
+    sys.stderr = open(os.devnull, 'w')
+
+    try:
+        logger, handlers = logger_sincrono(tmp_dir)
+        inicio = time.perf_counter()
+        for i in range(cantidad):
+            logger.info(f"Cliente guardado: {i}")
+        sincrono = time.perf_counter() - inicio
+        for handler in handlers:
+            handler.close()
+
+        cola = Logger(tmp_dir, "cola")
+        inicio = time.perf_counter()
+        for i in range(cantidad):
+            cola.log(f"Cliente guardado: {i}", "INFO")
+        encolado = time.perf_counter() - inicio
+        cola.cerrar()
+        escrito = time.perf_counter() - inicio
+    finally:
+        sys.stderr.close()
+        sys.stderr = stderr
+        shutil.rmtree(tmp_dir)
+
+    print(f"{cantidad:,} llamadas a log en el hilo principal\n")
+    print(f"{'Handlers síncronos':<24} {sincrono:6.2f} s  {cantidad / sincrono:9,.0f} llamadas/s")
+    print(f"{'QueueHandler':<24} {encolado:6.2f} s  {cantidad / encolado:9,.0f} llamadas/s  "
+          f"(todo escrito tras {escrito:.2f} s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""
+Benchmark de lectura de logs recientes según el tamaño del archivo
+
+Compara readlines() sobre todo el archivo (implementación anterior de
+obtener_logs_recientes) con la lectura por bloques desde el final, y mide
+el seguimiento incremental (leer_desde) tras añadir unas pocas líneas.
+
+Uso: python benchmarks/bench_logs.py [MB,MB,...]
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from utils.logger import leer_ultimas_lineas, leer_desde
+
+LINEA = "2024-05-01 12:00:00 - GIC - INFO - Cliente guardado: Ana Pérez (ana.perez@empresa.cl) {}\n"
+
+def ultimas_lineas_readlines(ruta, lineas):
+    with open(ruta, 'r', encoding='utf-8') as f:
+        todas_lineas = f.readlines()
+    return todas_lineas[-lineas:] if len(todas_lineas) > lineas else todas_lineas
+
+def medir(funcion, repeticiones=20):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        resultado = funcion()
+    return (time.perf_counter() - inicio) / repeticiones * 1000, resultado
+
+def main():
+    tamaños = [int(t) for t in (sys.argv[1] if len(sys.argv) > 1 else "1,10").split(",")]
+    tmp_dir = tempfile.mkdtemp()
+
+    try:
+        print(f"{'Archivo':>8} {'readlines':>12} {'por bloques':>12} {'seguir':>10}")
+        for megas in tamaños:
+            ruta = os.path.join(tmp_dir, f"gic_{megas}.log")
+            with open(ruta, 'w', encoding='utf-8') as f:
+                i = 0
+                while f.tell() < megas * 1048576:
+                    f.write("".join(LINEA.format(i + j) for j in range(1000)))
+                    i += 1000
+
+            completo, esperado = medir(lambda: ultimas_lineas_readlines(ruta, 50))
+            bloques, resultado = medir(lambda: leer_ultimas_lineas(ruta, 50))
+            assert resultado == esperado
+
+            _, posicion = leer_desde(ruta, (os.stat(ruta).st_ino, os.path.getsize(ruta)))
+            with open(ruta, 'a', encoding='utf-8') as f:
+                f.write(LINEA.format("nuevo") * 5)
+            seguir, (nuevas, _) = medir(lambda: leer_desde(ruta, posicion))
+            assert len(nuevas) == 5
+
+            print(f"{megas:6} MB {completo:9.2f} ms {bloques:9.3f} ms {seguir:7.3f} ms")
+    finally:
+        shutil.rmtree(tmp_dir)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+Benchmark de campañas con construcción MIME en procesos: mensajes/s según el número de procesos
+
+Envía la misma campaña (segmento Premium) contra un servidor SMTP local que
+descarta los mensajes, primero construyendo cada MIME en los hilos de envío
+y después con 1, 2, 4 y 8 procesos que entregan los mensajes ya serializados
+a 4 hilos con sendmail. La ganancia depende de los núcleos disponibles.
+
+Uso: python benchmarks/bench_mime.py [clientes] [procesos,procesos,...]
+"""
+
+import os
+import sys
+import time
+import json
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from database.db_manager import DatabaseManager
+from api_integrations.notification_service import NotificationService
+from tests.servidores_prueba import ServidorSMTPPrueba
+from bench_exportacion import generar_filas
+
+PLANTILLA = """<html><body>
+<h1>Novedades de SolutionTech</h1>
+<p>Estimado/a {nombre},</p>
+<p>Como cliente de nivel {nivel} tiene acceso anticipado a las nuevas funciones.</p>
+<p>Su email registrado es {email} y su dirección {direccion}.</p>
+</body></html>"""
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 15000
+    procesos = [int(p) for p in (sys.argv[2] if len(sys.argv) > 2 else "1,2,4,8").split(",")]
+    tmp_dir = tempfile.mkdtemp()
+
+    try:
+        db_manager = DatabaseManager(os.path.join(tmp_dir, "clientes.db"))
+        db_manager.aplicar_cambios(list(generar_filas(cantidad)), [])
+
+        with ServidorSMTPPrueba(guardar_mensajes=False) as servidor:
+            ruta_config = os.path.join(tmp_dir, "email_config.json")
+            with open(ruta_config, 'w') as f:
+                json.dump(servidor.config(), f)
+            servicio = NotificationService(ruta_config)
+            print(f"Campaña al segmento Premium de {cantidad:,} clientes ({os.cpu_count()} CPU)\n")
+
+            for numero in [0] + procesos:
+                campana = servicio.crear_campana(
+                    f"bench_{numero}", db_manager, {'tipo': 'Premium'},
+                    "Novedades para {nombre}", PLANTILLA,
+                    directorio=os.path.join(tmp_dir, "campanas"), tamaño_pagina=500,
+                    num_conexiones=4, procesos_mime=numero)
+
+                previos = servidor.total_mensajes
+                inicio = time.perf_counter()
+                enviados = campana.ejecutar()['enviados']
+                segundos = time.perf_counter() - inicio
+
+                assert enviados == servidor.total_mensajes - previos
+                descripcion = f"{numero} procesos" if numero else "MIME en los hilos"
+                print(f"{descripcion:<20} {enviados:7,} mensajes  {segundos:6.2f} s  {enviados / segundos:7,.0f} mensajes/s")
+    finally:
+        shutil.rmtree(tmp_dir)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+Benchmark de renderizado del email de bienvenida: f-string por mensaje vs. plantilla compilada
+
+La versión original reconstruía todo el HTML (CSS incluido) y llamaba dos
+veces a datetime.now() por mensaje; se copia aquí como referencia. La
+plantilla compilada además escapa los campos como HTML.
+
+Uso: python benchmarks/bench_plantillas.py [cantidad_mensajes]
+"""
+
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from api_integrations.plantillas import crear_registro_por_defecto
+from models.cliente_premium import ClientePremium
+from models.cliente_regular import ClienteRegular
+
+def mensaje_original(cliente):
+    """Implementación previa de NotificationService._construir_mensaje_bienvenida"""
+
+    tipo_cliente = cliente.obtener_tipo()
+
+    mensaje_html = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <style>
+            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
+            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
+            .header {{ background-color: #4CAF50; color: white; padding: 10px; text-align: center; }}
+            .content {{ padding: 20px; }}
+            .benefits {{ background-color: #f9f9f9; padding: 15px; margin: 15px 0; }}
+            .footer {{ text-align: center; margin-top: 30px; color: #666; font-size: 0.9em; }}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <h1>¡Bienvenido a SolutionTech!</h1>
+            </div>
+
+            <div class="content">
+                <p>Estimado/a <strong>{cliente.nombre}</strong>,</p>
+
+                <p>Nos complace darle la bienvenida como nuestro nuevo cliente.</p>
+
+                <div class="benefits">
+                    <h3>Detalles de su cuenta:</h3>
+                    <ul>
+                        <li><strong>Tipo de cliente:</strong> {tipo_cliente}</li>
+                        <li><strong>Email registrado:</strong> {cliente.email}</li>
+                        <li><strong>Fecha de registro:</strong> {datetime.now().strftime('%d/%m/%Y')}</li>
+                    </ul>
+                </div>
+
+                <p>Como cliente {tipo_cliente.lower()}, usted tiene acceso a:</p>
+                <ul>
+                    <li>Gestión completa de su perfil</li>
+                    <li>Soporte técnico prioritario</li>
+                    <li>Actualizaciones regulares del sistema</li>
+                    <li>Beneficios exclusivos según su tipo de cliente</li>
+                </ul>
+
+                <p>Si tiene alguna pregunta, no dude en contactarnos.</p>
+
+                <p>Atentamente,<br>
+                <strong>El equipo de SolutionTech</strong></p>
+            </div>
+
+            <div class="footer">
+                <p>Este es un mensaje automático, por favor no responda a este email.</p>
+                <p>© {datetime.now().year} SolutionTech. Todos los derechos reservados.</p>
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+
+    return mensaje_html
+
+def crear_clientes(cantidad):
+    clientes = []
+    for i in range(cantidad):
+        if i % 2:
+            clientes.append(ClientePremium(i + 1, f"Cliente {i}", f"cliente{i}@empresa.cl",
+                                           "+56912345678", f"Calle {i} 123, Santiago", "12.345.678-5"))
+        else:
+            clientes.append(ClienteRegular(i + 1, f"Cliente {i}", f"cliente{i}@empresa.cl",
+                                           "+56912345678", f"Calle {i} 123, Santiago", "12.345.678-5"))
+    return clientes
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    clientes = crear_clientes(1000)
+    registro = crear_registro_por_defecto(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                       "plantillas_inexistentes"))
+    print(f"Renderizando {cantidad:,} emails de bienvenida\n")
+
+    resultados = {}
+    for descripcion, funcion in (("f-string por mensaje", mensaje_original),
+                                 ("Plantilla compilada", registro.renderizar_bienvenida)):
+        inicio = time.perf_counter()
+        for i in range(cantidad):
+            funcion(clientes[i % len(clientes)])
+        segundos = time.perf_counter() - inicio
+        resultados[descripcion] = segundos
+        print(f"{descripcion:<24} {segundos:7.2f} s  {cantidad / segundos:10,.0f} mensajes/s")
+
+    print(f"\nAceleración: {resultados['f-string por mensaje'] / resultados['Plantilla compilada']:.1f}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
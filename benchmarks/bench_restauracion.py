@@ -0,0 +1,54 @@
+"""
+Benchmark de restauración: guardar_cliente fila a fila vs. carga masiva
+
+Uso: python benchmarks/bench_restauracion.py [cantidad_clientes]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import shutil
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from database.db_manager import DatabaseManager
+from database.json_manager import JSONManager
+from database import restauracion
+from bench_exportacion import generar_filas
+
+def restaurar_fila_a_fila(ruta_backup, db_name):
+    origen = DatabaseManager(db_name + ".origen")
+    destino = DatabaseManager(db_name)
+    for filas in restauracion.leer_backup_json(ruta_backup):
+        for fila in filas:
+            destino.guardar_cliente(origen._deserializar_cliente(fila))
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    tmp_dir = tempfile.mkdtemp()
+
+    try:
+        db_manager = DatabaseManager(os.path.join(tmp_dir, "clientes.db"))
+        json_manager = JSONManager(os.path.join(tmp_dir, "backups"))
+        db_manager.aplicar_cambios(list(generar_filas(cantidad)), [])
+        ruta_backup = json_manager.crear_backup(db_manager)
+
+        print(f"Restaurando {cantidad:,} clientes\n")
+
+        inicio = time.perf_counter()
+        restaurar_fila_a_fila(ruta_backup, os.path.join(tmp_dir, "fila_a_fila.db"))
+        duracion = time.perf_counter() - inicio
+        print(f"{'guardar_cliente fila a fila':<30} {duracion:8.2f} s   {cantidad / duracion:12,.0f} filas/s")
+
+        estadisticas = restauracion.restaurar_masivo(
+            restauracion.leer_backup_json(ruta_backup), os.path.join(tmp_dir, "masiva.db"))
+        print(f"{'carga masiva':<30} {estadisticas['segundos_total']:8.2f} s   "
+              f"{estadisticas['filas_por_segundo']:12,.0f} filas/s")
+        print(f"{'  (construcción de índices)':<30} {estadisticas['segundos_indices']:8.2f} s")
+
+    finally:
+        shutil.rmtree(tmp_dir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Benchmark de validación de RUT: Validators.validar_rut uno a uno vs. API por lotes
+
+Uso: python benchmarks/bench_rut.py [cantidad_ruts]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from utils.validators import Validators
+from utils.rut import generar_ruts, calcular_digitos_verificadores, validar_ruts_lote, validar_cuerpos_lote
+
+def medir(descripcion, funcion, cantidad):
+    inicio = time.perf_counter()
+    funcion()
+    segundos = time.perf_counter() - inicio
+    print(f"{descripcion:<42} {segundos:8.3f} s  {cantidad / segundos / 1e6:8.2f} M RUT/s")
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+    inicio = time.perf_counter()
+    ruts = list(generar_ruts(cantidad, semilla=42))
+    print(f"Generados {cantidad:,} RUTs sintéticos en {time.perf_counter() - inicio:.2f} s\n")
+
+    cuerpos = [int(rut.replace(".", "")[:-2]) for rut in ruts]
+    digitos = "".join(rut[-1] for rut in ruts)
+
+    validar_uno_a_uno = Validators.validar_rut.__wrapped__
+    muestra = ruts[:min(cantidad, 100000)]
+    medir(f"validar_rut uno a uno (sin caché, {len(muestra):,})",
+          lambda: [validar_uno_a_uno(rut) for rut in muestra], len(muestra))
+    medir("validar_ruts_lote (texto)", lambda: validar_ruts_lote(ruts), cantidad)
+    medir("validar_cuerpos_lote (enteros + dígitos)",
+          lambda: validar_cuerpos_lote(cuerpos, digitos), cantidad)
+    medir("calcular_digitos_verificadores", lambda: calcular_digitos_verificadores(cuerpos), cantidad)
+
+    assert all(validar_ruts_lote(ruts))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
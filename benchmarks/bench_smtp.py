@@ -0,0 +1,61 @@
+"""
+Benchmark de envío SMTP: conexión nueva por mensaje vs. sesión persistente
+
+Usa un servidor SMTP local de prueba (sin TLS) que acepta todos los mensajes.
+
+Uso: python benchmarks/bench_smtp.py [cantidad_mensajes]
+"""
+
+import os
+import sys
+import time
+import smtplib
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from api_integrations.smtp_sesion import SesionSMTP
+from tests.servidores_prueba import ServidorSMTPPrueba
+
+def construir_mensaje(config, i):
+    msg = MIMEMultipart()
+    msg['Subject'] = f"Notificación {i}"
+    msg['From'] = config["sender_email"]
+    msg['To'] = f"cliente{i}@empresa.cl"
+    msg.attach(MIMEText(f"Mensaje de prueba {i}", 'plain'))
+    return msg
+
+def conexion_por_mensaje(config, cantidad):
+    for i in range(cantidad):
+        with smtplib.SMTP(config["smtp_server"], config["smtp_port"]) as server:
+            server.login(config["sender_email"], config["sender_password"])
+            server.send_message(construir_mensaje(config, i))
+
+def sesion_persistente(config, cantidad):
+    with SesionSMTP(config) as sesion:
+        for i in range(cantidad):
+            sesion.enviar(construir_mensaje(config, i))
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    with ServidorSMTPPrueba() as servidor:
+        config = servidor.config()
+        print(f"Enviando {cantidad:,} mensajes a un servidor SMTP local\n")
+
+        for descripcion, funcion in (("Conexión nueva por mensaje", conexion_por_mensaje),
+                                     ("Sesión persistente", sesion_persistente)):
+            conexiones_previas = servidor.conexiones
+            inicio = time.perf_counter()
+            funcion(config, cantidad)
+            segundos = time.perf_counter() - inicio
+            print(f"{descripcion:<28} {segundos:7.2f} s  {cantidad / segundos:8,.0f} mensajes/s  "
+                  f"{servidor.conexiones - conexiones_previas:5,} conexiones")
+
+        assert len(servidor.mensajes) == 2 * cantidad
+    print("\nCon un servidor remoto cada conexión añade además TCP + STARTTLS + AUTH (varios RTT).")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+import json
+import os
+import hashlib
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+class CatalogoBackups:
+
+    ARCHIVO = "catalogo.json"
+    PREFIJOS = {
+        "clientes_export_": "export",
+        "backup_completo_": "backup",
+        "backup_incremental_": "incremental"
+    }
+
+    def __init__(self, backup_dir):
+        self.backup_dir = backup_dir
+        self.ruta = os.path.join(backup_dir, self.ARCHIVO)
+        self._lock = threading.Lock()
+        self._entradas = None
+        self._firma = None
+
+    @classmethod
+    def tipo_por_nombre(cls, nombre):
+        for prefijo, tipo in cls.PREFIJOS.items():
+            if nombre.startswith(prefijo):
+                return tipo
+        return None
+
+    @staticmethod
+    def calcular_checksum(ruta, tamaño_bloque=1048576):
+        sha = hashlib.sha256()
+        with open(ruta, 'rb') as f:
+            for bloque in iter(lambda: f.read(tamaño_bloque), b''):
+                sha.update(bloque)
+        return sha.hexdigest()
+
+    def _leer_firma(self):
+        try:
+            estado = os.stat(self.ruta)
+        except OSError:
+            return None
+        return (estado.st_mtime_ns, estado.st_size, estado.st_ino)
+
+    @contextmanager
+    def _bloqueo(self):
+        """Exclusión entre hilos y entre procesos (otro JSONManager sobre el mismo directorio)"""
+        with self._lock, open(self.ruta + ".lock", 'a+b') as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _cargar(self, forzar=False):
+        """Entradas del catálogo; se releen del disco si el archivo cambió desde la última lectura"""
+        firma = self._leer_firma()
+        if self._entradas is not None and firma == self._firma and not forzar:
+            return self._entradas
+
+        if firma is not None:
+            with open(self.ruta, 'r', encoding='utf-8') as f:
+                self._entradas = json.load(f).get('entradas', {})
+            self._firma = firma
+        else:
+            self._entradas = self._reconstruir()
+            self._guardar()
+
+        return self._entradas
+
+    def _reconstruir(self):
+        entradas = {}
+        for archivo in os.listdir(self.backup_dir):
+            tipo = self.tipo_por_nombre(archivo)
+            if not tipo:
+                continue
+
+            ruta = os.path.join(self.backup_dir, archivo)
+            entradas[archivo] = {
+                'nombre': archivo,
+                'tipo': tipo,
+                'formato': os.path.splitext(archivo)[1].lstrip('.'),
+                'compresion': None,
+                'tamaño': os.path.getsize(ruta),
+                'filas': None,
+                'checksum': self.calcular_checksum(ruta),
+                'fecha': datetime.fromtimestamp(os.path.getmtime(ruta)).isoformat(),
+                'base': None
+            }
+        return entradas
+
+    def _guardar(self):
+        ruta_tmp = self.ruta + ".tmp"
+        with open(ruta_tmp, 'w', encoding='utf-8') as f:
+            json.dump({'entradas': self._entradas}, f, indent=2)
+        os.replace(ruta_tmp, self.ruta)
+        self._firma = self._leer_firma()
+
+    def registrar(self, nombre, filas=None, tipo=None, compresion=None, base=None):
+        ruta = os.path.join(self.backup_dir, nombre)
+        entrada = {
+            'nombre': nombre,
+            'tipo': tipo or self.tipo_por_nombre(nombre) or "export",
+            'formato': os.path.splitext(nombre)[1].lstrip('.'),
+            'compresion': compresion,
+            'tamaño': os.path.getsize(ruta),
+            'filas': filas,
+            'checksum': self.calcular_checksum(ruta),
+            'fecha': datetime.now().isoformat(),
+            'base': base
+        }
+
+        with self._bloqueo():
+            self._cargar(forzar=True)[nombre] = entrada
+            self._guardar()
+
+        return entrada
+
+    def eliminar(self, nombres):
+        with self._bloqueo():
+            entradas = self._cargar(forzar=True)
+            for nombre in nombres:
+                entradas.pop(nombre, None)
+            self._guardar()
+
+    def listar(self, tipo=None):
+        with self._bloqueo():
+            entradas = list(self._cargar().values())
+
+        if tipo:
+            entradas = [e for e in entradas if e['tipo'] == tipo]
+
+        return sorted(entradas, key=lambda e: e['fecha'], reverse=True)
+
+    def ultimo_valido(self, tipo="backup", verificar=False):
+        for entrada in self.listar(tipo):
+            if not entrada.get('checksum'):
+                continue
+
+            if verificar:
+                ruta = os.path.join(self.backup_dir, entrada['nombre'])
+                if not os.path.exists(ruta) or self.calcular_checksum(ruta) != entrada['checksum']:
+                    continue
+
+            return entrada
+
+        return None
+
+    def cerrar_dependencias(self, conservar):
+        entradas = self.listar()
+        conservar = set(conservar)
+
+        for entrada in entradas:
+            if entrada['nombre'] not in conservar or not entrada.get('base'):
+                continue
+
+            for otra in entradas:
+                if otra.get('base') == entrada['base'] and otra['fecha'] <= entrada['fecha']:
+                    conservar.add(otra['nombre'])
+            conservar.add(entrada['base'])
+
+        return conservar
+
+    def seleccionar_poda(self, max_edad_dias=None, max_cantidad=None, tipo=None):
+        entradas = self.listar(tipo)
+        conservar = {e['nombre'] for e in entradas}
+
+        if max_edad_dias is not None:
+            limite = (datetime.now() - timedelta(days=max_edad_dias)).isoformat()
+            conservar = {e['nombre'] for e in entradas if e['fecha'] >= limite}
+
+        if max_cantidad is not None:
+            recientes = [e['nombre'] for e in entradas if e['nombre'] in conservar]
+            conservar = set(recientes[:max_cantidad])
+
+        conservar = self.cerrar_dependencias(conservar)
+        return [e for e in entradas if e['nombre'] not in conservar]
@@ -0,0 +1,247 @@
+import json
+import mmap
+import struct
+import sys
+import calendar
+from array import array
+from datetime import datetime
+
+MAGICO = b"GICCOL01"
+MAGICO_PIE = b"GICCOLFT"
+CABECERA = struct.Struct("<8sQI")
+PIE = struct.Struct("<QI8s")
+
+ESQUEMA = [
+    ('id', 'int64'),
+    ('tipo', 'dict'),
+    ('nombre', 'str'),
+    ('email', 'str'),
+    ('telefono', 'str'),
+    ('direccion', 'str'),
+    ('rut', 'str'),
+    ('fecha_registro', 'int64'),
+    ('activo', 'bool'),
+    ('puntos_fidelidad', 'int64'),
+    ('nivel', 'dict'),
+    ('beneficios_extra', 'str'),
+    ('empresa', 'dict'),
+    ('contacto_alterno', 'str'),
+    ('facturacion_mensual', 'float64'),
+]
+
+CODIGOS_TIPO = {'int64': 'q', 'float64': 'd', 'bool': 'B'}
+
+def _a_epoch(fecha):
+    if not fecha:
+        return None
+    try:
+        return calendar.timegm(datetime.strptime(fecha, "%Y-%m-%d %H:%M:%S").timetuple())
+    except (ValueError, TypeError):
+        return None
+
+def _a_bytes_le(arreglo):
+    if sys.byteorder == 'big':
+        arreglo = array(arreglo.typecode, arreglo)
+        arreglo.byteswap()
+    return arreglo.tobytes()
+
+class _ColumnaNumerica:
+
+    def __init__(self, tipo):
+        self.tipo = tipo
+        self.valores = array(CODIGOS_TIPO[tipo])
+        self.nulos = None
+
+    def agregar(self, valor):
+        if valor is None:
+            if self.nulos is None:
+                self.nulos = bytearray(len(self.valores))
+            self.nulos.append(1)
+            valor = 0
+        elif self.nulos is not None:
+            self.nulos.append(0)
+        self.valores.append(valor)
+
+    def bloques(self):
+        bloques = {'valores': _a_bytes_le(self.valores)}
+        if self.nulos is not None:
+            bloques['nulos'] = bytes(self.nulos)
+        return bloques, {}
+
+class _ColumnaDiccionario:
+
+    def __init__(self):
+        self.diccionario = {}
+        self.codigos = array('I')
+
+    def agregar(self, valor):
+        codigo = self.diccionario.get(valor)
+        if codigo is None:
+            codigo = self.diccionario[valor] = len(self.diccionario)
+        self.codigos.append(codigo)
+
+    def bloques(self):
+        tamaño = len(self.diccionario)
+        codigo_tipo = 'B' if tamaño <= 0xFF else 'H' if tamaño <= 0xFFFF else 'I'
+        codigos = array(codigo_tipo, self.codigos)
+        return {'codigos': _a_bytes_le(codigos)}, {
+            'ancho': codigo_tipo,
+            'diccionario': list(self.diccionario)
+        }
+
+class _ColumnaTexto:
+
+    def __init__(self):
+        self.offsets = array('q', [0])
+        self.datos = bytearray()
+
+    def agregar(self, valor):
+        if valor:
+            self.datos += str(valor).encode('utf-8')
+        self.offsets.append(len(self.datos))
+
+    def bloques(self):
+        codigo_tipo = 'I' if len(self.datos) <= 0xFFFFFFFF else 'q'
+        offsets = array(codigo_tipo, self.offsets)
+        return {'offsets': _a_bytes_le(offsets), 'datos': bytes(self.datos)}, {
+            'ancho': codigo_tipo
+        }
+
+def _nueva_columna(tipo):
+    if tipo == 'dict':
+        return _ColumnaDiccionario()
+    if tipo == 'str':
+        return _ColumnaTexto()
+    return _ColumnaNumerica(tipo)
+
+def escribir_columnar(lotes_filas, ruta):
+    columnas = [(nombre, tipo, _nueva_columna(tipo)) for nombre, tipo in ESQUEMA]
+    total = 0
+
+    for filas in lotes_filas:
+        for (cliente_id, tipo, nombre, email, telefono, direccion,
+             fecha_registro, activo, datos_especificos) in filas:
+            datos = json.loads(datos_especificos) if datos_especificos else {}
+            beneficios = datos.get('beneficios_extra')
+
+            valores = (
+                cliente_id, tipo, nombre, email, telefono, direccion,
+                datos.get('rut'), _a_epoch(fecha_registro), 1 if activo else 0,
+                datos.get('puntos_fidelidad'), datos.get('nivel'),
+                "|".join(beneficios) if beneficios else None,
+                datos.get('empresa'), datos.get('contacto_alterno'),
+                datos.get('facturacion_mensual')
+            )
+            for (_, _, columna), valor in zip(columnas, valores):
+                columna.agregar(valor)
+            total += 1
+
+    with open(ruta, 'wb') as f:
+        f.write(CABECERA.pack(MAGICO, total, len(columnas)))
+
+        indice = []
+        for nombre, tipo, columna in columnas:
+            bloques, extra = columna.bloques()
+            entrada = {'nombre': nombre, 'tipo': tipo, 'bloques': {}}
+            entrada.update(extra)
+
+            for clave, contenido in bloques.items():
+                relleno = -f.tell() % 8
+                f.write(b"\0" * relleno)
+                entrada['bloques'][clave] = [f.tell(), len(contenido)]
+                f.write(contenido)
+
+            indice.append(entrada)
+
+        pie = json.dumps({'filas': total, 'columnas': indice}).encode('utf-8')
+        offset_pie = f.tell()
+        f.write(pie)
+        f.write(PIE.pack(offset_pie, len(pie), MAGICO_PIE))
+
+    return total
+
+class LectorColumnar:
+
+    def __init__(self, ruta):
+        self._archivo = open(ruta, 'rb')
+        self._mm = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mm) < CABECERA.size + PIE.size:
+            self.cerrar()
+            raise ValueError(f"Archivo columnar inválido: {ruta}")
+
+        magico, self.filas, _ = CABECERA.unpack_from(self._mm, 0)
+        offset_pie, longitud_pie, magico_pie = PIE.unpack_from(self._mm, len(self._mm) - PIE.size)
+        if magico != MAGICO or magico_pie != MAGICO_PIE:
+            self.cerrar()
+            raise ValueError(f"Archivo columnar inválido: {ruta}")
+
+        pie = json.loads(self._mm[offset_pie:offset_pie + longitud_pie])
+        self._indice = {columna['nombre']: columna for columna in pie['columnas']}
+
+    @property
+    def columnas(self):
+        return list(self._indice)
+
+    def _bloque(self, columna, clave, codigo_tipo=None):
+        offset, longitud = columna['bloques'][clave]
+        vista = memoryview(self._mm)[offset:offset + longitud]
+        if codigo_tipo is None:
+            return vista
+        if sys.byteorder == 'big':
+            arreglo = array(codigo_tipo, vista)
+            arreglo.byteswap()
+            return arreglo
+        return vista.cast(codigo_tipo)
+
+    def valores(self, nombre):
+        columna = self._indice[nombre]
+        if columna['tipo'] in CODIGOS_TIPO:
+            return self._bloque(columna, 'valores', CODIGOS_TIPO[columna['tipo']])
+        if columna['tipo'] == 'dict':
+            return self._bloque(columna, 'codigos', columna['ancho'])
+        raise ValueError(f"La columna {nombre} no es de ancho fijo")
+
+    def nulos(self, nombre):
+        columna = self._indice[nombre]
+        if 'nulos' not in columna['bloques']:
+            return None
+        return self._bloque(columna, 'nulos')
+
+    def diccionario(self, nombre):
+        return self._indice[nombre]['diccionario']
+
+    def columna(self, nombre):
+        columna = self._indice[nombre]
+
+        if columna['tipo'] == 'dict':
+            diccionario = columna['diccionario']
+            return [diccionario[codigo] for codigo in self.valores(nombre)]
+
+        if columna['tipo'] == 'str':
+            offsets = self._bloque(columna, 'offsets', columna['ancho'])
+            datos = bytes(self._bloque(columna, 'datos'))
+            return [datos[offsets[i]:offsets[i + 1]].decode('utf-8')
+                    for i in range(self.filas)]
+
+        valores = self.valores(nombre).tolist()
+        nulos = self.nulos(nombre)
+        if columna['tipo'] == 'bool':
+            valores = [bool(v) for v in valores]
+        if nulos is not None:
+            valores = [None if nulo else v for v, nulo in zip(valores, nulos)]
+        return valores
+
+    def cerrar(self):
+        try:
+            self._mm.close()
+        except BufferError:
+            pass
+        self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.cerrar()
+        return False
@@ -1,44 +1,32 @@
 import sqlite3
 import json
+import os
+import time
 from datetime import datetime
 from models.cliente_regular import ClienteRegular
 from models.cliente_premium import ClientePremium
 from models.cliente_corporativo import ClienteCorporativo
+from database.mapeo import COLUMNAS_CLIENTES, calcular_hash_contenido, hash_de_fila
+from database.snapshot import SnapshotLectura
 
 class DatabaseManager:
     
     def __init__(self, db_name="clientes.db"):
         self.db_name = db_name
         self._init_database()
+        self.reiniciar_estadisticas_guardado()
     
     def _init_database(self):
         try:
             conn = sqlite3.connect(self.db_name)
             cursor = conn.cursor()
             
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS clientes (
-                    id INTEGER PRIMARY KEY,
-                    tipo TEXT NOT NULL,
-                    nombre TEXT NOT NULL,
-                    email TEXT UNIQUE NOT NULL,
-                    telefono TEXT NOT NULL,
-                    direccion TEXT NOT NULL,
-                    fecha_registro TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    activo BOOLEAN DEFAULT 1,
-                    datos_especificos TEXT
-                )
-            ''')
+            cursor.execute('PRAGMA journal_mode=WAL')
             
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS logs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    accion TEXT NOT NULL,
-                    detalles TEXT,
-                    usuario TEXT
-                )
-            ''')
+            self._crear_tablas(cursor)
+            self._migrar_esquema(cursor)
+            self._crear_indices(cursor)
+            self._crear_triggers(cursor)
             
             conn.commit()
             conn.close()
@@ -47,17 +35,103 @@ class DatabaseManager:
             print(f"Error al inicializar la base de datos: {e}")
             raise
     
+    @staticmethod
+    def _crear_tablas(cursor, email_unico=True):
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS clientes (
+                id INTEGER PRIMARY KEY,
+                tipo TEXT NOT NULL,
+                nombre TEXT NOT NULL,
+                email TEXT {"UNIQUE " if email_unico else ""}NOT NULL,
+                telefono TEXT NOT NULL,
+                direccion TEXT NOT NULL,
+                fecha_registro TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                activo BOOLEAN DEFAULT 1,
+                datos_especificos TEXT,
+                hash_contenido TEXT
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS logs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                accion TEXT NOT NULL,
+                detalles TEXT,
+                usuario TEXT
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS cambios (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                cliente_id INTEGER NOT NULL,
+                operacion TEXT NOT NULL,
+                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+    
+    @staticmethod
+    def _migrar_esquema(cursor):
+        cursor.execute('PRAGMA table_info(clientes)')
+        columnas = {row[1] for row in cursor.fetchall()}
+        if 'hash_contenido' not in columnas:
+            cursor.execute('ALTER TABLE clientes ADD COLUMN hash_contenido TEXT')
+    
+    @staticmethod
+    def _crear_indices(cursor, email_unico=False):
+        if email_unico:
+            cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_clientes_email ON clientes(email)')
+        
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_clientes_nombre ON clientes(nombre)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON logs(timestamp)')
+    
+    @staticmethod
+    def _crear_triggers(cursor):
+        for operacion, evento, referencia in (("I", "INSERT", "NEW"),
+                                              ("U", "UPDATE", "NEW"),
+                                              ("D", "DELETE", "OLD")):
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS clientes_cambios_{operacion.lower()}
+                AFTER {evento} ON clientes
+                BEGIN
+                    INSERT INTO cambios (cliente_id, operacion)
+                    VALUES ({referencia}.id, '{operacion}');
+                END
+            ''')
+    
+    def _conectar_escritura(self):
+        # Sin recursive_triggers, las filas que INSERT OR REPLACE borra por conflicto
+        # de email no disparan el trigger de DELETE y la cadena incremental no las vería
+        conn = sqlite3.connect(self.db_name)
+        conn.execute('PRAGMA recursive_triggers=ON')
+        return conn
+    
+    def reiniciar_estadisticas_guardado(self):
+        self.estadisticas_guardado = {'insertados': 0, 'actualizados': 0, 'omitidos': 0}
+    
     def guardar_cliente(self, cliente):
         try:
-            conn = sqlite3.connect(self.db_name)
+            conn = self._conectar_escritura()
             cursor = conn.cursor()
             
             datos_especificos = self._serializar_datos_especificos(cliente)
+            hash_contenido = calcular_hash_contenido(
+                cliente.obtener_tipo(), cliente.nombre, cliente.email,
+                cliente.telefono, cliente.direccion, datos_especificos, cliente.activo)
+            
+            cursor.execute('SELECT hash_contenido FROM clientes WHERE id = ?', (cliente.id,))
+            existente = cursor.fetchone()
+            
+            if existente and existente[0] == hash_contenido:
+                conn.close()
+                self.estadisticas_guardado['omitidos'] += 1
+                return True
             
             cursor.execute('''
                 INSERT OR REPLACE INTO clientes 
-                (id, tipo, nombre, email, telefono, direccion, datos_especificos)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                (id, tipo, nombre, email, telefono, direccion, activo, datos_especificos, hash_contenido)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (
                 cliente.id,
                 cliente.obtener_tipo(),
@@ -65,12 +139,15 @@ class DatabaseManager:
                 cliente.email,
                 cliente.telefono,
                 cliente.direccion,
-                datos_especificos
+                1 if cliente.activo else 0,
+                datos_especificos,
+                hash_contenido
             ))
             
             conn.commit()
             conn.close()
             
+            self.estadisticas_guardado['actualizados' if existente else 'insertados'] += 1
             self._log_accion("CLIENTE_GUARDADO", f"Cliente {cliente.id} - {cliente.nombre}")
             
             return True
@@ -96,14 +173,15 @@ class DatabaseManager:
             datos['contacto_alterno'] = cliente.contacto_alterno
             datos['facturacion_mensual'] = cliente.facturacion_mensual
         
-        return json.dumps(datos)
+        return json.dumps(datos, sort_keys=True)
     
     def cargar_cliente(self, cliente_id):
         try:
             conn = sqlite3.connect(self.db_name)
             cursor = conn.cursor()
             
-            cursor.execute('SELECT * FROM clientes WHERE id = ?', (cliente_id,))
+            cursor.execute(f"SELECT {', '.join(COLUMNAS_CLIENTES)} FROM clientes WHERE id = ?",
+                           (cliente_id,))
             row = cursor.fetchone()
             
             conn.close()
@@ -117,6 +195,13 @@ class DatabaseManager:
             print(f"Error al cargar cliente: {e}")
             return None
     
+    def fila_valida(self, row):
+        """True si la fila describe un cliente de tipo conocido que pasa las validaciones del modelo"""
+        try:
+            return self._deserializar_cliente(row) is not None
+        except ValueError:
+            return False
+    
     def _deserializar_cliente(self, row):
         (cliente_id, tipo, nombre, email, telefono, direccion, 
          fecha_registro, activo, datos_especificos) = row
@@ -169,7 +254,7 @@ class DatabaseManager:
             conn = sqlite3.connect(self.db_name)
             cursor = conn.cursor()
             
-            cursor.execute('SELECT * FROM clientes ORDER BY nombre')
+            cursor.execute(f"SELECT {', '.join(COLUMNAS_CLIENTES)} FROM clientes ORDER BY nombre")
             rows = cursor.fetchall()
             
             conn.close()
@@ -211,7 +296,8 @@ class DatabaseManager:
             conn = sqlite3.connect(self.db_name)
             cursor = conn.cursor()
             
-            query = f"SELECT * FROM clientes WHERE {criterio} LIKE ? ORDER BY nombre"
+            query = (f"SELECT {', '.join(COLUMNAS_CLIENTES)} FROM clientes "
+                     f"WHERE {criterio} LIKE ? ORDER BY nombre")
             cursor.execute(query, (f'%{valor}%',))
             
             rows = cursor.fetchall()
@@ -263,4 +349,261 @@ class DatabaseManager:
             
         except sqlite3.Error as e:
             print(f"Error al obtener logs: {e}")
-            return []
\ No newline at end of file
+            return []
+    
+    def crear_backup_nativo(self, ruta_destino, paginas_por_paso=1024, pausa=0.0, progreso=None):
+        try:
+            origen = sqlite3.connect(self.db_name)
+            destino = sqlite3.connect(ruta_destino)
+            
+            def _progreso(status, restantes, total):
+                if progreso:
+                    progreso(total - restantes, total)
+                if pausa:
+                    time.sleep(pausa)
+            
+            with destino:
+                origen.backup(destino, pages=paginas_por_paso, progress=_progreso)
+            
+            destino.close()
+            origen.close()
+            
+            self._log_accion("BACKUP_NATIVO", ruta_destino)
+            
+            return True
+            
+        except sqlite3.Error as e:
+            print(f"Error al crear backup nativo: {e}")
+            return False
+    
+    def restaurar_backup_nativo(self, ruta_origen, paginas_por_paso=-1):
+        try:
+            if not os.path.exists(ruta_origen):
+                print(f"Backup no encontrado: {ruta_origen}")
+                return False
+            
+            origen = sqlite3.connect(ruta_origen)
+            destino = sqlite3.connect(self.db_name)
+            
+            with destino:
+                origen.backup(destino, pages=paginas_por_paso)
+            
+            destino.close()
+            origen.close()
+            
+            self._log_accion("BACKUP_RESTAURADO", ruta_origen)
+            
+            return True
+            
+        except sqlite3.Error as e:
+            print(f"Error al restaurar backup nativo: {e}")
+            return False
+    
+    @staticmethod
+    def _leer_secuencia_cambios(cursor):
+        cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'cambios'")
+        row = cursor.fetchone()
+        return row[0] if row else 0
+    
+    def obtener_secuencia_cambios(self, db_name=None):
+        try:
+            conn = sqlite3.connect(db_name or self.db_name)
+            cursor = conn.cursor()
+            
+            seq = self._leer_secuencia_cambios(cursor)
+            
+            conn.close()
+            return seq
+            
+        except sqlite3.Error as e:
+            print(f"Error al obtener secuencia de cambios: {e}")
+            return None
+    
+    def obtener_cambios_desde(self, seq_desde):
+        try:
+            conn = sqlite3.connect(self.db_name)
+            cursor = conn.cursor()
+            
+            cursor.execute("BEGIN")
+            seq_hasta = self._leer_secuencia_cambios(cursor)
+            
+            cursor.execute(f'''
+                SELECT {', '.join('c.' + columna for columna in COLUMNAS_CLIENTES)} FROM clientes c
+                JOIN (SELECT DISTINCT cliente_id FROM cambios
+                      WHERE seq > ? AND seq <= ?) x ON c.id = x.cliente_id
+                ORDER BY c.id
+            ''', (seq_desde, seq_hasta))
+            filas = cursor.fetchall()
+            
+            cursor.execute('''
+                SELECT DISTINCT cliente_id FROM cambios
+                WHERE seq > ? AND seq <= ?
+                AND cliente_id NOT IN (SELECT id FROM clientes)
+                ORDER BY cliente_id
+            ''', (seq_desde, seq_hasta))
+            eliminados = [row[0] for row in cursor.fetchall()]
+            
+            conn.rollback()
+            conn.close()
+            
+            return {
+                'seq_desde': seq_desde,
+                'seq_hasta': seq_hasta,
+                'filas': filas,
+                'eliminados': eliminados
+            }
+            
+        except sqlite3.Error as e:
+            print(f"Error al obtener cambios: {e}")
+            return None
+    
+    def aplicar_cambios(self, filas, eliminados):
+        try:
+            conn = self._conectar_escritura()
+            cursor = conn.cursor()
+            
+            cursor.executemany('''
+                INSERT OR REPLACE INTO clientes 
+                (id, tipo, nombre, email, telefono, direccion,
+                 fecha_registro, activo, datos_especificos, hash_contenido)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [tuple(fila) + (hash_de_fila(fila),) for fila in filas])
+            cursor.executemany('DELETE FROM clientes WHERE id = ?',
+                               [(cliente_id,) for cliente_id in eliminados])
+            
+            conn.commit()
+            conn.close()
+            
+            self._log_accion("CAMBIOS_APLICADOS",
+                             f"{len(filas)} actualizados, {len(eliminados)} eliminados")
+            
+            return True
+            
+        except sqlite3.Error as e:
+            print(f"Error al aplicar cambios: {e}")
+            return False
+    
+    def purgar_cambios(self, hasta_seq):
+        try:
+            conn = sqlite3.connect(self.db_name)
+            cursor = conn.cursor()
+            
+            cursor.execute('DELETE FROM cambios WHERE seq <= ?', (hasta_seq,))
+            
+            conn.commit()
+            conn.close()
+            
+            return True
+            
+        except sqlite3.Error as e:
+            print(f"Error al purgar cambios: {e}")
+            return False
+    
+    def fijar_secuencia_cambios(self, seq):
+        try:
+            conn = sqlite3.connect(self.db_name)
+            cursor = conn.cursor()
+            
+            cursor.execute('DELETE FROM cambios')
+            cursor.execute("DELETE FROM sqlite_sequence WHERE name = 'cambios'")
+            cursor.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('cambios', ?)", (seq,))
+            
+            conn.commit()
+            conn.close()
+            
+            return True
+            
+        except sqlite3.Error as e:
+            print(f"Error al fijar secuencia de cambios: {e}")
+            return False
+    
+    def contar_clientes(self, db_name=None):
+        try:
+            conn = sqlite3.connect(db_name or self.db_name)
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT COUNT(*) FROM clientes')
+            total = cursor.fetchone()[0]
+            
+            conn.close()
+            return total
+            
+        except sqlite3.Error as e:
+            print(f"Error al contar clientes: {e}")
+            return None
+    
+    def iterar_filas(self, tamaño_lote=5000):
+        conn = sqlite3.connect(self.db_name)
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT {', '.join(COLUMNAS_CLIENTES)} FROM clientes ORDER BY id")
+            
+            while True:
+                filas = cursor.fetchmany(tamaño_lote)
+                if not filas:
+                    break
+                yield filas
+                
+        finally:
+            conn.close()
+    
+    def iterar_segmento(self, tipo=None, datos=None, solo_activos=True, desde_id=0, tamaño_pagina=1000):
+        """Recorre por páginas (keyset sobre id) los clientes de un segmento.
+        
+        tipo filtra por prefijo ("Premium" incluye "Premium (oro)") y datos por
+        igualdad de campos de datos_especificos, p. ej. {'nivel': 'platino'}.
+        Cada página es una consulta independiente, así que no se mantiene
+        abierta ninguna transacción entre páginas.
+        """
+        condiciones = ["id > ?"]
+        parametros = []
+        if tipo:
+            condiciones.append("tipo LIKE ?")
+            parametros.append(f"{tipo}%")
+        if solo_activos:
+            condiciones.append("activo = 1")
+        for clave, valor in (datos or {}).items():
+            condiciones.append("json_extract(datos_especificos, ?) = ?")
+            parametros.extend([f"$.{clave}", valor])
+        
+        consulta = (f"SELECT {', '.join(COLUMNAS_CLIENTES)} FROM clientes "
+                    f"WHERE {' AND '.join(condiciones)} ORDER BY id LIMIT ?")
+        
+        ultimo_id = desde_id
+        while True:
+            conn = sqlite3.connect(self.db_name)
+            try:
+                filas = conn.execute(consulta, [ultimo_id] + parametros + [tamaño_pagina]).fetchall()
+            finally:
+                conn.close()
+            
+            if not filas:
+                break
+            yield filas
+            ultimo_id = filas[-1][0]
+            if len(filas) < tamaño_pagina:
+                break
+    
+    def snapshot(self):
+        return SnapshotLectura(self)
+    
+    def obtener_hashes(self, ids):
+        try:
+            conn = sqlite3.connect(self.db_name)
+            cursor = conn.cursor()
+            
+            hashes = {}
+            ids = list(ids)
+            for i in range(0, len(ids), 900):
+                lote = ids[i:i + 900]
+                cursor.execute(
+                    f"SELECT id, hash_contenido FROM clientes WHERE id IN ({', '.join('?' * len(lote))})",
+                    lote)
+                hashes.update(cursor.fetchall())
+            
+            conn.close()
+            return hashes
+            
+        except sqlite3.Error as e:
+            print(f"Error al obtener hashes: {e}")
+            return {}
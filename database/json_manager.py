@@ -1,13 +1,25 @@
 import json
 import csv
 import os
+import shutil
+import threading
 from datetime import datetime
+from database.catalogo import CatalogoBackups
+from database.mapeo import CAMPOS_EXPORTACION, compilar_mapeador_csv, dict_a_fila, hash_de_fila
+from database import particiones
+from database.columnar import escribir_columnar
+from database import restauracion
 
 class JSONManager:
     
-    def __init__(self, backup_dir="backups"):
+    ARCHIVO_CADENA = "cadena_backups.json"
+    
+    def __init__(self, backup_dir="backups", politica_retencion=None):
         self.backup_dir = backup_dir
         self._crear_directorio()
+        self.catalogo = CatalogoBackups(backup_dir)
+        self.politica_retencion = politica_retencion
+        self._timer_retencion = None
     
     def _crear_directorio(self):
         if not os.path.exists(self.backup_dir):
@@ -39,6 +51,8 @@ class JSONManager:
             with open(ruta_completa, 'w', encoding='utf-8') as f:
                 json.dump(clientes_dict, f, indent=2, default=str)
             
+            self._registrar_archivo(nombre_archivo, filas=len(clientes_dict))
+            
             return ruta_completa
             
         except Exception as e:
@@ -56,11 +70,9 @@ class JSONManager:
             if not clientes:
                 return None
 
-            fieldnames = ['id', 'nombre', 'email', 'telefono', 'direccion', 
-                          'tipo', 'rut', 'fecha_registro', 'activo', 
-                          'puntos_fidelidad', 'nivel', 'beneficios_extra',
-                          'empresa', 'contacto_alterno', 'facturacion_mensual']
+            fieldnames = CAMPOS_EXPORTACION
             
+            total = 0
             with open(ruta_completa, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.DictWriter(f, fieldnames=fieldnames)
                 writer.writeheader()
@@ -79,6 +91,38 @@ class JSONManager:
                     
                     row = {k: info.get(k, '') for k in fieldnames}
                     writer.writerow(row)
+                    total += 1
+            
+            self._registrar_archivo(nombre_archivo, filas=total)
+            
+            return ruta_completa
+            
+        except Exception as e:
+            print(f"Error al exportar CSV: {e}")
+            return None
+
+    def exportar_clientes_csv_stream(self, db_manager, nombre_archivo=None, tamaño_lote=5000,
+                                     snapshot=None):
+        if not nombre_archivo:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            nombre_archivo = f"clientes_export_{timestamp}.csv"
+        
+        ruta_completa = os.path.join(self.backup_dir, nombre_archivo)
+        
+        try:
+            mapear = compilar_mapeador_csv(CAMPOS_EXPORTACION)
+            
+            total = 0
+            with open(ruta_completa, 'w', newline='', encoding='utf-8') as f, \
+                    (snapshot or db_manager.snapshot()) as lectura:
+                writer = csv.writer(f)
+                writer.writerow(CAMPOS_EXPORTACION)
+                
+                for filas in lectura.iterar_filas(tamaño_lote):
+                    writer.writerows(map(mapear, filas))
+                    total += len(filas)
+            
+            self._registrar_archivo(nombre_archivo, filas=total)
             
             return ruta_completa
             
@@ -86,6 +130,52 @@ class JSONManager:
             print(f"Error al exportar CSV: {e}")
             return None
 
+    def exportar_clientes_particionado(self, db_manager, num_particiones=4, procesos=None,
+                                       unir=True, nombre_archivo=None):
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if not nombre_archivo:
+            nombre_archivo = f"clientes_export_{timestamp}.json"
+        
+        directorio = os.path.join(self.backup_dir, f"particiones_{timestamp}")
+        
+        try:
+            manifiesto = particiones.exportar_particionado(
+                db_manager.db_name, directorio, num_particiones, procesos)
+            
+            if not unir:
+                return os.path.join(directorio, "manifest.json")
+            
+            ruta_completa = os.path.join(self.backup_dir, nombre_archivo)
+            particiones.unir_particiones(directorio, manifiesto, ruta_completa)
+            shutil.rmtree(directorio)
+            
+            self._registrar_archivo(nombre_archivo, filas=manifiesto['total_filas'])
+            
+            return ruta_completa
+            
+        except Exception as e:
+            print(f"Error en exportación particionada: {e}")
+            return None
+
+    def exportar_clientes_columnar(self, db_manager, nombre_archivo=None, tamaño_lote=5000):
+        if not nombre_archivo:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            nombre_archivo = f"clientes_export_{timestamp}.gicc"
+        
+        ruta_completa = os.path.join(self.backup_dir, nombre_archivo)
+        
+        try:
+            with db_manager.snapshot() as snapshot:
+                total = escribir_columnar(snapshot.iterar_filas(tamaño_lote), ruta_completa)
+            
+            self._registrar_archivo(nombre_archivo, filas=total)
+            
+            return ruta_completa
+            
+        except Exception as e:
+            print(f"Error al exportar formato columnar: {e}")
+            return None
+
     def importar_clientes(self, ruta_archivo):
         try:
             with open(ruta_archivo, 'r', encoding='utf-8') as f:
@@ -97,9 +187,56 @@ class JSONManager:
             print(f"Error al importar clientes: {e}")
             return []
     
-    def crear_backup(self, db_manager):
+    def importar_a_base(self, db_manager, ruta_archivo, tamaño_lote=1000):
+        """Contadores de la importación, o None si falló (los lotes ya escritos se conservan)"""
+        contadores = {'insertados': 0, 'actualizados': 0, 'omitidos': 0, 'invalidos': 0}
+        
+        try:
+            clientes_dict = self.importar_clientes(ruta_archivo)
+            
+            for i in range(0, len(clientes_dict), tamaño_lote):
+                filas = []
+                for info in clientes_dict[i:i + tamaño_lote]:
+                    try:
+                        filas.append(dict_a_fila(info))
+                    except (KeyError, TypeError):
+                        contadores['invalidos'] += 1
+                
+                hashes = db_manager.obtener_hashes(fila[0] for fila in filas)
+                
+                cambiadas = []
+                insertadas = 0
+                for fila in filas:
+                    if hashes.get(fila[0]) == hash_de_fila(fila):
+                        contadores['omitidos'] += 1
+                    elif not db_manager.fila_valida(fila):
+                        contadores['invalidos'] += 1
+                    else:
+                        cambiadas.append(fila)
+                        insertadas += fila[0] not in hashes
+                
+                if cambiadas:
+                    if not db_manager.aplicar_cambios(cambiadas, []):
+                        print(f"Error al importar clientes a la base: no se pudo escribir el lote {i // tamaño_lote + 1}")
+                        return None
+                    contadores['insertados'] += insertadas
+                    contadores['actualizados'] += len(cambiadas) - insertadas
+            
+            return contadores
+            
+        except Exception as e:
+            print(f"Error al importar clientes a la base: {e}")
+            return None
+    
+    def crear_backup(self, db_manager, modo="json", snapshot=None):
+        if modo == "nativo":
+            return self.crear_backup_nativo(db_manager)
+        
         try:
-            clientes = db_manager.obtener_todos_clientes()
+            with snapshot or db_manager.snapshot() as snapshot:
+                clientes = snapshot.obtener_todos_clientes()
+                logs = snapshot.obtener_logs(50)
+            
             if not clientes:
                 return None
             
@@ -108,7 +245,6 @@ class JSONManager:
             
             ruta_backup = self.exportar_clientes(clientes, nombre_backup)
             
-            logs = db_manager.obtener_logs(50)
             info_backup = {
                 "fecha": datetime.now().isoformat(),
                 "total_clientes": len(clientes),
@@ -126,24 +262,321 @@ class JSONManager:
             print(f"Error al crear backup: {e}")
             return None
     
-    def listar_backups(self):
+    def crear_backup_nativo(self, db_manager, paginas_por_paso=1024, pausa=0.0, progreso=None):
+        try:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            nombre_backup = f"backup_completo_{timestamp}.db"
+            sufijo = 1
+            while os.path.exists(os.path.join(self.backup_dir, nombre_backup)):
+                nombre_backup = f"backup_completo_{timestamp}_{sufijo}.db"
+                sufijo += 1
+            ruta_backup = os.path.join(self.backup_dir, nombre_backup)
+            
+            if not db_manager.crear_backup_nativo(ruta_backup, paginas_por_paso, pausa, progreso):
+                return None
+            
+            seq = db_manager.obtener_secuencia_cambios(ruta_backup)
+            self._registrar_en_cadena({
+                'archivo': nombre_backup,
+                'tipo': 'completo',
+                'base': nombre_backup,
+                'seq_desde': 0,
+                'seq_hasta': seq,
+                'fecha': datetime.now().isoformat()
+            })
+            db_manager.purgar_cambios(seq)
+            self._registrar_archivo(nombre_backup, filas=db_manager.contar_clientes(ruta_backup),
+                                    base=nombre_backup)
+            
+            return ruta_backup
+            
+        except Exception as e:
+            print(f"Error al crear backup nativo: {e}")
+            return None
+    
+    def crear_backup_incremental(self, db_manager):
+        try:
+            cadena = self._cargar_cadena()
+            if not cadena:
+                print("No existe un backup completo base; cree uno con modo='nativo'")
+                return None
+            
+            ultimo = cadena[-1]
+            cambios = db_manager.obtener_cambios_desde(ultimo['seq_hasta'])
+            if cambios is None:
+                return None
+            
+            if cambios['seq_hasta'] <= ultimo['seq_hasta']:
+                print("Sin cambios desde el último backup")
+                return None
+            
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            nombre_backup = f"backup_incremental_{timestamp}_{cambios['seq_hasta']}.json"
+            ruta_backup = os.path.join(self.backup_dir, nombre_backup)
+            
+            contenido = {
+                'tipo': 'incremental',
+                'base': ultimo['base'],
+                'anterior': ultimo['archivo'],
+                'seq_desde': cambios['seq_desde'],
+                'seq_hasta': cambios['seq_hasta'],
+                'filas': cambios['filas'],
+                'eliminados': cambios['eliminados']
+            }
+            
+            with open(ruta_backup, 'w', encoding='utf-8') as f:
+                json.dump(contenido, f, default=str)
+            
+            self._registrar_en_cadena({
+                'archivo': nombre_backup,
+                'tipo': 'incremental',
+                'base': ultimo['base'],
+                'anterior': ultimo['archivo'],
+                'seq_desde': cambios['seq_desde'],
+                'seq_hasta': cambios['seq_hasta'],
+                'fecha': datetime.now().isoformat(),
+                'actualizados': len(cambios['filas']),
+                'eliminados': len(cambios['eliminados'])
+            })
+            self._registrar_archivo(nombre_backup,
+                                    filas=len(cambios['filas']) + len(cambios['eliminados']),
+                                    base=ultimo['base'])
+            
+            return ruta_backup
+            
+        except Exception as e:
+            print(f"Error al crear backup incremental: {e}")
+            return None
+    
+    def restaurar_cadena(self, db_manager, hasta_archivo=None):
+        try:
+            cadena = self._cargar_cadena()
+            if not cadena:
+                print("No hay backups registrados en la cadena")
+                return False
+            
+            if hasta_archivo:
+                nombres = [entrada['archivo'] for entrada in cadena]
+                if hasta_archivo not in nombres:
+                    print(f"Backup no registrado en la cadena: {hasta_archivo}")
+                    return False
+                cadena = cadena[:nombres.index(hasta_archivo) + 1]
+            
+            base = cadena[-1]['base']
+            entradas = [entrada for entrada in cadena if entrada['base'] == base]
+            
+            if not db_manager.restaurar_backup_nativo(os.path.join(self.backup_dir, base)):
+                return False
+            
+            for entrada in entradas:
+                if entrada['tipo'] != 'incremental':
+                    continue
+                
+                with open(os.path.join(self.backup_dir, entrada['archivo']), 'r', encoding='utf-8') as f:
+                    contenido = json.load(f)
+                
+                if not db_manager.aplicar_cambios(contenido['filas'], contenido['eliminados']):
+                    return False
+            
+            if len(cadena) == len(self._cargar_cadena()):
+                db_manager.fijar_secuencia_cambios(cadena[-1]['seq_hasta'])
+            else:
+                self._nueva_base_tras_restaurar(db_manager)
+            
+            return True
+            
+        except Exception as e:
+            print(f"Error al restaurar cadena de backups: {e}")
+            return False
+    
+    def _nueva_base_tras_restaurar(self, db_manager):
+        """Inicia una nueva base en la cadena tras restaurar un estado anterior a su último backup.
+        
+        La base restaurada trae una secuencia de cambios más baja que la
+        registrada en la cadena; sin esto el próximo incremental no vería los
+        cambios nuevos. La secuencia se adelanta al máximo registrado y los
+        incrementales siguientes parten de un backup completo del estado restaurado.
+        """
+        cadena = self._cargar_cadena()
+        if not cadena:
+            return True
+        
+        db_manager.fijar_secuencia_cambios(max(entrada['seq_hasta'] for entrada in cadena))
+        if self.crear_backup_nativo(db_manager) is None:
+            print("No se pudo crear el backup completo tras la restauración; "
+                  "cree uno antes del próximo incremental")
+            return False
+        return True
+    
+    def _registrar_archivo(self, nombre, filas=None, base=None):
+        self.catalogo.registrar(nombre, filas=filas, base=base)
+        
+        if self.politica_retencion:
+            self.aplicar_retencion()
+    
+    def _cargar_cadena(self):
+        ruta = os.path.join(self.backup_dir, self.ARCHIVO_CADENA)
+        if not os.path.exists(ruta):
+            return []
+        
+        with open(ruta, 'r', encoding='utf-8') as f:
+            return json.load(f).get('backups', [])
+    
+    def _guardar_cadena(self, cadena):
+        ruta = os.path.join(self.backup_dir, self.ARCHIVO_CADENA)
+        ruta_tmp = ruta + ".tmp"
+        with open(ruta_tmp, 'w', encoding='utf-8') as f:
+            json.dump({'backups': cadena}, f, indent=2)
+        os.replace(ruta_tmp, ruta)
+    
+    def _registrar_en_cadena(self, entrada):
+        cadena = self._cargar_cadena()
+        cadena.append(entrada)
+        self._guardar_cadena(cadena)
+    
+    def _eliminar_de_cadena(self, nombres):
+        cadena = self._cargar_cadena()
+        restantes = [entrada for entrada in cadena if entrada['archivo'] not in nombres]
+        if len(restantes) != len(cadena):
+            self._guardar_cadena(restantes)
+    
+    def restaurar_backup(self, db_manager, ruta_backup):
+        try:
+            if ruta_backup.endswith(".db"):
+                if not db_manager.restaurar_backup_nativo(ruta_backup):
+                    return False
+                self._nueva_base_tras_restaurar(db_manager)
+                return True
+            
+            if ruta_backup.endswith(".json"):
+                ruta_tmp = os.path.join(self.backup_dir, f"restauracion_{os.getpid()}.db")
+                if os.path.exists(ruta_tmp):
+                    os.remove(ruta_tmp)
+                
+                try:
+                    restauracion.restaurar_masivo(
+                        restauracion.leer_backup_json(ruta_backup), ruta_tmp)
+                    if not db_manager.restaurar_backup_nativo(ruta_tmp):
+                        return False
+                    self._nueva_base_tras_restaurar(db_manager)
+                    return True
+                finally:
+                    if os.path.exists(ruta_tmp):
+                        os.remove(ruta_tmp)
+            
+            print(f"Formato de backup no soportado para restauración: {ruta_backup}")
+            return False
+            
+        except Exception as e:
+            print(f"Error al restaurar backup: {e}")
+            return False
+    
+    def listar_backups(self, tipo=None):
         try:
             backups = []
-            for archivo in os.listdir(self.backup_dir):
-                if archivo.startswith("clientes_export_") or archivo.startswith("backup_completo_"):
-                    ruta = os.path.join(self.backup_dir, archivo)
-                    tamaño = os.path.getsize(ruta)
-                    fecha_mod = datetime.fromtimestamp(os.path.getmtime(ruta))
-                    
-                    backups.append({
-                        'nombre': archivo,
-                        'ruta': ruta,
-                        'tamaño': tamaño,
-                        'fecha_modificacion': fecha_mod
-                    })
+            for entrada in self.catalogo.listar(tipo):
+                backups.append({
+                    'nombre': entrada['nombre'],
+                    'ruta': os.path.join(self.backup_dir, entrada['nombre']),
+                    'tamaño': entrada['tamaño'],
+                    'fecha_modificacion': datetime.fromisoformat(entrada['fecha']),
+                    'tipo': entrada['tipo'],
+                    'formato': entrada['formato'],
+                    'compresion': entrada['compresion'],
+                    'filas': entrada['filas'],
+                    'checksum': entrada['checksum']
+                })
             
-            return sorted(backups, key=lambda x: x['fecha_modificacion'], reverse=True)
+            return backups
             
         except Exception as e:
             print(f"Error al listar backups: {e}")
-            return []
\ No newline at end of file
+            return []
+    
+    def buscar_ultimo_backup_valido(self, verificar=False):
+        try:
+            entrada = self.catalogo.ultimo_valido("backup", verificar)
+            if not entrada:
+                return None
+            
+            return os.path.join(self.backup_dir, entrada['nombre'])
+            
+        except Exception as e:
+            print(f"Error al buscar backup válido: {e}")
+            return None
+    
+    def _eliminar_archivos(self, entradas):
+        eliminados = []
+        for entrada in entradas:
+            ruta = os.path.join(self.backup_dir, entrada['nombre'])
+            if os.path.exists(ruta):
+                os.remove(ruta)
+            
+            ruta_info = ruta.replace("backup_completo_", "info_backup_")
+            if ruta_info != ruta and os.path.exists(ruta_info):
+                os.remove(ruta_info)
+            
+            eliminados.append(entrada['nombre'])
+        
+        self.catalogo.eliminar(eliminados)
+        self._eliminar_de_cadena(eliminados)
+        
+        return eliminados
+    
+    def podar_backups(self, max_edad_dias=None, max_cantidad=None, tipo=None):
+        try:
+            return self._eliminar_archivos(
+                self.catalogo.seleccionar_poda(max_edad_dias, max_cantidad, tipo))
+            
+        except Exception as e:
+            print(f"Error al podar backups: {e}")
+            return []
+    
+    def aplicar_retencion(self, politica=None, simulacion=False):
+        politica = politica or self.politica_retencion
+        if not politica:
+            return None
+        
+        try:
+            entradas = self.catalogo.listar()
+            
+            conservar = set()
+            for entrada in entradas:
+                if entrada['tipo'] not in politica.tipos:
+                    conservar.add(entrada['nombre'])
+            for tipo in politica.tipos:
+                conservar |= politica.seleccionar_conservados(
+                    [e for e in entradas if e['tipo'] == tipo])
+            conservar = self.catalogo.cerrar_dependencias(conservar)
+            
+            eliminar = [e for e in entradas if e['nombre'] not in conservar]
+            reporte = {
+                'simulacion': simulacion,
+                'eliminar': [e['nombre'] for e in eliminar],
+                'bytes_liberados': sum(e['tamaño'] for e in eliminar),
+                'conservados': len(entradas) - len(eliminar)
+            }
+            
+            if not simulacion:
+                self._eliminar_archivos(eliminar)
+            
+            return reporte
+            
+        except Exception as e:
+            print(f"Error al aplicar retención: {e}")
+            return None
+    
+    def programar_retencion(self, intervalo_segundos=86400):
+        def ejecutar():
+            self.aplicar_retencion()
+            self.programar_retencion(intervalo_segundos)
+        
+        self.detener_retencion_programada()
+        self._timer_retencion = threading.Timer(intervalo_segundos, ejecutar)
+        self._timer_retencion.daemon = True
+        self._timer_retencion.start()
+    
+    def detener_retencion_programada(self):
+        if self._timer_retencion:
+            self._timer_retencion.cancel()
+            self._timer_retencion = None
@@ -0,0 +1,82 @@
+import json
+import hashlib
+
+COLUMNAS_CLIENTES = ('id', 'tipo', 'nombre', 'email', 'telefono', 'direccion',
+                     'fecha_registro', 'activo', 'datos_especificos')
+
+CAMPOS_EXPORTACION = ['id', 'nombre', 'email', 'telefono', 'direccion',
+                      'tipo', 'rut', 'fecha_registro', 'activo',
+                      'puntos_fidelidad', 'nivel', 'beneficios_extra',
+                      'empresa', 'contacto_alterno', 'facturacion_mensual']
+
+def compilar_mapeador_csv(campos=None, separador_lista="|"):
+    campos = campos or CAMPOS_EXPORTACION
+    indices = {nombre: i for i, nombre in enumerate(COLUMNAS_CLIENTES)}
+
+    expresiones = []
+    for campo in campos:
+        if not isinstance(campo, str):
+            raise ValueError(f"Nombre de campo inválido: {campo!r}")
+        # Los nombres van al código como literales (repr), nunca interpolados a mano
+        if campo == 'activo':
+            expresiones.append(f"bool(row[{indices['activo']}])")
+        elif campo in indices and campo != 'datos_especificos':
+            expresiones.append(f"row[{indices[campo]}]")
+        elif campo == 'beneficios_extra':
+            expresiones.append(f"sep.join(d[{campo!r}]) if {campo!r} in d else ''")
+        else:
+            expresiones.append(f"d.get({campo!r}, '')")
+
+    codigo = (
+        "def mapear(row):\n"
+        f"    d = loads(row[{indices['datos_especificos']}]) if row[{indices['datos_especificos']}] else {{}}\n"
+        f"    return ({', '.join(expresiones)},)\n"
+    )
+    espacio = {'loads': json.loads, 'sep': separador_lista}
+    exec(codigo, espacio)
+    return espacio['mapear']
+
+def fila_a_dict(row):
+    (cliente_id, tipo, nombre, email, telefono, direccion,
+     fecha_registro, activo, datos_especificos) = row
+
+    datos = json.loads(datos_especificos) if datos_especificos else {}
+
+    info = {
+        'id': cliente_id,
+        'nombre': nombre,
+        'email': email,
+        'telefono': telefono,
+        'direccion': direccion,
+        'rut': datos.pop('rut', 'Sin RUT'),
+        'tipo': tipo,
+        'fecha_registro': fecha_registro,
+        'activo': bool(activo)
+    }
+    info.update(datos)
+    return info
+
+def dict_a_fila(info):
+    datos = {clave: valor for clave, valor in info.items()
+             if clave not in COLUMNAS_CLIENTES}
+    datos['rut'] = info.get('rut', 'Sin RUT')
+
+    return (
+        info['id'],
+        info['tipo'],
+        info['nombre'],
+        info['email'],
+        info['telefono'],
+        info['direccion'],
+        info.get('fecha_registro'),
+        1 if info.get('activo', True) else 0,
+        json.dumps(datos, sort_keys=True)
+    )
+
+def calcular_hash_contenido(tipo, nombre, email, telefono, direccion, datos_especificos, activo=True):
+    contenido = "\x1f".join((tipo, nombre, email, telefono, direccion, datos_especificos or "",
+                             "1" if activo else "0"))
+    return hashlib.blake2b(contenido.encode('utf-8'), digest_size=16).hexdigest()
+
+def hash_de_fila(row):
+    return calcular_hash_contenido(row[1], row[2], row[3], row[4], row[5], row[8], row[7])
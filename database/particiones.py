@@ -0,0 +1,136 @@
+import json
+import os
+import sqlite3
+from datetime import datetime
+from urllib.request import pathname2url
+from database.mapeo import COLUMNAS_CLIENTES, fila_a_dict
+
+def conectar_solo_lectura(db_name):
+    return sqlite3.connect(f"file:{pathname2url(os.path.abspath(db_name))}?mode=ro", uri=True)
+
+def copiar_instantanea(db_name, ruta_destino):
+    """Copia de la base tomada en un único paso de la API de backup, es decir, en un solo instante"""
+    origen = conectar_solo_lectura(db_name)
+    destino = sqlite3.connect(ruta_destino)
+    with destino:
+        origen.backup(destino)
+    destino.close()
+    origen.close()
+
+def calcular_limites(db_name, particiones):
+    conn = conectar_solo_lectura(db_name)
+    cursor = conn.cursor()
+
+    total = cursor.execute('SELECT COUNT(*) FROM clientes').fetchone()[0]
+    if total == 0:
+        conn.close()
+        return []
+
+    particiones = max(1, min(particiones, total))
+    inicios = []
+    for i in range(particiones):
+        cursor.execute('SELECT id FROM clientes ORDER BY id LIMIT 1 OFFSET ?',
+                       (i * total // particiones,))
+        inicios.append(cursor.fetchone()[0])
+
+    conn.close()
+
+    limites = []
+    for i, inicio in enumerate(inicios):
+        fin = inicios[i + 1] - 1 if i + 1 < len(inicios) else None
+        limites.append((inicio, fin))
+    return limites
+
+def exportar_particion(db_name, inicio, fin, ruta_salida, tamaño_lote=5000):
+    conn = conectar_solo_lectura(db_name)
+    cursor = conn.cursor()
+
+    consulta = f"SELECT {', '.join(COLUMNAS_CLIENTES)} FROM clientes WHERE id >= ?"
+    parametros = [inicio]
+    if fin is not None:
+        consulta += " AND id <= ?"
+        parametros.append(fin)
+    cursor.execute(consulta + " ORDER BY id", parametros)
+
+    filas_escritas = 0
+    with open(ruta_salida, 'w', encoding='utf-8') as f:
+        while True:
+            filas = cursor.fetchmany(tamaño_lote)
+            if not filas:
+                break
+
+            bloque = ",\n".join(json.dumps(fila_a_dict(fila), default=str) for fila in filas)
+            if filas_escritas:
+                f.write(",\n")
+            f.write(bloque)
+            filas_escritas += len(filas)
+
+    conn.close()
+
+    return {
+        'archivo': os.path.basename(ruta_salida),
+        'desde_id': inicio,
+        'hasta_id': fin,
+        'filas': filas_escritas,
+        'tamaño': os.path.getsize(ruta_salida)
+    }
+
+def exportar_particionado(db_name, directorio, particiones=4, procesos=None):
+    """Exporta la base en particiones paralelas y escribe manifest.json.
+
+    Los procesos no pueden compartir una transacción de lectura, así que todos
+    leen de una copia tomada al empezar: las particiones reflejan un mismo
+    instante (el 'fecha' del manifiesto) aunque haya escrituras mientras tanto.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    os.makedirs(directorio, exist_ok=True)
+    instantanea = os.path.join(directorio, ".instantanea.db")
+    fecha = datetime.now().isoformat()
+    copiar_instantanea(db_name, instantanea)
+
+    try:
+        limites = calcular_limites(instantanea, particiones)
+
+        procesos = procesos or min(len(limites), os.cpu_count() or 1) or 1
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            futuros = [
+                pool.submit(exportar_particion, instantanea, inicio, fin,
+                            os.path.join(directorio, f"parte_{i:04d}.json"))
+                for i, (inicio, fin) in enumerate(limites)
+            ]
+            partes = [futuro.result() for futuro in futuros]
+    finally:
+        for sufijo in ("", "-wal", "-shm"):
+            if os.path.exists(instantanea + sufijo):
+                os.remove(instantanea + sufijo)
+
+    manifiesto = {
+        'formato': 'json-particionado',
+        'fecha': fecha,
+        'particiones': partes,
+        'total_filas': sum(parte['filas'] for parte in partes)
+    }
+
+    with open(os.path.join(directorio, "manifest.json"), 'w', encoding='utf-8') as f:
+        json.dump(manifiesto, f, indent=2)
+
+    return manifiesto
+
+def unir_particiones(directorio, manifiesto, ruta_salida):
+    with open(ruta_salida, 'w', encoding='utf-8') as salida:
+        salida.write("[\n")
+        primera = True
+        for parte in manifiesto['particiones']:
+            if not parte['filas']:
+                continue
+            if not primera:
+                salida.write(",\n")
+            with open(os.path.join(directorio, parte['archivo']), 'r', encoding='utf-8') as entrada:
+                while True:
+                    bloque = entrada.read(1048576)
+                    if not bloque:
+                        break
+                    salida.write(bloque)
+            primera = False
+        salida.write("\n]\n")
@@ -0,0 +1,93 @@
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from database.db_manager import DatabaseManager
+from database.mapeo import COLUMNAS_CLIENTES, dict_a_fila, hash_de_fila
+
+PRAGMAS_CARGA_MASIVA = (
+    'PRAGMA journal_mode=OFF',
+    'PRAGMA synchronous=OFF',
+    'PRAGMA locking_mode=EXCLUSIVE',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-262144',
+)
+
+def leer_backup_json(ruta, tamaño_lote=50000):
+    with open(ruta, 'r', encoding='utf-8') as f:
+        clientes = json.load(f)
+
+    for i in range(0, len(clientes), tamaño_lote):
+        yield [dict_a_fila(info) for info in clientes[i:i + tamaño_lote]]
+
+def restaurar_masivo(lotes_filas, db_name):
+    if os.path.exists(db_name):
+        raise FileExistsError(f"La base de datos destino ya existe: {db_name}")
+
+    inicio = time.perf_counter()
+    conn = sqlite3.connect(db_name, isolation_level=None)
+    cursor = conn.cursor()
+
+    for pragma in PRAGMAS_CARGA_MASIVA:
+        cursor.execute(pragma)
+
+    DatabaseManager._crear_tablas(cursor, email_unico=False)
+
+    consulta = (f"INSERT INTO clientes ({', '.join(COLUMNAS_CLIENTES)}, hash_contenido) "
+                f"VALUES ({', '.join('?' for _ in COLUMNAS_CLIENTES)}, ?)")
+
+    total = 0
+    for filas in lotes_filas:
+        cursor.execute('BEGIN')
+        cursor.executemany(consulta, [fila + (hash_de_fila(fila),) for fila in filas])
+        cursor.execute('COMMIT')
+        total += len(filas)
+
+    fin_carga = time.perf_counter()
+
+    cursor.execute('BEGIN')
+    DatabaseManager._crear_indices(cursor, email_unico=True)
+    DatabaseManager._crear_triggers(cursor)
+    cursor.execute('COMMIT')
+    cursor.execute('ANALYZE')
+
+    cursor.execute('PRAGMA locking_mode=NORMAL')
+    cursor.execute('PRAGMA synchronous=FULL')
+    cursor.execute('PRAGMA journal_mode=WAL')
+    conn.close()
+
+    fin = time.perf_counter()
+
+    return {
+        'filas': total,
+        'segundos_carga': fin_carga - inicio,
+        'segundos_indices': fin - fin_carga,
+        'segundos_total': fin - inicio,
+        'filas_por_segundo': total / (fin - inicio) if fin > inicio else 0
+    }
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Restaura un backup JSON en una base de datos nueva mediante carga masiva")
+    parser.add_argument("backup", help="Archivo JSON generado por exportar_clientes o crear_backup")
+    parser.add_argument("destino", help="Ruta de la nueva base de datos SQLite")
+    parser.add_argument("--lote", type=int, default=50000, help="Filas por transacción")
+    args = parser.parse_args()
+
+    estadisticas = restaurar_masivo(leer_backup_json(args.backup, args.lote), args.destino)
+
+    print(f"Filas restauradas: {estadisticas['filas']:,}")
+    print(f"Carga:   {estadisticas['segundos_carga']:.2f} s")
+    print(f"Índices: {estadisticas['segundos_indices']:.2f} s")
+    print(f"Total:   {estadisticas['segundos_total']:.2f} s "
+          f"({estadisticas['filas_por_segundo']:,.0f} filas/s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
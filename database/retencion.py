@@ -0,0 +1,59 @@
+import json
+import os
+from datetime import datetime
+
+class PoliticaRetencion:
+
+    def __init__(self, ultimos=10, diarios=7, semanales=4, mensuales=12, tipos=None):
+        self.ultimos = ultimos
+        self.diarios = diarios
+        self.semanales = semanales
+        self.mensuales = mensuales
+        self.tipos = tipos or ["export", "backup", "incremental"]
+
+    @classmethod
+    def desde_dict(cls, datos):
+        return cls(
+            ultimos=datos.get('ultimos', 10),
+            diarios=datos.get('diarios', 7),
+            semanales=datos.get('semanales', 4),
+            mensuales=datos.get('mensuales', 12),
+            tipos=datos.get('tipos')
+        )
+
+    @classmethod
+    def desde_archivo(cls, ruta):
+        if not os.path.exists(ruta):
+            return None
+
+        with open(ruta, 'r', encoding='utf-8') as f:
+            return cls.desde_dict(json.load(f))
+
+    @staticmethod
+    def _conservar_por_periodo(entradas, clave, cantidad):
+        conservar = set()
+        periodos = set()
+
+        for entrada in entradas:
+            if len(periodos) >= cantidad:
+                break
+
+            periodo = clave(datetime.fromisoformat(entrada['fecha']))
+            if periodo not in periodos:
+                periodos.add(periodo)
+                conservar.add(entrada['nombre'])
+
+        return conservar
+
+    def seleccionar_conservados(self, entradas):
+        entradas = sorted(entradas, key=lambda e: e['fecha'], reverse=True)
+
+        conservar = {e['nombre'] for e in entradas[:self.ultimos]}
+        conservar |= self._conservar_por_periodo(
+            entradas, lambda f: f.date(), self.diarios)
+        conservar |= self._conservar_por_periodo(
+            entradas, lambda f: f.isocalendar()[:2], self.semanales)
+        conservar |= self._conservar_por_periodo(
+            entradas, lambda f: (f.year, f.month), self.mensuales)
+
+        return conservar
@@ -0,0 +1,67 @@
+import sqlite3
+from database.mapeo import COLUMNAS_CLIENTES
+
+class SnapshotLectura:
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        self.conn = None
+        self._profundidad = 0
+
+    def abrir(self):
+        self.conn = sqlite3.connect(self.db_manager.db_name, isolation_level=None)
+        self.conn.execute("BEGIN")
+        self.conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        return self
+
+    def cerrar(self):
+        if self.conn:
+            self.conn.execute("ROLLBACK")
+            self.conn.close()
+            self.conn = None
+
+    def __enter__(self):
+        if self._profundidad == 0:
+            self.abrir()
+        self._profundidad += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._profundidad -= 1
+        if self._profundidad == 0:
+            self.cerrar()
+        return False
+
+    def iterar_filas(self, tamaño_lote=5000):
+        cursor = self.conn.cursor()
+        cursor.execute(f"SELECT {', '.join(COLUMNAS_CLIENTES)} FROM clientes ORDER BY id")
+
+        while True:
+            filas = cursor.fetchmany(tamaño_lote)
+            if not filas:
+                break
+            yield filas
+
+    def obtener_todos_clientes(self):
+        cursor = self.conn.cursor()
+        cursor.execute(f"SELECT {', '.join(COLUMNAS_CLIENTES)} FROM clientes ORDER BY nombre")
+
+        clientes = []
+        for row in cursor.fetchall():
+            cliente = self.db_manager._deserializar_cliente(row)
+            if cliente:
+                clientes.append(cliente)
+
+        return clientes
+
+    def contar_clientes(self):
+        return self.conn.execute('SELECT COUNT(*) FROM clientes').fetchone()[0]
+
+    def obtener_logs(self, limite=100):
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT * FROM logs
+            ORDER BY timestamp DESC
+            LIMIT ?
+        ''', (limite,))
+        return cursor.fetchall()
@@ -2,15 +2,16 @@ import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import tkinter.font as tkfont
 from datetime import datetime
-import threading
 
 from models.cliente_regular import ClienteRegular
 from models.cliente_premium import ClientePremium
 from models.cliente_corporativo import ClienteCorporativo
 from database.db_manager import DatabaseManager
 from database.json_manager import JSONManager
-from api_integrations.email_validator import SimpleEmailValidator, APIBasedEmailValidator
+from database.retencion import PoliticaRetencion
+from api_integrations.email_validator import crear_validador
 from api_integrations.notification_service import NotificationService
+from utils.configuracion import obtener_configuracion
 from utils.validators import Validators
 from utils.logger import Logger
 
@@ -22,9 +23,14 @@ class GICApp:
         self.root.geometry("1200x700")
         self.root.configure(bg='#f0f0f0')
         
-        self.db_manager = DatabaseManager()
-        self.json_manager = JSONManager()
-        self.email_validator = SimpleEmailValidator()
+        self.db_manager = DatabaseManager(obtener_configuracion('base_datos')['db_name'])
+        self.json_manager = JSONManager(
+            politica_retencion=PoliticaRetencion.desde_archivo("config/retencion_config.json"))
+        if self.json_manager.politica_retencion:
+            self.json_manager.programar_retencion()
+        self.email_validator = crear_validador()
+        self.notification_service = NotificationService()
+        self.notification_service.iniciar_trabajadores()
         self.validators = Validators()
         self.logger = Logger()
         
@@ -38,6 +44,7 @@ class GICApp:
         
         self.clientes = []
         self.cliente_seleccionado = None
+        self._ultimo_fallido_informado = 0
         
         self._crear_widgets()
         self._cargar_clientes()
@@ -455,24 +462,29 @@ class GICApp:
     
     def _enviar_email_bienvenida(self, cliente):
         try:
-            def enviar_email():
-                service = NotificationService()
-                if service.enviar_email_bienvenida(cliente):
-                    self.root.after(0, lambda: messagebox.showinfo(
-                        "Email Enviado", 
-                        f"Email de bienvenida enviado a {cliente.email}"
-                    ))
-                else:
-                    self.root.after(0, lambda: messagebox.showwarning(
-                        "Email No Enviado", 
-                        "No se pudo enviar el email de bienvenida"
-                    ))
-            
-            threading.Thread(target=enviar_email, daemon=True).start()
+            if self.notification_service.encolar_email_bienvenida(cliente) is None:
+                messagebox.showerror("Error", "No se pudo enviar el email: contraseña de email no configurada")
+                return
+            self._actualizar_status(f"Email de bienvenida en cola para {cliente.email}")
             
         except Exception as e:
             messagebox.showerror("Error", f"No se pudo enviar el email: {str(e)}")
     
+    def _revisar_outbox(self):
+        """Avisa de los emails que agotaron sus reintentos en la bandeja de salida"""
+        try:
+            nuevos = [f for f in self.notification_service.fallidos_outbox()
+                      if f['id'] > self._ultimo_fallido_informado]
+            if nuevos:
+                self._ultimo_fallido_informado = nuevos[-1]['id']
+                self._actualizar_status(f"{len(nuevos)} email(s) no se pudieron enviar")
+                detalle = "\n".join(f"{f['destinatario']}: {f['ultimo_error']}" for f in nuevos[:5])
+                messagebox.showwarning("Emails no enviados", detalle)
+        except Exception as e:
+            self.logger.log_error_detallado(e, "Revisar bandeja de salida")
+        
+        self.root.after(30000, self._revisar_outbox)
+    
     def _eliminar_cliente(self):
         if not self.cliente_seleccionado:
             messagebox.showwarning("Selección", "Seleccione un cliente para eliminar")
@@ -594,4 +606,7 @@ class GICApp:
     
     def run(self):
         self._actualizar_status("Sistema GIC iniciado correctamente")
-        self.root.mainloop()
\ No newline at end of file
+        self.root.after(30000, self._revisar_outbox)
+        self.root.mainloop()
+        
+        self.notification_service.cerrar()
\ No newline at end of file
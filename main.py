@@ -28,9 +28,11 @@ def main():
     except Exception as e:
         logger.log(f"Error en el sistema principal: {str(e)}", "ERROR")
         print(f"Error: {str(e)}")
+        logger.cerrar()
         return 1
     
     logger.log("Sistema GIC finalizado correctamente", "INFO")
+    logger.cerrar()
     return 0
 
 if __name__ == "__main__":
@@ -1,6 +1,32 @@
 import re
 from datetime import datetime
 from abc import ABC, abstractmethod
+from utils.cache_validacion import cache_validacion
+
+PATRON_EMAIL = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+PATRON_SEPARADORES_TELEFONO = re.compile(r'[\s\-\(\)]')
+
+@cache_validacion("cliente_email", errores=(ValueError,))
+def _validar_email(email):
+    if not PATRON_EMAIL.match(email):
+        raise ValueError("Formato de email inválido")
+    return email
+
+@cache_validacion("cliente_telefono", normalizar=str, errores=(ValueError,))
+def _validar_telefono(telefono):
+    telefono_limpio = PATRON_SEPARADORES_TELEFONO.sub('', str(telefono))
+    
+    check_digits = telefono_limpio
+    if check_digits.startswith('+'):
+        check_digits = check_digits[1:]
+        
+    if not check_digits.isdigit():
+        raise ValueError("El teléfono debe contener solo dígitos")
+    
+    if len(check_digits) < 8 or len(check_digits) > 15:
+        raise ValueError("El teléfono debe tener entre 8 y 15 dígitos")
+    
+    return telefono_limpio
 
 class Cliente(ABC):
     
@@ -85,25 +111,10 @@ class Cliente(ABC):
         return nombre.strip()
     
     def _validar_email(self, email):
-        patron = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(patron, email):
-            raise ValueError("Formato de email inválido")
-        return email
+        return _validar_email(email)
     
     def _validar_telefono(self, telefono):
-        telefono_limpio = re.sub(r'[\s\-\(\)]', '', str(telefono))
-        
-        check_digits = telefono_limpio
-        if check_digits.startswith('+'):
-            check_digits = check_digits[1:]
-            
-        if not check_digits.isdigit():
-            raise ValueError("El teléfono debe contener solo dígitos")
-        
-        if len(check_digits) < 8 or len(check_digits) > 15:
-            raise ValueError("El teléfono debe tener entre 8 y 15 dígitos")
-        
-        return telefono_limpio
+        return _validar_telefono(telefono)
     
     def _validar_direccion(self, direccion):
         if not direccion or not direccion.strip():
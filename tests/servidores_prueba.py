@@ -0,0 +1,282 @@
+"""
+Servidores locales usados por las pruebas y benchmarks de integraciones
+"""
+
+import json
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+def respuesta_api_email(email):
+    dominio = email.rsplit('@', 1)[-1]
+    desechable = dominio.startswith('mailinator') or 'fake' in email
+    return {
+        'email': email,
+        'valid': '@' in email and not desechable,
+        'score': 0.1 if desechable else 0.8,
+        'disposable': desechable,
+        'risk_level': 'high' if desechable else 'low',
+        'deliverable': not desechable
+    }
+
+class _ManejadorAPIEmail(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, formato, *args):
+        pass
+
+    def _responder(self, estado, cuerpo=None, cabeceras=None):
+        datos = json.dumps(cuerpo or {}).encode('utf-8')
+        self.send_response(estado)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(datos)))
+        for clave, valor in (cabeceras or {}).items():
+            self.send_header(clave, valor)
+        self.end_headers()
+        self.wfile.write(datos)
+
+    def _registrar(self):
+        servidor = self.server
+        with servidor.lock:
+            servidor.peticiones.append((self.command, self.path))
+            servidor.conexiones.add(self.client_address)
+            if servidor.fallos_pendientes:
+                return servidor.fallos_pendientes.pop(0)
+        if servidor.latencia:
+            time.sleep(servidor.latencia)
+        return None
+
+    def _fallo(self, fallo):
+        estado, cabeceras = fallo if isinstance(fallo, tuple) else (fallo, None)
+        self._responder(estado, {'error': 'fallo simulado'}, cabeceras)
+
+    def do_GET(self):
+        fallo = self._registrar()
+        if fallo:
+            return self._fallo(fallo)
+
+        url = urlparse(self.path)
+        if not url.path.endswith('/validate'):
+            return self._responder(404)
+        email = parse_qs(url.query).get('email', [''])[0]
+        self._responder(200, respuesta_api_email(email))
+
+    def do_POST(self):
+        longitud = int(self.headers.get('Content-Length', 0))
+        cuerpo = json.loads(self.rfile.read(longitud) or b'{}')
+
+        fallo = self._registrar()
+        if fallo:
+            return self._fallo(fallo)
+
+        if not self.server.soporta_lote or not self.path.endswith('/validate/batch'):
+            return self._responder(404)
+        self._responder(200, {'results': [respuesta_api_email(e) for e in cuerpo.get('emails', [])]})
+
+class ServidorAPIEmailPrueba:
+    """API de validación de emails en un hilo local; registra peticiones y conexiones"""
+
+    def __init__(self, latencia=0.0, soporta_lote=True):
+        self._servidor = ThreadingHTTPServer(('127.0.0.1', 0), _ManejadorAPIEmail)
+        self._servidor.daemon_threads = True
+        self._servidor.lock = threading.Lock()
+        self._servidor.peticiones = []
+        self._servidor.conexiones = set()
+        self._servidor.fallos_pendientes = []
+        self._servidor.latencia = latencia
+        self._servidor.soporta_lote = soporta_lote
+        self._hilo = None
+
+    @property
+    def url(self):
+        host, puerto = self._servidor.server_address[:2]
+        return f"http://{host}:{puerto}/v1/"
+
+    @property
+    def peticiones(self):
+        return self._servidor.peticiones
+
+    @property
+    def conexiones(self):
+        return self._servidor.conexiones
+
+    def fallar_proximas(self, *fallos):
+        """Encola respuestas de error: un código HTTP o (código, cabeceras)"""
+        with self._servidor.lock:
+            self._servidor.fallos_pendientes.extend(fallos)
+
+    def iniciar(self):
+        self._hilo = threading.Thread(target=self._servidor.serve_forever,
+                                     kwargs={"poll_interval": 0.05}, daemon=True)
+        self._hilo.start()
+        return self
+
+    def detener(self):
+        self._servidor.shutdown()
+        self._servidor.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.detener()
+        return False
+
+class _ManejadorSMTP(socketserver.StreamRequestHandler):
+    """Subconjunto de SMTP suficiente para smtplib: EHLO/HELO, AUTH, MAIL, RCPT, DATA, RSET, NOOP, QUIT"""
+
+    disable_nagle_algorithm = True
+
+    def _responder(self, linea):
+        self.wfile.write(linea.encode('ascii') + b"\r\n")
+
+    def handle(self):
+        servidor = self.server
+        with servidor.lock:
+            servidor.conexiones += 1
+            servidor.sockets_activos.add(self.connection)
+
+        try:
+            self._responder("220 localhost SMTP de prueba")
+            remitente, destinatarios = None, []
+
+            for linea in self.rfile:
+                comando = linea.decode('utf-8', 'replace').rstrip("\r\n")
+                verbo = comando[:4].upper()
+                with servidor.lock:
+                    servidor.comandos.append(verbo)
+
+                if verbo == "EHLO":
+                    self._responder("250-localhost")
+                    self._responder("250-AUTH PLAIN LOGIN")
+                    self._responder("250 8BITMIME")
+                elif verbo == "HELO":
+                    self._responder("250 localhost")
+                elif verbo == "AUTH":
+                    self._responder("235 Autenticado")
+                elif verbo == "MAIL":
+                    remitente, destinatarios = comando.split(":", 1)[1].strip().split()[0].strip("<>"), []
+                    self._responder("250 OK")
+                elif verbo == "RCPT":
+                    destinatario = comando.split(":", 1)[1].strip().strip("<>")
+                    if destinatario in servidor.rechazados:
+                        self._responder("550 Buzon inexistente")
+                        continue
+                    destinatarios.append(destinatario)
+                    self._responder("250 OK")
+                elif verbo == "DATA":
+                    self._responder("354 Fin con <CRLF>.<CRLF>")
+                    datos = bytearray()
+                    for linea_datos in self.rfile:
+                        if linea_datos == b".\r\n":
+                            break
+                        datos += linea_datos[1:] if linea_datos.startswith(b"..") else linea_datos
+                    if servidor.latencia:
+                        time.sleep(servidor.latencia)
+                    with servidor.lock:
+                        servidor.total_mensajes += 1
+                        if servidor.guardar_mensajes:
+                            servidor.mensajes.append((remitente, destinatarios, bytes(datos)))
+                    if servidor.cortar_tras_datos:
+                        break
+                    self._responder("250 Mensaje aceptado")
+                elif verbo in ("RSET", "NOOP"):
+                    self._responder("250 OK")
+                elif verbo == "QUIT":
+                    self._responder("221 Hasta luego")
+                    break
+                else:
+                    self._responder("502 Comando no implementado")
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            with servidor.lock:
+                servidor.sockets_activos.discard(self.connection)
+
+class _ServidorTCP(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+class ServidorSMTPPrueba:
+    """Servidor SMTP local que acepta y guarda todos los mensajes (sin TLS).
+
+    Los destinatarios en `rechazados` reciben 550 en RCPT; con cortar_tras_datos
+    la conexión se cierra tras recibir un mensaje, sin confirmarlo.
+    """
+
+    def __init__(self, latencia=0.0, guardar_mensajes=True, rechazados=(), cortar_tras_datos=False):
+        self._servidor = _ServidorTCP(('127.0.0.1', 0), _ManejadorSMTP)
+        self._servidor.lock = threading.Lock()
+        self._servidor.conexiones = 0
+        self._servidor.sockets_activos = set()
+        self._servidor.comandos = []
+        self._servidor.mensajes = []
+        self._servidor.total_mensajes = 0
+        self._servidor.guardar_mensajes = guardar_mensajes
+        self._servidor.latencia = latencia
+        self._servidor.rechazados = set(rechazados)
+        self._servidor.cortar_tras_datos = cortar_tras_datos
+        self._hilo = None
+
+    @property
+    def puerto(self):
+        return self._servidor.server_address[1]
+
+    def config(self, **extra):
+        """Configuración de email_config.json que apunta a este servidor"""
+        config = {
+            "smtp_server": "127.0.0.1",
+            "smtp_port": self.puerto,
+            "sender_email": "notificaciones@solutiontech.com",
+            "sender_password": "clave",
+            "use_tls": False
+        }
+        config.update(extra)
+        return config
+
+    @property
+    def conexiones(self):
+        return self._servidor.conexiones
+
+    @property
+    def comandos(self):
+        return self._servidor.comandos
+
+    @property
+    def mensajes(self):
+        return self._servidor.mensajes
+
+    @property
+    def total_mensajes(self):
+        return self._servidor.total_mensajes
+
+    def cortar_conexiones(self):
+        """Cierra desde el servidor todas las conexiones abiertas"""
+        import socket
+        with self._servidor.lock:
+            for conexion in list(self._servidor.sockets_activos):
+                try:
+                    conexion.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+    def iniciar(self):
+        self._hilo = threading.Thread(target=self._servidor.serve_forever,
+                                     kwargs={"poll_interval": 0.05}, daemon=True)
+        self._hilo.start()
+        return self
+
+    def detener(self):
+        self.cortar_conexiones()
+        self._servidor.shutdown()
+        self._servidor.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.detener()
+        return False
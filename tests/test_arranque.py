@@ -0,0 +1,31 @@
+import unittest
+import sys
+import os
+import subprocess
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+sys.path.append(RAIZ)
+
+from benchmarks.bench_arranque import MODULOS_DIFERIDOS
+
+try:
+    import tkinter
+except ImportError:
+    tkinter = None
+
+class TestArranque(unittest.TestCase):
+
+    @unittest.skipIf(tkinter is None, "tkinter no disponible")
+    def test_dependencias_pesadas_no_se_cargan_al_inicio(self):
+        resultado = subprocess.run(
+            [sys.executable, "-c",
+             "import sys, gui.main_window; print(','.join(sorted(sys.modules)))"],
+            cwd=RAIZ, capture_output=True, text=True, check=True)
+
+        modulos = set(resultado.stdout.strip().split(","))
+        for modulo in MODULOS_DIFERIDOS:
+            self.assertNotIn(modulo, modulos)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
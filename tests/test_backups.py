@@ -0,0 +1,336 @@
+import unittest
+import sys
+import os
+import json
+import sqlite3
+import tempfile
+import shutil
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from models.cliente_regular import ClienteRegular
+from models.cliente_premium import ClientePremium
+from database.db_manager import DatabaseManager
+from database.json_manager import JSONManager
+from database.retencion import PoliticaRetencion
+from database import restauracion
+
+class TestBackupNativo(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_manager = DatabaseManager(os.path.join(self.tmp_dir, "clientes.db"))
+        self.json_manager = JSONManager(os.path.join(self.tmp_dir, "backups"))
+
+        self.db_manager.guardar_cliente(ClienteRegular(
+            1, "Ana Soto", "ana@email.com", "+56912345678", "Calle 1", "11.111.111-1", 10))
+        self.db_manager.guardar_cliente(ClientePremium(
+            2, "Luis Rojas", "luis@email.com", "+56987654321", "Calle 2", "22.222.222-2", "platino"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_backup_nativo_incluye_logs(self):
+        progreso = []
+        ruta = self.json_manager.crear_backup_nativo(
+            self.db_manager, paginas_por_paso=1,
+            progreso=lambda copiadas, total: progreso.append((copiadas, total)))
+
+        self.assertIsNotNone(ruta)
+        self.assertTrue(ruta.endswith(".db"))
+        self.assertTrue(progreso)
+
+        conn = sqlite3.connect(ruta)
+        total_clientes = conn.execute("SELECT COUNT(*) FROM clientes").fetchone()[0]
+        total_logs = conn.execute("SELECT COUNT(*) FROM logs").fetchone()[0]
+        conn.close()
+
+        self.assertEqual(total_clientes, 2)
+        self.assertGreaterEqual(total_logs, 2)
+
+    def test_restaurar_backup_nativo(self):
+        ruta = self.json_manager.crear_backup(self.db_manager, modo="nativo")
+
+        self.db_manager.eliminar_cliente(1)
+        self.assertIsNone(self.db_manager.cargar_cliente(1))
+
+        self.assertTrue(self.json_manager.restaurar_backup(self.db_manager, ruta))
+
+        cliente = self.db_manager.cargar_cliente(1)
+        self.assertIsNotNone(cliente)
+        self.assertEqual(cliente.nombre, "Ana Soto")
+        self.assertEqual(cliente.puntos_fidelidad, 10)
+
+class TestRestauracionMasiva(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_manager = DatabaseManager(os.path.join(self.tmp_dir, "clientes.db"))
+        self.json_manager = JSONManager(os.path.join(self.tmp_dir, "backups"))
+
+        for i in range(1, 11):
+            self.db_manager.guardar_cliente(ClientePremium(
+                i, f"Cliente {i}", f"cliente{i}@email.com", "+56912345678",
+                "Calle 1", "11.111.111-1", "plata"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_restaurar_en_base_nueva(self):
+        ruta_backup = self.json_manager.crear_backup(self.db_manager)
+        destino = os.path.join(self.tmp_dir, "restaurada.db")
+
+        estadisticas = restauracion.restaurar_masivo(
+            restauracion.leer_backup_json(ruta_backup, tamaño_lote=3), destino)
+        self.assertEqual(estadisticas['filas'], 10)
+
+        restaurada = DatabaseManager(destino)
+        self.assertEqual(
+            [c.obtener_informacion() for c in restaurada.obtener_todos_clientes()],
+            [c.obtener_informacion() for c in self.db_manager.obtener_todos_clientes()])
+
+        conn = sqlite3.connect(destino)
+        indices = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'")}
+        conn.close()
+        self.assertIn("idx_clientes_email", indices)
+        self.assertIn("idx_clientes_nombre", indices)
+
+        with self.assertRaises(sqlite3.IntegrityError):
+            conn = sqlite3.connect(destino)
+            conn.execute("INSERT INTO clientes (id, tipo, nombre, email, telefono, direccion) "
+                         "VALUES (99, 'Regular', 'X', 'cliente1@email.com', '1', 'D')")
+        conn.close()
+
+    def test_destino_existente(self):
+        ruta_backup = self.json_manager.crear_backup(self.db_manager)
+        with self.assertRaises(FileExistsError):
+            restauracion.restaurar_masivo(
+                restauracion.leer_backup_json(ruta_backup), self.db_manager.db_name)
+
+    def test_restaurar_backup_json_en_base_activa(self):
+        ruta_backup = self.json_manager.crear_backup(self.db_manager)
+        self.db_manager.eliminar_cliente(5)
+
+        self.assertTrue(self.json_manager.restaurar_backup(self.db_manager, ruta_backup))
+        self.assertEqual(self.db_manager.cargar_cliente(5).nivel, "plata")
+
+class TestBackupIncremental(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_manager = DatabaseManager(os.path.join(self.tmp_dir, "clientes.db"))
+        self.json_manager = JSONManager(os.path.join(self.tmp_dir, "backups"))
+
+        for i in range(1, 6):
+            self.db_manager.guardar_cliente(ClienteRegular(
+                i, f"Cliente {i}", f"cliente{i}@email.com", "+56912345678",
+                "Calle 1", "11.111.111-1", i))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_sin_base_no_crea_incremental(self):
+        self.assertIsNone(self.json_manager.crear_backup_incremental(self.db_manager))
+
+    def test_incremental_solo_incluye_cambios(self):
+        self.json_manager.crear_backup(self.db_manager, modo="nativo")
+        self.assertIsNone(self.json_manager.crear_backup_incremental(self.db_manager))
+
+        self.db_manager.guardar_cliente(ClienteRegular(
+            2, "Cliente Dos", "cliente2@email.com", "+56912345678",
+            "Calle 2", "11.111.111-1", 50))
+        self.db_manager.eliminar_cliente(3)
+
+        ruta = self.json_manager.crear_backup_incremental(self.db_manager)
+        self.assertIsNotNone(ruta)
+
+        with open(ruta, 'r', encoding='utf-8') as f:
+            contenido = json.load(f)
+
+        self.assertEqual([fila[0] for fila in contenido['filas']], [2])
+        self.assertEqual(contenido['eliminados'], [3])
+
+    def test_reemplazo_por_email_queda_en_la_cadena(self):
+        self.json_manager.crear_backup(self.db_manager, modo="nativo")
+
+        # Mismo email que el cliente 1: INSERT OR REPLACE borra la fila 1
+        self.db_manager.guardar_cliente(ClienteRegular(
+            10, "Cliente Diez", "cliente1@email.com", "+56912345678",
+            "Calle 1", "11.111.111-1", 1))
+        self.assertIsNone(self.db_manager.cargar_cliente(1))
+
+        ruta = self.json_manager.crear_backup_incremental(self.db_manager)
+        with open(ruta, 'r', encoding='utf-8') as f:
+            contenido = json.load(f)
+        self.assertEqual([fila[0] for fila in contenido['filas']], [10])
+        self.assertEqual(contenido['eliminados'], [1])
+
+        self.assertTrue(self.json_manager.restaurar_cadena(self.db_manager))
+        self.assertEqual(sorted(c.id for c in self.db_manager.obtener_todos_clientes()), [2, 3, 4, 5, 10])
+
+    def test_restaurar_cadena(self):
+        self.json_manager.crear_backup(self.db_manager, modo="nativo")
+
+        self.db_manager.eliminar_cliente(1)
+        self.json_manager.crear_backup_incremental(self.db_manager)
+
+        self.db_manager.guardar_cliente(ClienteRegular(
+            6, "Cliente 6", "cliente6@email.com", "+56912345678",
+            "Calle 6", "11.111.111-1", 6))
+        self.json_manager.crear_backup_incremental(self.db_manager)
+
+        self.db_manager.eliminar_cliente(6)
+        self.db_manager.guardar_cliente(ClienteRegular(
+            1, "Cliente 1", "cliente1@email.com", "+56912345678",
+            "Calle 1", "11.111.111-1", 1))
+
+        self.assertTrue(self.json_manager.restaurar_cadena(self.db_manager))
+
+        ids = sorted(c.id for c in self.db_manager.obtener_todos_clientes())
+        self.assertEqual(ids, [2, 3, 4, 5, 6])
+
+        self.db_manager.eliminar_cliente(2)
+        ruta = self.json_manager.crear_backup_incremental(self.db_manager)
+        with open(ruta, 'r', encoding='utf-8') as f:
+            contenido = json.load(f)
+        self.assertEqual(contenido['filas'], [])
+        self.assertEqual(contenido['eliminados'], [2])
+
+    def test_incremental_tras_restaurar_backup_anterior(self):
+        base = self.json_manager.crear_backup(self.db_manager, modo="nativo")
+        self.db_manager.eliminar_cliente(1)
+        self.assertIsNotNone(self.json_manager.crear_backup_incremental(self.db_manager))
+
+        for ruta in (base, self.json_manager.crear_backup(self.db_manager, modo="completo")):
+            self.assertTrue(self.json_manager.restaurar_backup(self.db_manager, ruta))
+            self.db_manager.guardar_cliente(ClienteRegular(
+                4, "Cliente Cuatro", "cliente4@email.com", "+56912345678",
+                "Calle 4", "11.111.111-1", 40))
+
+            ruta_incremental = self.json_manager.crear_backup_incremental(self.db_manager)
+            self.assertIsNotNone(ruta_incremental)
+            with open(ruta_incremental, 'r', encoding='utf-8') as f:
+                self.assertEqual([fila[0] for fila in json.load(f)['filas']], [4])
+
+            esperado = sorted(c.id for c in self.db_manager.obtener_todos_clientes())
+            self.db_manager.eliminar_cliente(5)
+            self.assertTrue(self.json_manager.restaurar_cadena(self.db_manager))
+            self.assertEqual(sorted(c.id for c in self.db_manager.obtener_todos_clientes()), esperado)
+
+class TestCatalogoBackups(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_manager = DatabaseManager(os.path.join(self.tmp_dir, "clientes.db"))
+        self.json_manager = JSONManager(os.path.join(self.tmp_dir, "backups"))
+
+        self.clientes = [ClienteRegular(
+            i, f"Cliente {i}", f"cliente{i}@email.com", "+56912345678",
+            "Calle 1", "11.111.111-1", i) for i in range(1, 4)]
+        for cliente in self.clientes:
+            self.db_manager.guardar_cliente(cliente)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_listar_desde_catalogo(self):
+        self.json_manager.exportar_clientes(self.clientes, "clientes_export_a.json")
+        self.json_manager.exportar_clientes_csv(self.clientes, "clientes_export_b.csv")
+        self.json_manager.crear_backup(self.db_manager, modo="nativo")
+
+        backups = {b['nombre']: b for b in self.json_manager.listar_backups()}
+
+        self.assertEqual(backups["clientes_export_a.json"]['filas'], 3)
+        self.assertEqual(backups["clientes_export_b.csv"]['formato'], "csv")
+        nativo = [b for b in backups.values() if b['tipo'] == "backup"][0]
+        self.assertEqual(nativo['filas'], 3)
+        self.assertEqual(len(nativo['checksum']), 64)
+
+    def test_catalogo_se_reconstruye(self):
+        self.json_manager.exportar_clientes(self.clientes, "clientes_export_a.json")
+        os.remove(self.json_manager.catalogo.ruta)
+
+        json_manager = JSONManager(self.json_manager.backup_dir)
+        nombres = [b['nombre'] for b in json_manager.listar_backups()]
+        self.assertEqual(nombres, ["clientes_export_a.json"])
+
+    def test_dos_instancias_comparten_catalogo(self):
+        otro = JSONManager(self.json_manager.backup_dir)
+        self.json_manager.listar_backups()
+        otro.listar_backups()
+
+        self.json_manager.exportar_clientes(self.clientes, "clientes_export_a.json")
+        otro.exportar_clientes(self.clientes, "clientes_export_b.json")
+
+        for manager in (self.json_manager, otro, JSONManager(self.json_manager.backup_dir)):
+            nombres = sorted(b['nombre'] for b in manager.listar_backups())
+            self.assertEqual(nombres, ["clientes_export_a.json", "clientes_export_b.json"])
+
+        otro.podar_backups(max_cantidad=0, tipo="export")
+        self.assertEqual(self.json_manager.listar_backups(), [])
+
+    def test_ultimo_backup_valido_verifica_checksum(self):
+        ruta = self.json_manager.crear_backup(self.db_manager, modo="nativo")
+        self.assertEqual(self.json_manager.buscar_ultimo_backup_valido(verificar=True), ruta)
+
+        with open(ruta, 'ab') as f:
+            f.write(b"corrupto")
+        self.assertIsNone(self.json_manager.buscar_ultimo_backup_valido(verificar=True))
+
+    def test_podar_por_cantidad(self):
+        for i in range(4):
+            self.json_manager.exportar_clientes(self.clientes, f"clientes_export_{i}.json")
+
+        eliminados = self.json_manager.podar_backups(max_cantidad=2, tipo="export")
+
+        self.assertEqual(len(eliminados), 2)
+        self.assertEqual(len(self.json_manager.listar_backups("export")), 2)
+        for nombre in eliminados:
+            self.assertFalse(os.path.exists(os.path.join(self.json_manager.backup_dir, nombre)))
+
+class TestRetencionBackups(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.json_manager = JSONManager(os.path.join(self.tmp_dir, "backups"))
+        self.clientes = [ClienteRegular(
+            1, "Cliente 1", "cliente1@email.com", "+56912345678",
+            "Calle 1", "11.111.111-1", 1)]
+
+        fechas = ["2026-10-19T10:00:00", "2026-10-19T09:00:00", "2026-10-18T10:00:00",
+                  "2026-10-12T10:00:00", "2026-09-30T10:00:00", "2026-08-31T10:00:00"]
+        for i in range(len(fechas)):
+            self.json_manager.exportar_clientes(self.clientes, f"backup_completo_{i}.json")
+
+        with open(self.json_manager.catalogo.ruta, 'r', encoding='utf-8') as f:
+            catalogo = json.load(f)
+        for i, fecha in enumerate(fechas):
+            catalogo['entradas'][f"backup_completo_{i}.json"]['fecha'] = fecha
+        with open(self.json_manager.catalogo.ruta, 'w', encoding='utf-8') as f:
+            json.dump(catalogo, f)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_abuelo_padre_hijo(self):
+        politica = PoliticaRetencion(ultimos=1, diarios=2, semanales=2, mensuales=3)
+        conservados = politica.seleccionar_conservados(self.json_manager.catalogo.listar())
+
+        self.assertEqual(conservados, {"backup_completo_0.json", "backup_completo_2.json",
+                                       "backup_completo_4.json", "backup_completo_5.json"})
+
+    def test_simulacion_no_elimina(self):
+        politica = PoliticaRetencion(ultimos=2, diarios=0, semanales=0, mensuales=0)
+        reporte = self.json_manager.aplicar_retencion(politica, simulacion=True)
+
+        self.assertEqual(len(reporte['eliminar']), 4)
+        self.assertGreater(reporte['bytes_liberados'], 0)
+        self.assertEqual(len(self.json_manager.listar_backups()), 6)
+
+        self.json_manager.aplicar_retencion(politica)
+        nombres = [b['nombre'] for b in self.json_manager.listar_backups()]
+        self.assertEqual(nombres, ["backup_completo_0.json", "backup_completo_1.json"])
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -8,6 +8,8 @@ from models.cliente_regular import ClienteRegular
 from models.cliente_premium import ClientePremium
 from models.cliente_corporativo import ClienteCorporativo
 from utils.validators import Validators
+from utils.rut import (digito_verificador, calcular_digitos_verificadores,
+                       validar_cuerpos_lote, generar_ruts)
 
 class TestClientes(unittest.TestCase):
     
@@ -143,5 +145,82 @@ class TestValidators(unittest.TestCase):
         valido, mensaje = validators.validar_rut("30.686.957-K")
         self.assertFalse(valido)
 
+class TestCacheValidacion(unittest.TestCase):
+    
+    def setUp(self):
+        Validators.invalidar_cache()
+    
+    def test_rut_normalizado_reutiliza_resultado(self):
+        resultado = Validators.validar_rut("30.686.957-4")
+        self.assertEqual(Validators.validar_rut("306869574"), resultado)
+        
+        estadisticas = Validators.estadisticas_cache()['rut']
+        self.assertEqual(estadisticas['aciertos'], 1)
+        self.assertEqual(estadisticas['fallos'], 1)
+        self.assertEqual(estadisticas['tasa_aciertos'], 0.5)
+    
+    def test_email_cache_no_altera_resultado(self):
+        self.assertEqual(Validators.validar_email_avanzado("Test@Example.com"),
+                         (True, "Email válido"))
+        self.assertEqual(Validators.validar_email_avanzado("test@example.com"),
+                         (True, "Email válido"))
+        self.assertFalse(Validators.validar_email_avanzado(None)[0])
+        self.assertEqual(Validators.estadisticas_cache()['email']['aciertos'], 1)
+    
+    def test_telefono_pais_no_depende_del_orden(self):
+        minusculas = Validators.validar_telefono_avanzado("912345678", "cl")
+        Validators.invalidar_cache("telefono")
+        mayusculas = Validators.validar_telefono_avanzado("912345678", "CL")
+        
+        self.assertEqual(minusculas, mayusculas)
+        self.assertEqual(Validators.validar_telefono_avanzado("912345678", "cl"), mayusculas)
+    
+    def test_errores_de_modelo_se_cachean(self):
+        for _ in range(3):
+            with self.assertRaises(ValueError):
+                ClienteRegular(1, "Test", "email-invalido", "123456789", "Dir", "1-9")
+        
+        self.assertEqual(Validators.estadisticas_cache()['cliente_email']['aciertos'], 2)
+    
+    def test_tamaño_acotado_e_invalidacion(self):
+        cache = Validators.validar_rut.cache
+        tamaño_original = cache.tamaño_maximo
+        cache.tamaño_maximo = 3
+        try:
+            for cuerpo in range(1000000, 1000010):
+                Validators.validar_rut(f"{cuerpo}-0")
+            self.assertEqual(cache.estadisticas()['tamaño'], 3)
+            
+            Validators.invalidar_cache("rut")
+            self.assertEqual(cache.estadisticas()['tamaño'], 0)
+        finally:
+            cache.tamaño_maximo = tamaño_original
+
+class TestRutLote(unittest.TestCase):
+    
+    def test_digitos_coinciden_con_validar_rut(self):
+        cuerpos = [1, 30686957, 76123456, 99999999, 123456789012345] + list(range(1000000, 1000200))
+        digitos = calcular_digitos_verificadores(cuerpos).decode('ascii')
+        
+        for cuerpo, dv in zip(cuerpos, digitos):
+            self.assertEqual(dv, digito_verificador(cuerpo))
+            self.assertTrue(Validators.validar_rut(f"{cuerpo}-{dv}")[0])
+        self.assertIn("K", digitos)
+    
+    def test_validar_lote_texto(self):
+        resultado = Validators.validar_ruts_lote(
+            ["30.686.957-4", "30.686.957-K", "306869574", "abc", None, "", "12.345.678-5"])
+        self.assertEqual(list(resultado), [1, 0, 1, 0, 0, 0, 1])
+    
+    def test_validar_cuerpos_lote(self):
+        self.assertEqual(list(validar_cuerpos_lote([30686957, 30686957], "4k")), [1, 0])
+        with self.assertRaises(ValueError):
+            validar_cuerpos_lote([30686957], "45")
+    
+    def test_generador_sintetico(self):
+        ruts = list(generar_ruts(500, semilla=7))
+        self.assertEqual(ruts, list(generar_ruts(500, semilla=7)))
+        self.assertTrue(all(Validators.validar_ruts_lote(ruts)))
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
\ No newline at end of file
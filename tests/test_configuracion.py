@@ -0,0 +1,123 @@
+import unittest
+import sys
+import os
+import io
+import json
+import shutil
+import tempfile
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.configuracion import ConfiguracionArchivo, obtener_configuracion
+from api_integrations.email_validator import crear_validador, SimpleEmailValidator, APIBasedEmailValidator
+from api_integrations.notification_service import NotificationService
+from tests.servidores_prueba import ServidorSMTPPrueba
+
+class TestConfiguracion(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.ruta = os.path.join(self.tmp_dir, "email_config.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _escribir(self, datos, ruta=None):
+        ruta = ruta or self.ruta
+        mtime_previa = os.stat(ruta).st_mtime_ns if os.path.exists(ruta) else 0
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(datos, f)
+        # Garantiza una mtime distinta aunque el sistema de archivos tenga poca resolución
+        os.utime(ruta, ns=(0, max(os.stat(ruta).st_mtime_ns, mtime_previa + 1_000_000_000)))
+
+    def test_se_comparte_y_lee_una_vez(self):
+        self._escribir({"smtp_server": "mail.empresa.cl", "smtp_port": 25})
+
+        salida = io.StringIO()
+        with redirect_stdout(salida):
+            servicios = [NotificationService(self.ruta) for _ in range(5)]
+        self.assertEqual(salida.getvalue(), "")
+
+        configuracion = obtener_configuracion('email', self.ruta)
+        self.assertIs(obtener_configuracion('email', self.ruta), configuracion)
+        self.assertEqual(configuracion.version, 1)
+        self.assertTrue(all(s.config is configuracion.valores for s in servicios))
+        self.assertEqual(servicios[0].config["smtp_server"], "mail.empresa.cl")
+        self.assertTrue(servicios[0].config["use_tls"])
+
+    def test_archivo_ausente_avisa_una_vez(self):
+        ruta = os.path.join(self.tmp_dir, "no_existe.json")
+
+        salida = io.StringIO()
+        with redirect_stdout(salida):
+            for _ in range(3):
+                NotificationService(ruta)
+        self.assertEqual(salida.getvalue().count("no encontrado"), 1)
+        self.assertEqual(obtener_configuracion('email', ruta)["smtp_port"], 587)
+
+    def test_recarga_por_mtime_y_valores_invalidos(self):
+        self._escribir({"timeout": 5})
+        configuracion = ConfiguracionArchivo(self.ruta, {"timeout": 10, "reintentos": 3},
+                                             validar=lambda v: [] if v["timeout"] > 0 else ["timeout"],
+                                             intervalo_verificacion=0)
+        self.assertEqual(configuracion.actual(), {"timeout": 5, "reintentos": 3})
+
+        self._escribir({"timeout": 1, "reintentos": 0})
+        self.assertEqual(configuracion["timeout"], 1)
+        self.assertEqual(configuracion.version, 2)
+
+        salida = io.StringIO()
+        with redirect_stdout(salida):
+            self._escribir({"timeout": -1})
+            self.assertEqual(configuracion["timeout"], 1)
+            configuracion.actual()
+        self.assertEqual(salida.getvalue().count("inválida"), 1)
+        self.assertEqual(configuracion.errores, ["timeout"])
+
+        with redirect_stdout(io.StringIO()):
+            with open(self.ruta, 'w') as f:
+                f.write("{no es json")
+            self.assertFalse(configuracion.recargar())
+        self.assertEqual(configuracion["timeout"], 1)
+
+    def test_sin_verificar_antes_del_intervalo(self):
+        self._escribir({"a": 1})
+        configuracion = ConfiguracionArchivo(self.ruta, intervalo_verificacion=3600)
+
+        self._escribir({"a": 2})
+        self.assertEqual(configuracion["a"], 1)
+        self.assertTrue(configuracion.recargar(forzar=False))
+        self.assertEqual(configuracion["a"], 2)
+
+    def test_servicio_usa_configuracion_recargada(self):
+        with ServidorSMTPPrueba() as primero, ServidorSMTPPrueba() as segundo:
+            self._escribir(primero.config())
+            servicio = NotificationService(self.ruta)
+            servicio._configuracion.intervalo_verificacion = 0
+            try:
+                self.assertTrue(servicio.enviar_notificacion_general("a@email.com", "Uno", "1"))
+                self._escribir(segundo.config())
+                self.assertTrue(servicio.enviar_notificacion_general("b@email.com", "Dos", "2"))
+            finally:
+                servicio.cerrar()
+
+            self.assertEqual(len(primero.mensajes), 1)
+            self.assertEqual(len(segundo.mensajes), 1)
+
+    def test_crear_validador(self):
+        ruta = os.path.join(self.tmp_dir, "validacion_config.json")
+        self.assertIsInstance(crear_validador(ruta), SimpleEmailValidator)
+
+        ruta_cache = os.path.join(self.tmp_dir, "cache_dominios.db")
+        self._escribir({"api_key": "clave", "peticiones_por_segundo": 5, "cache_dominios": ruta_cache}, ruta)
+        obtener_configuracion('validacion', ruta).recargar()
+        validador = crear_validador(ruta)
+        self.assertIsInstance(validador, APIBasedEmailValidator)
+        self.assertEqual(validador.api_key, "clave")
+        self.assertIsNotNone(validador.limitador)
+        self.assertEqual(validador.cache_dominios.db_name, ruta_cache)
+        self.assertTrue(os.path.exists(ruta_cache))
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
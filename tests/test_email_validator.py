@@ -0,0 +1,242 @@
+import unittest
+import sys
+import os
+import time
+import asyncio
+import tempfile
+import shutil
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from api_integrations.email_validator import APIBasedEmailValidator, SimpleEmailValidator, EmailValidator
+from api_integrations.dominios import IndiceDominios, CacheDominios, actualizar_lista, indice_por_defecto
+from utils.limitador import LimitadorTasa
+from tests.servidores_prueba import ServidorAPIEmailPrueba
+
+class TestLimitadorTasa(unittest.TestCase):
+
+    def test_rafaga_y_tasa_sostenida(self):
+        limitador = LimitadorTasa(50, capacidad=5)
+
+        inicio = time.perf_counter()
+        for _ in range(15):
+            limitador.adquirir()
+        transcurrido = time.perf_counter() - inicio
+
+        self.assertGreaterEqual(transcurrido, 0.18)
+        self.assertFalse(limitador.intentar_adquirir())
+
+class TestAPIBasedEmailValidator(unittest.TestCase):
+
+    def setUp(self):
+        self.servidor = ServidorAPIEmailPrueba().iniciar()
+        self.validator = APIBasedEmailValidator(
+            api_key="clave-prueba", base_url=self.servidor.url,
+            backoff_base=0.01, tamaño_lote=10)
+
+    def tearDown(self):
+        self.validator.cerrar()
+        self.servidor.detener()
+
+    def test_sin_api_key_usa_simulacion(self):
+        resultado = APIBasedEmailValidator().validar_email("usuario@gmail.com")
+        self.assertTrue(resultado['valido'])
+        self.assertEqual(resultado['detalles']['risk_level'], 'low')
+
+    def test_validar_email_por_http(self):
+        self.assertTrue(self.validator.validar_email("ana@empresa.cl")['valido'])
+
+        resultado = self.validator.validar_email("bot@mailinator.com")
+        self.assertFalse(resultado['valido'])
+        self.assertTrue(resultado['detalles']['disposable'])
+
+    def test_sesion_reutiliza_conexion(self):
+        for i in range(20):
+            self.validator.validar_email(f"cliente{i}@empresa.cl")
+
+        self.assertEqual(len(self.servidor.peticiones), 20)
+        self.assertEqual(len(self.servidor.conexiones), 1)
+
+    def test_lote_usa_endpoint_batch_y_conserva_orden(self):
+        emails = [f"cliente{i}@empresa.cl" for i in range(45)] + ["bot@mailinator.com", "cliente0@empresa.cl"]
+        resultados = self.validator.validar_lote(emails, max_concurrencia=4)
+
+        self.assertEqual(len(resultados), len(emails))
+        self.assertFalse(resultados[45]['valido'])
+        self.assertTrue(resultados[46]['valido'])
+        self.assertEqual([metodo for metodo, _ in self.servidor.peticiones], ['POST'] * 5)
+
+    def test_lote_sin_endpoint_batch_valida_uno_a_uno(self):
+        self.servidor._servidor.soporta_lote = False
+        resultados = self.validator.validar_lote([f"c{i}@empresa.cl" for i in range(5)])
+
+        self.assertTrue(all(r['valido'] for r in resultados))
+        self.assertFalse(self.validator.modo_lote)
+
+    def test_reintenta_errores_transitorios(self):
+        self.servidor.fallar_proximas(503, (429, {'Retry-After': '0'}))
+
+        resultado = self.validator.validar_email("ana@empresa.cl")
+
+        self.assertTrue(resultado['valido'])
+        self.assertEqual(self.validator.estadisticas['reintentos'], 2)
+        self.assertEqual(len(self.servidor.peticiones), 3)
+
+    def test_agota_reintentos_y_reporta_error(self):
+        self.servidor.fallar_proximas(*([500] * 4))
+
+        resultado = self.validator.validar_email("ana@empresa.cl")
+
+        self.assertFalse(resultado['valido'])
+        self.assertIn('Error en API', resultado['mensaje'])
+        self.assertEqual(len(self.servidor.peticiones), 4)
+
+    def test_error_no_reintentable(self):
+        self.servidor.fallar_proximas(401)
+
+        self.assertFalse(self.validator.validar_email("ana@empresa.cl")['valido'])
+        self.assertEqual(self.validator.estadisticas['reintentos'], 0)
+
+class TestVeredictosDominio(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.ruta_cache = os.path.join(self.tmp_dir, "cache_dominios.db")
+        self.servidor = ServidorAPIEmailPrueba().iniciar()
+
+    def tearDown(self):
+        self.servidor.detener()
+        shutil.rmtree(self.tmp_dir)
+
+    def _validator(self):
+        return APIBasedEmailValidator(api_key="clave-prueba", base_url=self.servidor.url,
+                                      cache_dominios=CacheDominios(self.ruta_cache))
+
+    def test_indice_coincide_subdominios(self):
+        indice = IndiceDominios(["mailinator.com", " YOPMAIL.com. "])
+
+        self.assertTrue(indice.contiene("mailinator.com"))
+        self.assertTrue(indice.contiene("mx1.Mailinator.com"))
+        self.assertTrue(indice.contiene("yopmail.com"))
+        self.assertFalse(indice.contiene("notmailinator.com"))
+        self.assertFalse(indice.contiene("com"))
+        self.assertEqual(indice.estadisticas()['aciertos'], 3)
+
+    def test_cache_persiste_y_expira(self):
+        CacheDominios(self.ruta_cache).guardar("empresa.cl", {'valido': True})
+        CacheDominios(self.ruta_cache).guardar("temporal.cl", {'valido': True}, ttl_segundos=0.05)
+
+        cache = CacheDominios(self.ruta_cache)
+        self.assertEqual(cache.obtener("EMPRESA.cl"), {'valido': True})
+        time.sleep(0.1)
+        self.assertIsNone(cache.obtener("temporal.cl"))
+        self.assertEqual(cache.purgar_expirados(), 1)
+
+    def test_desechables_se_rechazan_sin_red(self):
+        validator = self._validator()
+
+        self.assertFalse(validator.validar_email("alguien@mx.yopmail.com")['valido'])
+        self.assertFalse(SimpleEmailValidator().validar_email("alguien@guerrillamail.com")['valido'])
+        self.assertEqual(self.servidor.peticiones, [])
+
+    def test_lote_valida_cada_email_del_dominio(self):
+        validator = self._validator()
+        emails = ["ana@empresa.cl", "no es email@empresa.cl", "fake@empresa.cl", "luis@empresa.cl"]
+
+        resultados = validator.validar_lote(emails)
+
+        self.assertEqual([r['valido'] for r in resultados], [True, False, False, True])
+        self.assertEqual(resultados[1]['mensaje'], "Formato de email inválido")
+        self.assertTrue(resultados[2]['detalles']['disposable'])
+        self.assertEqual(len(self.servidor.peticiones), 1)
+
+    def test_solo_se_cachean_dominios_desechables(self):
+        validator = self._validator()
+        validator.validar_lote(["ana@dominio1.cl", "bot@mailinatorx.cl"])
+        self.assertEqual(len(self.servidor.peticiones), 1)
+
+        nuevo = self._validator()
+        resultado = nuevo.validar_email("otro@mailinatorx.cl")
+        self.assertFalse(resultado['valido'])
+        self.assertTrue(resultado['detalles']['en_cache'])
+        self.assertEqual(len(self.servidor.peticiones), 1)
+
+        self.assertTrue(nuevo.validar_email("luis@dominio1.cl")['valido'])
+        self.assertEqual(len(self.servidor.peticiones), 2)
+
+    def test_actualizar_lista_desde_archivo(self):
+        origen = os.path.join(self.tmp_dir, "origen.txt")
+        destino = os.path.join(self.tmp_dir, "desechables.txt")
+        with open(origen, 'w', encoding='utf-8') as f:
+            f.write("# lista\nNuevo-Temporal.com\n\nnuevo-temporal.com\notro.net  # comentario\n")
+
+        self.assertEqual(actualizar_lista(origen, destino), 2)
+        self.assertTrue(indice_por_defecto(destino).contiene("a.nuevo-temporal.com"))
+
+class _ValidatorLento(EmailValidator):
+
+    def __init__(self, demora):
+        super().__init__()
+        self.demora = demora
+        self.orden = []
+        self.simultaneos = {}
+        self.max_simultaneos = {}
+
+    def validar_email(self, email):
+        return {'valido': True, 'mensaje': 'Email válido', 'detalles': {}}
+
+    async def validar_email_async(self, email):
+        dominio = email.split('@')[1]
+        self.orden.append(email)
+        self.simultaneos[dominio] = self.simultaneos.get(dominio, 0) + 1
+        self.max_simultaneos[dominio] = max(self.max_simultaneos.get(dominio, 0), self.simultaneos[dominio])
+        await asyncio.sleep(self.demora)
+        self.simultaneos[dominio] -= 1
+        return self.validar_email(email)
+
+class TestValidacionAsync(unittest.TestCase):
+
+    def test_simple_async_coincide_con_sync(self):
+        validator = SimpleEmailValidator()
+        emails = ["ana@gmail.com", "mal-formato", "x@yopmail.com", "ana@gmail.com", "b@empresa.cl"]
+
+        resultados = asyncio.run(validator.validar_lote_async(emails))
+
+        self.assertEqual(resultados, [validator.validar_email(email) for email in emails])
+
+    def test_reparto_justo_y_limite_por_dominio(self):
+        validator = _ValidatorLento(0.01)
+        emails = [f"c{i}@grande.cl" for i in range(20)] + ["a@chico.cl", "b@chico.cl"]
+
+        asyncio.run(validator.validar_lote_async(emails, max_concurrencia=4, max_por_dominio=2))
+
+        self.assertLessEqual(validator.max_simultaneos['grande.cl'], 2)
+        self.assertIn("a@chico.cl", validator.orden[:4])
+        self.assertIn("b@chico.cl", validator.orden[:6])
+
+    def test_timeout_por_email(self):
+        validator = _ValidatorLento(0.5)
+
+        resultado = asyncio.run(validator.validar_lote_async(["a@lento.cl"], timeout=0.05))[0]
+
+        self.assertFalse(resultado['valido'])
+        self.assertEqual(resultado['mensaje'], 'Tiempo de espera agotado')
+
+    def test_api_async_contra_servidor_local(self):
+        with ServidorAPIEmailPrueba(latencia=0.01) as servidor:
+            for modo_lote in (False, True):
+                validator = APIBasedEmailValidator(api_key="clave-prueba", base_url=servidor.url,
+                                                   modo_lote=modo_lote, tamaño_lote=25)
+                emails = [f"c{i}@dominio{i % 3}.cl" for i in range(60)] + ["bot@mailinator.com"]
+
+                resultados = asyncio.run(validator.validar_lote_async(emails, max_concurrencia=8))
+                validator.cerrar()
+
+                self.assertEqual(len(resultados), len(emails))
+                self.assertTrue(all(r['valido'] for r in resultados[:60]))
+                self.assertFalse(resultados[60]['valido'])
+
+            self.assertEqual(len(servidor.peticiones), 60 + 3)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
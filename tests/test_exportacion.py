@@ -0,0 +1,329 @@
+import unittest
+import sys
+import os
+import csv
+import json
+import sqlite3
+import threading
+import tempfile
+import shutil
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from models.cliente_regular import ClienteRegular
+from models.cliente_premium import ClientePremium
+from models.cliente_corporativo import ClienteCorporativo
+from database.db_manager import DatabaseManager
+from database.json_manager import JSONManager
+from database.columnar import LectorColumnar
+from database.mapeo import compilar_mapeador_csv
+from database import particiones
+
+def crear_clientes_prueba(db_manager, cantidad=30):
+    for i in range(1, cantidad + 1):
+        if i % 3 == 0:
+            cliente = ClienteRegular(i, f"Regular {i}", f"regular{i}@email.com",
+                                     "+56912345678", "Calle 1", "11.111.111-1", i * 10)
+        elif i % 3 == 1:
+            cliente = ClientePremium(i, f"Premium {i}", f"premium{i}@email.com",
+                                     "+56912345678", "Calle 2", "22.222.222-2", "platino")
+            cliente.agregar_beneficio("envio gratis")
+            cliente.agregar_beneficio("soporte 24/7")
+        else:
+            cliente = ClienteCorporativo(i, f"Corporativo {i}", f"corp{i}@empresa.com",
+                                         "+56912345678", "Calle 3", f"Empresa {i % 4}",
+                                         "76.123.456-7")
+            cliente.actualizar_facturacion(i * 1000.5)
+        db_manager.guardar_cliente(cliente)
+
+class TestExportacionStream(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_manager = DatabaseManager(os.path.join(self.tmp_dir, "clientes.db"))
+        self.json_manager = JSONManager(os.path.join(self.tmp_dir, "backups"))
+        crear_clientes_prueba(self.db_manager)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _leer_csv(self, ruta):
+        with open(ruta, 'r', newline='', encoding='utf-8') as f:
+            return sorted(csv.DictReader(f), key=lambda fila: int(fila['id']))
+
+    def test_stream_equivale_a_exportacion_con_modelos(self):
+        ruta_modelos = self.json_manager.exportar_clientes_csv(
+            self.db_manager.obtener_todos_clientes(), "clientes_export_modelos.csv")
+        ruta_stream = self.json_manager.exportar_clientes_csv_stream(
+            self.db_manager, "clientes_export_stream.csv", tamaño_lote=7)
+
+        self.assertEqual(self._leer_csv(ruta_stream), self._leer_csv(ruta_modelos))
+
+    def test_stream_registra_filas_en_catalogo(self):
+        self.json_manager.exportar_clientes_csv_stream(self.db_manager, "clientes_export_stream.csv")
+
+        entrada = self.json_manager.listar_backups("export")[0]
+        self.assertEqual(entrada['filas'], 30)
+
+class TestMapeadorCSV(unittest.TestCase):
+
+    def test_nombres_de_campo_con_comillas(self):
+        campos = ["id", "it's", "x', '') or __import__('os').getcwd() or ('"]
+        mapear = compilar_mapeador_csv(campos)
+        fila = (1, "Regular", "Ana", "ana@email.com", "+56912345678", "Calle 1",
+                "2026-10-19", 1, json.dumps({"it's": "valor"}))
+
+        self.assertEqual(mapear(fila), (1, "valor", ""))
+        with self.assertRaises(ValueError):
+            compilar_mapeador_csv(["id", 3])
+
+class TestExportacionParticionada(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_manager = DatabaseManager(os.path.join(self.tmp_dir, "clientes.db"))
+        self.json_manager = JSONManager(os.path.join(self.tmp_dir, "backups"))
+        crear_clientes_prueba(self.db_manager, 45)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_particionado_equivale_a_exportacion(self):
+        ruta_modelos = self.json_manager.exportar_clientes(
+            self.db_manager.obtener_todos_clientes(), "clientes_export_modelos.json")
+        ruta = self.json_manager.exportar_clientes_particionado(
+            self.db_manager, num_particiones=4, procesos=2, nombre_archivo="clientes_export_p.json")
+
+        with open(ruta_modelos, 'r', encoding='utf-8') as f:
+            esperado = sorted(json.load(f), key=lambda c: c['id'])
+        with open(ruta, 'r', encoding='utf-8') as f:
+            obtenido = json.load(f)
+
+        self.assertEqual(obtenido, esperado)
+        self.assertEqual(self.json_manager.listar_backups()[0]['filas'], 45)
+
+    def test_particionado_sin_unir_genera_manifiesto(self):
+        ruta = self.json_manager.exportar_clientes_particionado(
+            self.db_manager, num_particiones=3, procesos=2, unir=False)
+
+        with open(ruta, 'r', encoding='utf-8') as f:
+            manifiesto = json.load(f)
+
+        self.assertEqual(len(manifiesto['particiones']), 3)
+        self.assertEqual(manifiesto['total_filas'], 45)
+        self.assertEqual([p['filas'] for p in manifiesto['particiones']], [15, 15, 15])
+
+    def test_particiones_de_un_mismo_instante(self):
+        calcular_limites = particiones.calcular_limites
+
+        def calcular_y_escribir(db_name, num_particiones):
+            limites = calcular_limites(db_name, num_particiones)
+            # Escrituras concurrentes entre el cálculo de límites y la lectura de las particiones
+            self.db_manager.eliminar_cliente(1)
+            self.db_manager.guardar_cliente(ClienteRegular(
+                100, "Nuevo", "nuevo@email.com", "+56912345678", "Calle 1", "11.111.111-1", 1))
+            return limites
+
+        particiones.calcular_limites = calcular_y_escribir
+        try:
+            ruta = self.json_manager.exportar_clientes_particionado(
+                self.db_manager, num_particiones=3, procesos=2, unir=False)
+        finally:
+            particiones.calcular_limites = calcular_limites
+
+        with open(ruta, 'r', encoding='utf-8') as f:
+            manifiesto = json.load(f)
+        self.assertEqual(manifiesto['total_filas'], 45)
+        self.assertIn('fecha', manifiesto)
+        self.assertEqual(sorted(os.listdir(os.path.dirname(ruta))),
+                         ["manifest.json", "parte_0000.json", "parte_0001.json", "parte_0002.json"])
+
+        ids = []
+        for parte in manifiesto['particiones']:
+            with open(os.path.join(os.path.dirname(ruta), parte['archivo']), 'r', encoding='utf-8') as f:
+                ids += [c['id'] for c in json.loads(f"[{f.read()}]")]
+        self.assertEqual(ids, list(range(1, 46)))
+
+class TestExportacionColumnar(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_manager = DatabaseManager(os.path.join(self.tmp_dir, "clientes.db"))
+        self.json_manager = JSONManager(os.path.join(self.tmp_dir, "backups"))
+        crear_clientes_prueba(self.db_manager)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_lectura_por_columnas(self):
+        ruta = self.json_manager.exportar_clientes_columnar(self.db_manager)
+        clientes = sorted(self.db_manager.obtener_todos_clientes(), key=lambda c: c.id)
+
+        with LectorColumnar(ruta) as lector:
+            self.assertEqual(lector.filas, 30)
+            self.assertEqual(lector.columna('id'), [c.id for c in clientes])
+            self.assertEqual(lector.columna('email'), [c.email for c in clientes])
+            self.assertEqual(lector.columna('tipo'), [c.obtener_tipo() for c in clientes])
+            self.assertEqual(len(lector.diccionario('tipo')), 3)
+            self.assertEqual(lector.columna('activo'), [True] * 30)
+
+            puntos = lector.columna('puntos_fidelidad')
+            self.assertEqual(puntos[2], 30)
+            self.assertIsNone(puntos[0])
+
+            facturacion = lector.valores('facturacion_mensual')
+            self.assertAlmostEqual(sum(facturacion), sum(
+                c.facturacion_mensual for c in clientes if isinstance(c, ClienteCorporativo)))
+            facturacion.release()
+
+    def test_archivo_invalido(self):
+        ruta = os.path.join(self.tmp_dir, "invalido.gicc")
+        with open(ruta, 'wb') as f:
+            f.write(b"\0" * 64)
+
+        with self.assertRaises(ValueError):
+            LectorColumnar(ruta)
+
+class TestImportacionIdempotente(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_manager = DatabaseManager(os.path.join(self.tmp_dir, "clientes.db"))
+        self.json_manager = JSONManager(os.path.join(self.tmp_dir, "backups"))
+        crear_clientes_prueba(self.db_manager, 12)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_guardar_cliente_sin_cambios_se_omite(self):
+        self.db_manager.reiniciar_estadisticas_guardado()
+        cliente = self.db_manager.cargar_cliente(3)
+
+        self.assertTrue(self.db_manager.guardar_cliente(cliente))
+        cliente.agregar_puntos(5)
+        self.assertTrue(self.db_manager.guardar_cliente(cliente))
+
+        self.assertEqual(self.db_manager.estadisticas_guardado,
+                         {'insertados': 0, 'actualizados': 1, 'omitidos': 1})
+        self.assertEqual(self.db_manager.cargar_cliente(3).puntos_fidelidad, 35)
+
+    def test_reimportacion_omite_filas_sin_cambios(self):
+        ruta = self.json_manager.exportar_clientes(self.db_manager.obtener_todos_clientes())
+
+        contadores = self.json_manager.importar_a_base(self.db_manager, ruta)
+        self.assertEqual(contadores, {'insertados': 0, 'actualizados': 0,
+                                      'omitidos': 12, 'invalidos': 0})
+
+        with open(ruta, 'r', encoding='utf-8') as f:
+            clientes = json.load(f)
+        clientes[0]['nombre'] = "Nombre Cambiado"
+        nuevo = dict(clientes[1], id=100, email="nuevo@email.com")
+        invalido = dict(clientes[2], id=101, email="email-invalido")
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(clientes + [nuevo, invalido], f)
+
+        contadores = self.json_manager.importar_a_base(self.db_manager, ruta, tamaño_lote=5)
+        self.assertEqual(contadores, {'insertados': 1, 'actualizados': 1,
+                                      'omitidos': 11, 'invalidos': 1})
+        self.assertEqual(self.db_manager.cargar_cliente(clientes[0]['id']).nombre, "Nombre Cambiado")
+        self.assertIsNotNone(self.db_manager.cargar_cliente(100))
+        self.assertIsNone(self.db_manager.cargar_cliente(101))
+
+    def test_importacion_informa_fallo_de_escritura(self):
+        ruta = self.json_manager.exportar_clientes(self.db_manager.obtener_todos_clientes())
+        with open(ruta, 'r', encoding='utf-8') as f:
+            clientes = json.load(f)
+        clientes[0]['nombre'] = "Nombre Cambiado"
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(clientes, f)
+
+        conn = sqlite3.connect(self.db_manager.db_name)
+        conn.execute("CREATE TRIGGER bloquear BEFORE INSERT ON clientes "
+                     "BEGIN SELECT RAISE(ABORT, 'escritura bloqueada'); END")
+        conn.commit()
+        conn.close()
+
+        self.assertIsNone(self.json_manager.importar_a_base(self.db_manager, ruta))
+        self.assertNotEqual(self.db_manager.cargar_cliente(clientes[0]['id']).nombre, "Nombre Cambiado")
+
+    def test_reimportacion_detecta_cambio_de_activo(self):
+        ruta = self.json_manager.exportar_clientes(self.db_manager.obtener_todos_clientes())
+        with open(ruta, 'r', encoding='utf-8') as f:
+            clientes = json.load(f)
+        clientes[0]['activo'] = False
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(clientes, f)
+
+        contadores = self.json_manager.importar_a_base(self.db_manager, ruta)
+        self.assertEqual(contadores, {'insertados': 0, 'actualizados': 1,
+                                      'omitidos': 11, 'invalidos': 0})
+        cliente = self.db_manager.cargar_cliente(clientes[0]['id'])
+        self.assertFalse(cliente.activo)
+
+        self.db_manager.reiniciar_estadisticas_guardado()
+        self.assertTrue(self.db_manager.guardar_cliente(cliente))
+        self.assertEqual(self.db_manager.estadisticas_guardado['omitidos'], 1)
+        cliente.activo = True
+        self.assertTrue(self.db_manager.guardar_cliente(cliente))
+        self.assertTrue(self.db_manager.cargar_cliente(clientes[0]['id']).activo)
+
+class TestSnapshotLectura(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_manager = DatabaseManager(os.path.join(self.tmp_dir, "clientes.db"))
+        self.json_manager = JSONManager(os.path.join(self.tmp_dir, "backups"))
+        for i in range(1, 21):
+            self.db_manager.guardar_cliente(ClienteRegular(
+                i, f"Cliente {i}", f"cliente{i}@email.com", "+56912345678",
+                "Calle 1", "11.111.111-1", 0))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _escribir_version(self, version):
+        for i in range(1, 21):
+            self.db_manager.guardar_cliente(ClienteRegular(
+                i, f"Cliente {i}", f"cliente{i}@email.com", "+56912345678",
+                "Calle 1", "11.111.111-1", version))
+
+    def test_exportacion_consistente_con_escrituras_concurrentes(self):
+        escritor_listo = threading.Event()
+        lectura_iniciada = threading.Event()
+
+        def escritor():
+            lectura_iniciada.wait(5)
+            for version in range(1, 4):
+                self._escribir_version(version)
+            escritor_listo.set()
+
+        hilo = threading.Thread(target=escritor)
+        hilo.start()
+
+        puntos = set()
+        with self.db_manager.snapshot() as snapshot:
+            for filas in snapshot.iterar_filas(tamaño_lote=2):
+                lectura_iniciada.set()
+                escritor_listo.wait(5)
+                puntos.update(json.loads(fila[-1])['puntos_fidelidad'] for fila in filas)
+
+        hilo.join(5)
+
+        self.assertTrue(escritor_listo.is_set(), "El snapshot no debe bloquear a los escritores")
+        self.assertEqual(puntos, {0})
+        self.assertEqual(self.db_manager.cargar_cliente(1).puntos_fidelidad, 3)
+
+    def test_varias_exportaciones_en_un_snapshot(self):
+        with self.db_manager.snapshot() as snapshot:
+            self._escribir_version(7)
+            ruta_csv = self.json_manager.exportar_clientes_csv_stream(
+                self.db_manager, "clientes_export_a.csv", snapshot=snapshot)
+            ruta_json = self.json_manager.crear_backup(self.db_manager, snapshot=snapshot)
+
+        with open(ruta_csv, 'r', newline='', encoding='utf-8') as f:
+            self.assertEqual({fila['puntos_fidelidad'] for fila in csv.DictReader(f)}, {'0'})
+        with open(ruta_json, 'r', encoding='utf-8') as f:
+            self.assertEqual({c['puntos_fidelidad'] for c in json.load(f)}, {0})
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
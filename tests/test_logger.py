@@ -0,0 +1,154 @@
+import unittest
+import sys
+import os
+import io
+import shutil
+import tempfile
+import threading
+from logging.handlers import QueueHandler
+from contextlib import redirect_stderr
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.logger import Logger, _configurados, leer_ultimas_lineas, leer_desde
+
+class TestLogger(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.consola = io.StringIO()
+        with redirect_stderr(self.consola):
+            self.logger = Logger(self.tmp_dir)
+
+    def tearDown(self):
+        self.logger.cerrar()
+        shutil.rmtree(self.tmp_dir)
+
+    def _lineas(self):
+        with open(os.path.join(self.tmp_dir, "gic.log"), 'r', encoding='utf-8') as f:
+            return f.read().splitlines()
+
+    def test_varias_instancias_no_duplican_lineas(self):
+        otro = Logger(self.tmp_dir)
+        self.logger.log("desde main")
+        otro.log("desde la GUI", "warning")
+        self.logger.cerrar()
+
+        lineas = self._lineas()
+        self.assertFalse(any(isinstance(h, QueueHandler) for h in self.logger.logger.handlers))
+        self.assertEqual(sum("desde main" in linea for linea in lineas), 1)
+        self.assertEqual(sum("desde la GUI" in linea for linea in lineas), 1)
+        self.assertEqual(sum("inicializado" in linea for linea in lineas), 1)
+        self.assertIn("WARNING - desde la GUI", lineas[-1])
+
+    def test_escritura_en_segundo_plano_y_niveles(self):
+        hilos = []
+        archivo = _configurados['GIC'][2].handlers[0]
+        original = archivo.emit
+
+        def emit(registro):
+            hilos.append(threading.current_thread())
+            original(registro)
+
+        archivo.emit = emit
+        self.logger.log("detalle", "DEBUG")
+        self.logger.log_operacion("admin", "Crear cliente", "id=7")
+        self.logger.log("nivel desconocido", "TRACE")
+        self.logger.cerrar()
+
+        self.assertGreaterEqual(len(hilos), 3)
+        self.assertNotIn(threading.current_thread(), hilos)
+        lineas = self._lineas()
+        self.assertIn("DEBUG - detalle", lineas[1])
+        self.assertIn("INFO - Usuario: admin - Operación: Crear cliente - Detalles: id=7", lineas[2])
+        self.assertIn("INFO - nivel desconocido", lineas[3])
+        self.assertNotIn("detalle\n", self.consola.getvalue())
+        self.assertIn("nivel desconocido", self.consola.getvalue())
+
+    def test_argumentos_y_excepciones(self):
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            self.logger.logger.exception("Error al guardar cliente %s", 42)
+        self.logger.cerrar()
+
+        contenido = "\n".join(self._lineas())
+        self.assertIn("ERROR - Error al guardar cliente 42", contenido)
+        self.assertIn("ZeroDivisionError: division by zero", contenido)
+
+    def test_reconfigura_tras_cerrar(self):
+        self.logger.cerrar()
+        with redirect_stderr(io.StringIO()):
+            self.logger = Logger(self.tmp_dir)
+        self.logger.log("segunda sesión")
+        self.logger.cerrar()
+
+        self.assertIn("segunda sesión", self._lineas()[-1])
+
+class TestLecturaLogs(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.ruta = os.path.join(self.tmp_dir, "gic.log")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _escribir(self, texto, modo='w'):
+        with open(self.ruta, modo, encoding='utf-8') as f:
+            f.write(texto)
+
+    def test_ultimas_lineas_por_bloques(self):
+        lineas = [f"línea {i} ñandú\n" for i in range(500)]
+        self._escribir("".join(lineas))
+
+        for tamaño_bloque in (7, 64, 65536):
+            self.assertEqual(leer_ultimas_lineas(self.ruta, 10, tamaño_bloque), lineas[-10:])
+            self.assertEqual(leer_ultimas_lineas(self.ruta, 1000, tamaño_bloque), lineas)
+        self.assertEqual(leer_ultimas_lineas(self.ruta, 0), [])
+
+        self._escribir("sin salto final", 'a')
+        self.assertEqual(leer_ultimas_lineas(self.ruta, 2, 16), [lineas[-1], "sin salto final"])
+
+        self._escribir("")
+        self.assertEqual(leer_ultimas_lineas(self.ruta, 5), [])
+
+    def test_seguir_desde_posicion(self):
+        self._escribir("a\nb\n")
+        lineas, posicion = leer_desde(self.ruta)
+        self.assertEqual(lineas, ["a\n", "b\n"])
+
+        self._escribir("c\nparcial", 'a')
+        lineas, posicion = leer_desde(self.ruta, posicion)
+        self.assertEqual(lineas, ["c\n"])
+
+        self._escribir(" completa\n", 'a')
+        lineas, posicion = leer_desde(self.ruta, posicion)
+        self.assertEqual(lineas, ["parcial completa\n"])
+
+        os.replace(self.ruta, self.ruta + ".1")
+        self._escribir("rotado, más largo que lo leído antes\n")
+        self.assertEqual(leer_desde(self.ruta, posicion)[0], ["rotado, más largo que lo leído antes\n"])
+
+        self._escribir("truncado\n")
+        self.assertEqual(leer_desde(self.ruta, (os.stat(self.ruta).st_ino, 500))[0], ["truncado\n"])
+
+    def test_logger_recientes_y_seguir(self):
+        with redirect_stderr(io.StringIO()):
+            logger = Logger(self.tmp_dir)
+        _, posicion = logger.seguir_logs()
+        logger.log("uno")
+        logger.log("dos")
+        logger.cerrar()
+
+        nuevas, posicion = logger.seguir_logs(posicion)
+        self.assertEqual([linea.split(" - ")[-1] for linea in nuevas[-2:]], ["uno\n", "dos\n"])
+        self.assertEqual(logger.seguir_logs(posicion), ([], posicion))
+        self.assertTrue(logger.obtener_logs_recientes(1)[0].endswith("dos\n"))
+
+        os.remove(self.ruta)
+        self.assertEqual(logger.obtener_logs_recientes(), ["Archivo de log no encontrado"])
+        self.assertEqual(logger.seguir_logs(posicion), ([], None))
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
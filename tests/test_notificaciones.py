@@ -0,0 +1,464 @@
+import unittest
+import sys
+import os
+import json
+import sqlite3
+import time
+import tempfile
+import shutil
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from api_integrations.notification_service import NotificationService
+from api_integrations.smtp_sesion import SesionSMTP
+from api_integrations.outbox import BandejaSalida, TrabajadoresOutbox
+from api_integrations.resumen import ResumenNotificaciones
+from api_integrations.plantillas import PlantillaCompilada, RegistroPlantillas, crear_registro_por_defecto
+from database.db_manager import DatabaseManager
+from tests.servidores_prueba import ServidorSMTPPrueba
+from tests.test_exportacion import crear_clientes_prueba
+
+class ClienteFalso:
+
+    def __init__(self, nombre, email, tipo="Regular"):
+        self.nombre = nombre
+        self.email = email
+        self.tipo = tipo
+
+    def obtener_tipo(self):
+        return self.tipo
+
+def crear_servicio(servidor, tmp_dir, **extra):
+    ruta = os.path.join(tmp_dir, "email_config.json")
+    with open(ruta, 'w') as f:
+        json.dump(servidor.config(**extra), f)
+    return NotificationService(ruta)
+
+class TestSesionSMTP(unittest.TestCase):
+
+    def setUp(self):
+        self.servidor = ServidorSMTPPrueba().iniciar()
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.servidor.detener()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_servicio_reutiliza_una_sesion(self):
+        servicio = crear_servicio(self.servidor, self.tmp_dir)
+
+        for i in range(10):
+            self.assertTrue(servicio.enviar_email_bienvenida(ClienteFalso(f"Cliente {i}", f"c{i}@empresa.cl")))
+        self.assertTrue(servicio.enviar_notificacion_general("ana@empresa.cl", "Aviso", "Hola"))
+        servicio.cerrar()
+
+        self.assertEqual(len(self.servidor.mensajes), 11)
+        self.assertEqual(self.servidor.conexiones, 1)
+        self.assertEqual(self.servidor.comandos.count("AUTH"), 1)
+        self.assertEqual(self.servidor.mensajes[0][1], ["c0@empresa.cl"])
+
+    def test_noop_detecta_conexion_cortada(self):
+        sesion = SesionSMTP(self.servidor.config(), verificar_tras=0)
+        sesion.enviar_bytes("a@b.cl", ["c@d.cl"], b"Subject: 1\r\n\r\nuno")
+        self.servidor.cortar_conexiones()
+        sesion.enviar_bytes("a@b.cl", ["c@d.cl"], b"Subject: 2\r\n\r\ndos")
+        sesion.cerrar()
+
+        self.assertEqual(len(self.servidor.mensajes), 2)
+        self.assertEqual(sesion.estadisticas['conexiones'], 2)
+        self.assertEqual(sesion.estadisticas['reconexiones'], 1)
+
+    def test_reintenta_si_la_conexion_cae_durante_el_envio(self):
+        sesion = SesionSMTP(self.servidor.config(), verificar_tras=3600)
+        sesion.enviar_bytes("a@b.cl", ["c@d.cl"], b"Subject: 1\r\n\r\nuno")
+        self.servidor.cortar_conexiones()
+        time.sleep(0.05)
+        sesion.enviar_bytes("a@b.cl", ["c@d.cl"], b"Subject: 2\r\n\r\ndos")
+        sesion.cerrar()
+
+        self.assertEqual(len(self.servidor.mensajes), 2)
+        self.assertEqual(sesion.estadisticas['noops'], 0)
+        self.assertEqual(sesion.estadisticas['reconexiones'], 1)
+
+    def test_rechazo_del_servidor_no_reconecta(self):
+        import smtplib
+
+        with ServidorSMTPPrueba(rechazados={"x1@d.cl", "x2@d.cl", "x3@d.cl"}) as servidor:
+            sesion = SesionSMTP(servidor.config(), verificar_tras=3600)
+            for i in range(1, 4):
+                with self.assertRaises(smtplib.SMTPRecipientsRefused):
+                    sesion.enviar_bytes("a@b.cl", [f"x{i}@d.cl"], b"Subject: 1\r\n\r\nuno")
+            sesion.enviar_bytes("a@b.cl", ["c@d.cl"], b"Subject: 2\r\n\r\ndos")
+            sesion.cerrar()
+
+            self.assertEqual(servidor.conexiones, 1)
+            self.assertEqual(servidor.comandos.count("AUTH"), 1)
+            self.assertEqual(len(servidor.mensajes), 1)
+            self.assertEqual(sesion.estadisticas['reconexiones'], 0)
+
+    def test_no_reenvia_si_la_conexion_cae_tras_data(self):
+        import smtplib
+
+        with ServidorSMTPPrueba(cortar_tras_datos=True) as servidor:
+            sesion = SesionSMTP(servidor.config())
+            with self.assertRaises(smtplib.SMTPServerDisconnected):
+                sesion.enviar_bytes("a@b.cl", ["c@d.cl"], b"Subject: 1\r\n\r\nuno")
+            sesion.cerrar()
+
+            self.assertEqual(len(servidor.mensajes), 1)
+            self.assertEqual(servidor.conexiones, 1)
+            self.assertFalse(sesion.conectada)
+
+    def test_cierre_por_inactividad(self):
+        sesion = SesionSMTP(self.servidor.config(), tiempo_inactividad=0.1)
+        sesion.enviar_bytes("a@b.cl", ["c@d.cl"], b"Subject: 1\r\n\r\nuno")
+        self.assertTrue(sesion.conectada)
+
+        time.sleep(0.3)
+
+        self.assertFalse(sesion.conectada)
+        self.assertIn("QUIT", self.servidor.comandos)
+
+def esperar(condicion, timeout=5.0):
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        if condicion():
+            return True
+        time.sleep(0.02)
+    return condicion()
+
+class TestBandejaSalida(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.bandeja = BandejaSalida(os.path.join(self.tmp_dir, "outbox.db"),
+                                     max_intentos=3, backoff_base=0)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _vaciar_con(self, emisor, num_trabajadores=2):
+        trabajadores = TrabajadoresOutbox(self.bandeja, lambda: emisor,
+                                          num_trabajadores=num_trabajadores, intervalo_sondeo=0.05)
+        trabajadores.iniciar()
+        return trabajadores
+
+    def test_clave_idempotencia(self):
+        primero = self.bandeja.encolar("a@b.cl", "Hola", "x", clave_idempotencia="bienvenida:a@b.cl")
+        segundo = self.bandeja.encolar("a@b.cl", "Hola", "x", clave_idempotencia="bienvenida:a@b.cl")
+        self.bandeja.encolar("a@b.cl", "Otro", "y")
+
+        self.assertEqual(primero, segundo)
+        self.assertEqual(self.bandeja.estadisticas()['pendientes'], 2)
+
+    def test_reintento_y_dead_letter(self):
+        intentos = {}
+
+        def emisor(mensaje):
+            intentos[mensaje['asunto']] = intentos.get(mensaje['asunto'], 0) + 1
+            if mensaje['asunto'] == 'siempre falla' or intentos[mensaje['asunto']] == 1:
+                raise ConnectionError("SMTP no disponible")
+
+        self.bandeja.encolar("a@b.cl", "falla una vez", "x")
+        self.bandeja.encolar("a@b.cl", "siempre falla", "x")
+        trabajadores = self._vaciar_con(emisor)
+        try:
+            self.assertTrue(esperar(lambda: self.bandeja.estadisticas()['profundidad'] == 0))
+        finally:
+            trabajadores.detener()
+
+        estadisticas = self.bandeja.estadisticas()
+        self.assertEqual((estadisticas['enviados'], estadisticas['fallidos']), (1, 1))
+        self.assertEqual(intentos, {'falla una vez': 2, 'siempre falla': 3})
+
+        fallido, = self.bandeja.listar_fallidos()
+        self.assertEqual(fallido['asunto'], 'siempre falla')
+        self.assertIn("SMTP no disponible", fallido['ultimo_error'])
+        self.assertEqual(self.bandeja.reintentar_fallidos(), 1)
+
+    def test_recupera_mensajes_huerfanos(self):
+        self.bandeja.encolar("a@b.cl", "Hola", "x")
+        self.assertEqual(len(self.bandeja.reclamar()), 1)
+        self.assertEqual(self.bandeja.reclamar(), [])
+
+        # Otro proceso que abre la bandeja no roba un reclamo vigente
+        reabierta = BandejaSalida(self.bandeja.db_name)
+        self.assertEqual(reabierta.estadisticas()['enviando'], 1)
+
+        reabierta = BandejaSalida(self.bandeja.db_name, tiempo_reclamo=0)
+        self.assertEqual(reabierta.estadisticas()['pendientes'], 1)
+
+    def test_trabajador_sobrevive_errores_de_base(self):
+        reclamar = self.bandeja.reclamar
+        fallos = [sqlite3.OperationalError("database is locked")] * 2
+
+        def reclamar_con_fallos(limite=1):
+            if fallos:
+                raise fallos.pop()
+            return reclamar(limite)
+
+        self.bandeja.reclamar = reclamar_con_fallos
+        enviados = []
+        self.bandeja.encolar("a@b.cl", "Hola", "x")
+        trabajadores = self._vaciar_con(enviados.append, num_trabajadores=1)
+        try:
+            self.assertTrue(esperar(lambda: len(enviados) == 1))
+            self.assertTrue(trabajadores.activo)
+        finally:
+            trabajadores.detener()
+        self.assertEqual(self.bandeja.estadisticas()['enviados'], 1)
+
+    def test_servicio_encola_sin_esperar_al_smtp(self):
+        with ServidorSMTPPrueba(latencia=0.2) as servidor:
+            servicio = crear_servicio(servidor, self.tmp_dir, outbox_db=self.bandeja.db_name)
+            servicio.iniciar_trabajadores(num_trabajadores=2)
+            try:
+                inicio = time.perf_counter()
+                for i in range(6):
+                    servicio.encolar_email_bienvenida(ClienteFalso(f"Cliente {i}", f"c{i}@empresa.cl"),
+                                                      clave_idempotencia=f"alta:{i}")
+                servicio.encolar_email_bienvenida(ClienteFalso("Cliente 0", "C0@empresa.cl"),
+                                                  clave_idempotencia="alta:0")
+                self.assertLess(time.perf_counter() - inicio, 0.2)
+
+                self.assertTrue(esperar(lambda: len(servidor.mensajes) == 6))
+            finally:
+                servicio.cerrar()
+
+            estadisticas = servicio.estadisticas_outbox()
+            self.assertEqual(estadisticas['enviados'], 6)
+            self.assertEqual(estadisticas['profundidad'], 0)
+            self.assertGreater(estadisticas['latencia_p95'], 0)
+
+    def test_reenvio_de_bienvenida_se_encola(self):
+        with ServidorSMTPPrueba() as servidor:
+            servicio = crear_servicio(servidor, self.tmp_dir, outbox_db=self.bandeja.db_name)
+            cliente = ClienteFalso("Cliente 1", "c1@empresa.cl")
+
+            primero = servicio.encolar_email_bienvenida(cliente)
+            self.bandeja.marcar_enviado(primero)
+            segundo = servicio.encolar_email_bienvenida(cliente)
+
+            self.assertNotEqual(primero, segundo)
+            self.assertEqual(servicio.estadisticas_outbox()['pendientes'], 1)
+
+    def test_sin_contrasena_no_encola(self):
+        with ServidorSMTPPrueba() as servidor:
+            servicio = crear_servicio(servidor, self.tmp_dir, outbox_db=self.bandeja.db_name, sender_password="")
+            self.assertIsNone(servicio.encolar_email_bienvenida(ClienteFalso("Cliente 1", "c1@empresa.cl")))
+            self.assertIsNone(servicio.notificar_evento("c1@empresa.cl", "Aviso", "x"))
+
+            self.assertEqual(servicio.estadisticas_outbox()['profundidad'], 0)
+            self.assertEqual(servidor.conexiones, 0)
+
+class TestResumenNotificaciones(unittest.TestCase):
+
+    def setUp(self):
+        self.enviados = []
+        self.resumen = ResumenNotificaciones(
+            lambda destinatario, asunto, mensaje, clave: self.enviados.append((destinatario, asunto, mensaje)),
+            ventana=0.2, max_eventos=10)
+
+    def test_agrupa_por_destinatario_en_la_ventana(self):
+        for i in range(4):
+            self.resumen.agregar("contacto@empresa.cl", f"Cambio {i}", f"Detalle {i}")
+        self.resumen.agregar("CONTACTO@empresa.cl ", "Cambio 4", "Detalle 4")
+        self.resumen.agregar("otro@empresa.cl", "Único", "Solo uno")
+        self.assertEqual(self.enviados, [])
+
+        self.assertTrue(esperar(lambda: len(self.enviados) == 2))
+        (destinatario, asunto, mensaje), solitario = self.enviados
+        self.assertEqual(destinatario, "contacto@empresa.cl")
+        self.assertEqual(asunto, "Resumen: 5 notificaciones de SolutionTech")
+        self.assertLess(mensaje.index("Cambio 0"), mensaje.index("Detalle 4"))
+        self.assertEqual(solitario, ("otro@empresa.cl", "Único", "Solo uno"))
+        self.assertEqual(self.resumen.estadisticas, {'eventos': 6, 'mensajes': 2, 'reintentos': 0})
+
+    def test_max_eventos_y_vaciar(self):
+        for i in range(12):
+            self.resumen.agregar("a@b.cl", f"Cambio {i}", "x")
+        self.assertEqual(len(self.enviados), 1)
+        self.assertEqual(self.resumen.pendientes, 2)
+
+        self.assertEqual(self.resumen.vaciar(), 1)
+        self.assertEqual(self.enviados[1][1], "Resumen: 2 notificaciones de SolutionTech")
+        self.assertEqual(self.resumen.pendientes, 0)
+
+    def test_reintenta_si_falla_el_envio(self):
+        fallos = [ConnectionError("bandeja no disponible")]
+
+        def enviar(destinatario, asunto, mensaje, clave):
+            if fallos:
+                raise fallos.pop()
+            self.enviados.append((destinatario, asunto, mensaje))
+
+        self.resumen.enviar = enviar
+        self.resumen.agregar("a@b.cl", "Cambio 0", "x")
+        self.resumen.agregar("a@b.cl", "Cambio 1", "x")
+        self.assertTrue(esperar(lambda: self.resumen.estadisticas['reintentos'] == 1))
+        self.assertEqual(self.resumen.pendientes, 2)
+
+        self.resumen.agregar("a@b.cl", "Cambio 2", "x")
+        self.assertTrue(esperar(lambda: len(self.enviados) == 1))
+        (_, asunto, mensaje), = self.enviados
+        self.assertEqual(asunto, "Resumen: 3 notificaciones de SolutionTech")
+        self.assertLess(mensaje.index("Cambio 0"), mensaje.index("Cambio 2"))
+        self.assertEqual(self.resumen.pendientes, 0)
+
+    def test_servicio_en_modo_resumen(self):
+        with ServidorSMTPPrueba() as servidor:
+            tmp_dir = tempfile.mkdtemp()
+            try:
+                servicio = crear_servicio(servidor, tmp_dir, resumen_ventana_segundos=3600,
+                                          outbox_db=os.path.join(tmp_dir, "outbox.db"))
+                servicio.iniciar_trabajadores(num_trabajadores=1)
+                for i in range(20):
+                    servicio.notificar_evento("contacto@empresa.cl", f"Actualización {i}", "Datos modificados")
+                self.assertEqual(servicio.vaciar_resumenes(), 1)
+                self.assertTrue(esperar(lambda: len(servidor.mensajes) == 1))
+                servicio.cerrar()
+
+                self.assertEqual(servicio.estadisticas_outbox()['enviados'], 1)
+                _, destinatarios, datos = servidor.mensajes[0]
+                self.assertEqual(destinatarios, ["contacto@empresa.cl"])
+                self.assertIn(b"Resumen: 20 notificaciones", datos)
+            finally:
+                shutil.rmtree(tmp_dir)
+
+class TestCampanaEmail(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.servidor = ServidorSMTPPrueba().iniciar()
+        self.servicio = crear_servicio(self.servidor, self.tmp_dir)
+        self.db_manager = DatabaseManager(os.path.join(self.tmp_dir, "clientes.db"))
+        crear_clientes_prueba(self.db_manager, 60)
+        self.segmento = {'tipo': 'Premium', 'datos': {'nivel': 'platino'}}
+
+    def tearDown(self):
+        self.servidor.detener()
+        shutil.rmtree(self.tmp_dir)
+
+    def _campana(self, **opciones):
+        return self.servicio.crear_campana(
+            "platino", self.db_manager, self.segmento,
+            "Novedades para {nombre}", "<p>Hola {nombre}, nivel {nivel}{inexistente}</p>",
+            directorio=os.path.join(self.tmp_dir, "campanas"), tamaño_pagina=6, **opciones)
+
+    def test_iterar_segmento_por_paginas(self):
+        paginas = list(self.db_manager.iterar_segmento(tipo="Premium", datos={'nivel': 'platino'},
+                                                       tamaño_pagina=6))
+
+        self.assertEqual([len(p) for p in paginas], [6, 6, 6, 2])
+        ids = [fila[0] for pagina in paginas for fila in pagina]
+        self.assertEqual(ids, list(range(1, 61, 3)))
+        self.assertEqual(list(self.db_manager.iterar_segmento(datos={'nivel': 'bronce'})), [])
+
+    def test_envia_mensajes_personalizados_al_segmento(self):
+        checkpoint = self._campana(num_conexiones=3).ejecutar()
+
+        self.assertTrue(checkpoint['completada'])
+        self.assertEqual((checkpoint['enviados'], checkpoint['fallidos']), (20, 0))
+        self.assertEqual(sorted(d[0] for _, d, _ in self.servidor.mensajes),
+                         sorted(f"premium{i}@email.com" for i in range(1, 61, 3)))
+        self.assertLessEqual(self.servidor.conexiones, 3)
+
+        _, destinatarios, datos = self.servidor.mensajes[0]
+        self.assertIn(b"Subject: Novedades para Premium", datos)
+
+    def test_construccion_en_procesos(self):
+        campana = self._campana(num_conexiones=2, procesos_mime=2, tamaño_lote_mime=4)
+        campana.ejecutar(progreso=lambda checkpoint: campana.detener())
+        self.assertEqual(len(self.servidor.mensajes), 6)
+
+        checkpoint = self._campana(procesos_mime=2).ejecutar()
+        self.assertEqual((checkpoint['enviados'], checkpoint['fallidos']), (20, 0))
+        self.assertEqual(sorted(d[0] for _, d, _ in self.servidor.mensajes),
+                         sorted(f"premium{i}@email.com" for i in range(1, 61, 3)))
+
+        _, _, datos = self.servidor.mensajes[0]
+        self.assertIn(b"Subject: Novedades para Premium", datos)
+        self.assertIn(b"nivel platino", datos)
+
+    def test_reanuda_desde_checkpoint(self):
+        campana = self._campana()
+        campana.ejecutar(progreso=lambda checkpoint: campana.detener())
+
+        self.assertEqual(len(self.servidor.mensajes), 6)
+        self.assertFalse(campana.progreso()['completada'])
+
+        checkpoint = self._campana().ejecutar()
+        self.assertTrue(checkpoint['completada'])
+        self.assertEqual(checkpoint['enviados'], 20)
+        self.assertEqual(len(self.servidor.mensajes), 20)
+        self.assertEqual(self._campana().ejecutar()['enviados'], 20)
+        self.assertEqual(len(self.servidor.mensajes), 20)
+
+    def test_limite_global_de_tasa(self):
+        inicio = time.perf_counter()
+        self._campana(num_conexiones=4, mensajes_por_segundo=80).ejecutar()
+
+        self.assertGreaterEqual(time.perf_counter() - inicio, 0.18)
+
+class TestPlantillas(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.registro = crear_registro_por_defecto(self.tmp_dir)
+        self.registro.intervalo_verificacion = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _escribir(self, nombre, texto):
+        ruta = os.path.join(self.tmp_dir, nombre)
+        with open(ruta, 'w', encoding='utf-8') as f:
+            f.write(texto)
+        return ruta
+
+    def test_plantilla_compilada(self):
+        plantilla = PlantillaCompilada("{{x}} {nombre} {saldo:.1f} {falta}", escapar_html=True)
+
+        self.assertEqual(plantilla.campos, ['nombre', 'saldo', 'falta'])
+        self.assertEqual(plantilla.renderizar({'nombre': "<Ana>", 'saldo': 2.25}), "{x} &lt;Ana&gt; 2.2 ")
+        self.assertEqual(PlantillaCompilada("fijo").renderizar({}), "fijo")
+
+        especializada = plantilla.especializar({'saldo': 1.0, 'falta': "a&b"})
+        self.assertEqual(especializada.campos, ['nombre'])
+        self.assertEqual(especializada.renderizar({'nombre': "Ana"}), "{x} Ana 1.0 a&amp;b")
+        with self.assertRaises(ValueError):
+            PlantillaCompilada("{cliente.nombre}")
+
+    def test_bienvenida_integrada(self):
+        html = self.registro.renderizar_bienvenida(ClienteFalso("Ana & Co", "ana@email.com", "Premium (oro)"))
+
+        self.assertIn("<strong>Ana &amp; Co</strong>", html)
+        self.assertIn("Como cliente premium (oro)", html)
+        self.assertIn(f"© {time.localtime().tm_year} SolutionTech", html)
+        self.assertIn("body { font-family", html)
+
+    def test_plantilla_por_tipo_y_recarga(self):
+        regular = ClienteFalso("Ana", "ana@email.com", "Regular")
+        premium = ClienteFalso("Luis", "luis@email.com", "Premium (platino)")
+        premium.nivel = "platino"
+
+        ruta = self._escribir("bienvenida_premium.html", "<p>{nombre}, nivel {nivel}</p>")
+        self.assertEqual(self.registro.renderizar_bienvenida(premium), "<p>Luis, nivel platino</p>")
+        self.assertIn("Estimado/a <strong>Ana</strong>", self.registro.renderizar_bienvenida(regular))
+
+        self._escribir("bienvenida_premium.html", "<p>Hola {nombre}</p>")
+        os.utime(ruta, ns=(0, os.stat(ruta).st_mtime_ns + 1_000_000_000))
+        self.assertEqual(self.registro.renderizar_bienvenida(premium), "<p>Hola Luis</p>")
+
+        os.remove(ruta)
+        self.assertIn("Estimado/a <strong>Luis</strong>", self.registro.renderizar_bienvenida(premium))
+
+    def test_sin_plantilla(self):
+        registro = RegistroPlantillas(self.tmp_dir)
+
+        self.assertIsNone(registro.obtener("bienvenida"))
+        with self.assertRaises(KeyError):
+            registro.renderizar_bienvenida(ClienteFalso("Ana", "ana@email.com"))
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
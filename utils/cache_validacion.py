@@ -0,0 +1,87 @@
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+_caches = {}
+
+class CacheValidacion:
+
+    def __init__(self, nombre, tamaño_maximo=4096):
+        self.nombre = nombre
+        self.tamaño_maximo = tamaño_maximo
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, clave):
+        with self._lock:
+            if clave in self._datos:
+                self._datos.move_to_end(clave)
+                self.aciertos += 1
+                return True, self._datos[clave]
+            self.fallos += 1
+            return False, None
+
+    def guardar(self, clave, valor):
+        with self._lock:
+            self._datos[clave] = valor
+            self._datos.move_to_end(clave)
+            if len(self._datos) > self.tamaño_maximo:
+                self._datos.popitem(last=False)
+
+    def invalidar(self):
+        with self._lock:
+            self._datos.clear()
+            self.aciertos = 0
+            self.fallos = 0
+
+    def estadisticas(self):
+        total = self.aciertos + self.fallos
+        return {
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'tamaño': len(self._datos),
+            'tamaño_maximo': self.tamaño_maximo,
+            'tasa_aciertos': self.aciertos / total if total else 0.0
+        }
+
+def cache_validacion(nombre, normalizar=None, tamaño_maximo=4096, errores=()):
+    cache = _caches.setdefault(nombre, CacheValidacion(nombre, tamaño_maximo))
+
+    def decorador(funcion):
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            try:
+                if normalizar:
+                    clave = normalizar(*args, **kwargs)
+                else:
+                    clave = (args, tuple(sorted(kwargs.items())))
+                encontrado, resultado = cache.obtener(clave)
+            except (TypeError, AttributeError):
+                return funcion(*args, **kwargs)
+
+            if not encontrado:
+                try:
+                    resultado = (True, funcion(*args, **kwargs))
+                except errores as e:
+                    resultado = (False, e)
+                cache.guardar(clave, resultado)
+
+            exito, valor = resultado
+            if not exito:
+                raise type(valor)(*valor.args)
+            return valor
+
+        envoltura.cache = cache
+        return envoltura
+
+    return decorador
+
+def estadisticas_caches():
+    return {nombre: cache.estadisticas() for nombre, cache in _caches.items()}
+
+def invalidar_caches(nombre=None):
+    for nombre_cache, cache in _caches.items():
+        if nombre is None or nombre_cache == nombre:
+            cache.invalidar()
@@ -0,0 +1,179 @@
+"""
+Configuración compartida por el proceso: cada archivo se lee una vez y se recarga al cambiar su mtime
+"""
+
+import json
+import os
+import threading
+import time
+
+_configuraciones = {}
+_lock = threading.Lock()
+
+def _validar_email(valores):
+    errores = []
+    if not isinstance(valores.get("smtp_server"), str) or not valores["smtp_server"].strip():
+        errores.append("smtp_server debe ser un texto no vacío")
+    puerto = valores.get("smtp_port")
+    if isinstance(puerto, bool) or not isinstance(puerto, int) or not 0 < puerto < 65536:
+        errores.append("smtp_port debe ser un entero entre 1 y 65535")
+    if not isinstance(valores.get("sender_email"), str) or "@" not in valores["sender_email"]:
+        errores.append("sender_email debe ser una dirección de email")
+    if not isinstance(valores.get("sender_password"), str):
+        errores.append("sender_password debe ser texto")
+    if not isinstance(valores.get("use_tls"), bool):
+        errores.append("use_tls debe ser true o false")
+    return errores
+
+def _validar_validacion(valores):
+    errores = []
+    if valores.get("api_key") is not None and not isinstance(valores["api_key"], str):
+        errores.append("api_key debe ser texto o null")
+    if not isinstance(valores.get("base_url"), str) or not valores["base_url"].startswith(("http://", "https://")):
+        errores.append("base_url debe ser una URL http(s)")
+    tasa = valores.get("peticiones_por_segundo")
+    if tasa is not None and (not isinstance(tasa, (int, float)) or tasa <= 0):
+        errores.append("peticiones_por_segundo debe ser un número positivo o null")
+    for clave in ("max_conexiones", "max_reintentos"):
+        if not isinstance(valores.get(clave), int) or valores[clave] < 0:
+            errores.append(f"{clave} debe ser un entero no negativo")
+    if not isinstance(valores.get("timeout"), (int, float)) or valores["timeout"] <= 0:
+        errores.append("timeout debe ser un número positivo")
+    if valores.get("cache_dominios") is not None and not isinstance(valores["cache_dominios"], str):
+        errores.append("cache_dominios debe ser una ruta o null")
+    return errores
+
+def _validar_base_datos(valores):
+    if not isinstance(valores.get("db_name"), str) or not valores["db_name"].strip():
+        return ["db_name debe ser una ruta no vacía"]
+    return []
+
+# nombre: (ruta, valores por defecto, validación, opcional)
+ESQUEMAS = {
+    'email': ("config/email_config.json", {
+        "smtp_server": "smtp.gmail.com",
+        "smtp_port": 587,
+        "sender_email": "notificaciones@solutiontech.com",
+        "sender_password": "",
+        "use_tls": True
+    }, _validar_email, False),
+    'validacion': ("config/validacion_config.json", {
+        "api_key": None,
+        "base_url": "https://api.emailvalidator.com/v1/",
+        "peticiones_por_segundo": None,
+        "max_conexiones": 10,
+        "max_reintentos": 3,
+        "timeout": 10.0,
+        "cache_dominios": "cache_dominios.db"
+    }, _validar_validacion, True),
+    'base_datos': ("config/database_config.json", {
+        "db_name": "clientes.db"
+    }, _validar_base_datos, True)
+}
+
+class ConfiguracionArchivo:
+    """Valores de un archivo JSON sobre unos valores por defecto.
+
+    `actual()` devuelve el diccionario vigente sin tocar el disco; la mtime
+    del archivo se consulta como mucho una vez cada `intervalo_verificacion`
+    segundos y, si cambió, se vuelve a leer. Un archivo inválido se informa
+    una vez y se siguen usando los últimos valores válidos.
+    """
+
+    def __init__(self, ruta, por_defecto=None, validar=None, opcional=False, intervalo_verificacion=2.0):
+        self.ruta = ruta
+        self.por_defecto = dict(por_defecto or {})
+        self.validar = validar
+        self.opcional = opcional
+        self.intervalo_verificacion = intervalo_verificacion
+        self.valores = dict(self.por_defecto)
+        self.version = 0
+        self.errores = []
+        self._mtime = False
+        self._ultima_verificacion = 0.0
+        self._lock = threading.Lock()
+        self.recargar()
+
+    def _leer_mtime(self):
+        try:
+            return os.stat(self.ruta).st_mtime_ns
+        except OSError:
+            return None
+
+    def recargar(self, forzar=True):
+        """Relee el archivo si cambió su mtime (siempre, con forzar=True); devuelve True si cambiaron los valores"""
+        with self._lock:
+            self._ultima_verificacion = time.monotonic()
+            mtime = self._leer_mtime()
+            if mtime == self._mtime and not forzar:
+                return False
+            self._mtime = mtime
+
+            if mtime is None:
+                if not self.opcional:
+                    print(f"Archivo de configuración no encontrado: {self.ruta}")
+                    print("Usando configuración por defecto (requiere ajustes)")
+                nuevos = dict(self.por_defecto)
+            else:
+                try:
+                    with open(self.ruta, 'r', encoding='utf-8') as f:
+                        datos = json.load(f)
+                    if not isinstance(datos, dict):
+                        raise ValueError("se esperaba un objeto JSON")
+                except (OSError, ValueError) as e:
+                    self.errores = [str(e)]
+                    print(f"Error al leer la configuración {self.ruta}: {e}")
+                    return False
+                nuevos = dict(self.por_defecto)
+                nuevos.update(datos)
+
+            errores = self.validar(nuevos) if self.validar else []
+            self.errores = errores
+            if errores:
+                print(f"Configuración inválida en {self.ruta}: {'; '.join(errores)}")
+                return False
+
+            if nuevos == self.valores and self.version:
+                return False
+            self.valores = nuevos
+            self.version += 1
+            return True
+
+    def actual(self):
+        """Valores vigentes (el mismo diccionario hasta la próxima recarga; no modificarlo)"""
+        if time.monotonic() - self._ultima_verificacion >= self.intervalo_verificacion:
+            self.recargar(forzar=False)
+        return self.valores
+
+    def get(self, clave, defecto=None):
+        return self.actual().get(clave, defecto)
+
+    def __getitem__(self, clave):
+        return self.actual()[clave]
+
+def obtener_configuracion(nombre, ruta=None, por_defecto=None, validar=None, opcional=False,
+                          intervalo_verificacion=2.0):
+    """Configuración compartida para `nombre` (un esquema de ESQUEMAS o una ruta a un JSON).
+
+    Todas las llamadas con la misma ruta devuelven el mismo objeto, así que el
+    archivo se lee una sola vez por proceso.
+    """
+    if nombre in ESQUEMAS:
+        ruta_esquema, por_defecto, validar, opcional = ESQUEMAS[nombre]
+        ruta = ruta or ruta_esquema
+    else:
+        ruta = ruta or nombre
+
+    clave = os.path.abspath(ruta)
+    with _lock:
+        configuracion = _configuraciones.get(clave)
+        if configuracion is None:
+            configuracion = _configuraciones[clave] = ConfiguracionArchivo(
+                ruta, por_defecto, validar, opcional, intervalo_verificacion)
+        return configuracion
+
+def recargar_configuraciones():
+    """Relee todos los archivos ya cargados; devuelve las rutas cuyos valores cambiaron"""
+    with _lock:
+        configuraciones = list(_configuraciones.values())
+    return [c.ruta for c in configuraciones if c.recargar()]
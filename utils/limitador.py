@@ -0,0 +1,43 @@
+import threading
+import time
+
+class LimitadorTasa:
+    """Cubeta de tokens: permite ráfagas de hasta `capacidad` y una tasa sostenida de `tasa` por segundo."""
+
+    def __init__(self, tasa, capacidad=None):
+        if tasa <= 0:
+            raise ValueError("La tasa debe ser positiva")
+        self.tasa = float(tasa)
+        self.capacidad = float(capacidad if capacidad is not None else max(1.0, tasa))
+        self._tokens = self.capacidad
+        self._ultimo = time.monotonic()
+        self._lock = threading.Lock()
+        self.segundos_espera = 0.0
+
+    def _recargar(self, ahora):
+        self._tokens = min(self.capacidad, self._tokens + (ahora - self._ultimo) * self.tasa)
+        self._ultimo = ahora
+
+    def intentar_adquirir(self, tokens=1):
+        with self._lock:
+            self._recargar(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def adquirir(self, tokens=1):
+        if tokens > self.capacidad:
+            raise ValueError("Se solicitan más tokens que la capacidad de la cubeta")
+
+        esperado = 0.0
+        while True:
+            with self._lock:
+                self._recargar(time.monotonic())
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    self.segundos_espera += esperado
+                    return esperado
+                espera = (tokens - self._tokens) / self.tasa
+            time.sleep(espera)
+            esperado += espera
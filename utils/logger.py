@@ -1,9 +1,105 @@
+import atexit
 import logging
 import os
+import queue
+import threading
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+NIVELES = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL
+}
+
+# nombre del logger -> (ruta del archivo, QueueHandler, QueueListener)
+_configurados = {}
+_lock = threading.Lock()
+
+def _detener_escucha(nombre):
+    configurado = _configurados.pop(nombre, None)
+    if configurado is None:
+        return
+    _, manejador_cola, escucha = configurado
+    logging.getLogger(nombre).removeHandler(manejador_cola)
+    escucha.stop()
+    for manejador in escucha.handlers:
+        manejador.close()
+
+def leer_ultimas_lineas(ruta, cantidad, tamaño_bloque=65536):
+    """Últimas `cantidad` líneas de `ruta`, leyendo bloques desde el final del archivo"""
+    if cantidad <= 0:
+        return []
+
+    with open(ruta, 'rb') as f:
+        posicion = f.seek(0, os.SEEK_END)
+        bloques = []
+        saltos = 0
+        # Con cantidad + 1 saltos de línea la primera línea devuelta está completa
+        while posicion > 0 and saltos <= cantidad:
+            leer = min(tamaño_bloque, posicion)
+            posicion -= leer
+            f.seek(posicion)
+            bloque = f.read(leer)
+            bloques.append(bloque)
+            saltos += bloque.count(b'\n')
+
+    lineas = b''.join(reversed(bloques)).splitlines(keepends=True)
+    return [linea.decode('utf-8', errors='replace') for linea in lineas[-cantidad:]]
+
+def leer_desde(ruta, posicion=None):
+    """(líneas completas escritas desde `posicion`, nueva posición).
+
+    La posición es (inodo, offset); si el archivo ya no es el mismo (fue
+    rotado) o es más corto que offset, se lee desde el principio. Una última
+    línea sin salto se deja para la próxima lectura.
+    """
+    with open(ruta, 'rb') as f:
+        inodo = os.fstat(f.fileno()).st_ino
+        tamaño = f.seek(0, os.SEEK_END)
+        offset = 0
+        if posicion is not None and posicion[0] == inodo and posicion[1] <= tamaño:
+            offset = posicion[1]
+        f.seek(offset)
+        datos = f.read(tamaño - offset)
+
+    completo = datos.rfind(b'\n') + 1
+    lineas = datos[:completo].splitlines(keepends=True)
+    return [linea.decode('utf-8', errors='replace') for linea in lineas], (inodo, offset + completo)
+
+class _ManejadorCola(QueueHandler):
+    """QueueHandler que no formatea en el hilo que llama.
+
+    Solo resuelve los argumentos del mensaje y el texto de la excepción (que
+    no se pueden diferir con seguridad); el formato completo lo aplican los
+    handlers del QueueListener.
+    """
+
+    def prepare(self, record):
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+@atexit.register
+def _detener_todos():
+    with _lock:
+        for nombre in list(_configurados):
+            _detener_escucha(nombre)
 
 class Logger:
+    """Logging de la aplicación sin E/S en el hilo que llama.
+
+    Los registros se encolan con un QueueHandler y un QueueListener en segundo
+    plano los escribe en el archivo rotativo y en consola. Todas las instancias
+    con el mismo archivo comparten la cola, así que crear varios Logger no
+    duplica las líneas. La cola se vacía con cerrar() o al terminar el proceso.
+    """
     
     def __init__(self, log_dir="logs", app_name="gic"):
         self.log_dir = log_dir
@@ -20,26 +116,40 @@ class Logger:
             
             self.logger.propagate = False
             
-            formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-                datefmt='%Y-%m-%d %H:%M:%S'
-            )
-            
-            log_file = os.path.join(self.log_dir, f"{self.app_name}.log")
-            file_handler = RotatingFileHandler(
-                log_file,
-                maxBytes=10485760,
-                backupCount=5
-            )
-            file_handler.setLevel(logging.DEBUG)
-            file_handler.setFormatter(formatter)
-            
-            console_handler = logging.StreamHandler()
-            console_handler.setLevel(logging.INFO)
-            console_handler.setFormatter(formatter)
+            log_file = os.path.abspath(os.path.join(self.log_dir, f"{self.app_name}.log"))
             
-            self.logger.addHandler(file_handler)
-            self.logger.addHandler(console_handler)
+            with _lock:
+                configurado = _configurados.get(self.logger.name)
+                if configurado is not None and configurado[0] == log_file:
+                    return
+                # Un único destino por proceso: otro archivo reemplaza al anterior
+                _detener_escucha(self.logger.name)
+                
+                formatter = logging.Formatter(
+                    '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                    datefmt='%Y-%m-%d %H:%M:%S'
+                )
+                
+                file_handler = RotatingFileHandler(
+                    log_file,
+                    maxBytes=10485760,
+                    backupCount=5,
+                    encoding='utf-8'
+                )
+                file_handler.setLevel(logging.DEBUG)
+                file_handler.setFormatter(formatter)
+                
+                console_handler = logging.StreamHandler()
+                console_handler.setLevel(logging.INFO)
+                console_handler.setFormatter(formatter)
+                
+                cola = queue.SimpleQueue()
+                manejador_cola = _ManejadorCola(cola)
+                escucha = QueueListener(cola, file_handler, console_handler, respect_handler_level=True)
+                escucha.start()
+                
+                self.logger.addHandler(manejador_cola)
+                _configurados[self.logger.name] = (log_file, manejador_cola, escucha)
             
             self.logger.info("Sistema de logging inicializado")
             
@@ -48,21 +158,13 @@ class Logger:
             logging.basicConfig(level=logging.INFO)
             self.logger = logging.getLogger('GIC_FALLBACK')
     
+    def cerrar(self):
+        """Escribe los registros pendientes y detiene el hilo de escritura"""
+        with _lock:
+            _detener_escucha(self.logger.name)
+    
     def log(self, mensaje, nivel="INFO"):
-        nivel = nivel.upper()
-        
-        if nivel == "DEBUG":
-            self.logger.debug(mensaje)
-        elif nivel == "INFO":
-            self.logger.info(mensaje)
-        elif nivel == "WARNING":
-            self.logger.warning(mensaje)
-        elif nivel == "ERROR":
-            self.logger.error(mensaje)
-        elif nivel == "CRITICAL":
-            self.logger.critical(mensaje)
-        else:
-            self.logger.info(mensaje)
+        self.logger.log(NIVELES.get(nivel.upper(), logging.INFO), mensaje)
     
     def log_operacion(self, usuario, operacion, detalles=""):
         mensaje = f"Usuario: {usuario} - Operación: {operacion}"
@@ -78,22 +180,35 @@ class Logger:
         
         self.log(mensaje, "ERROR")
     
+    def _ruta_log(self):
+        return os.path.join(self.log_dir, f"{self.app_name}.log")
+    
     def obtener_logs_recientes(self, lineas=50):
         try:
-            log_file = os.path.join(self.log_dir, f"{self.app_name}.log")
+            log_file = self._ruta_log()
             
             if not os.path.exists(log_file):
                 return ["Archivo de log no encontrado"]
             
-            with open(log_file, 'r', encoding='utf-8') as f:
-                todas_lineas = f.readlines()
-                lineas_recientes = todas_lineas[-lineas:] if len(todas_lineas) > lineas else todas_lineas
-            
-            return lineas_recientes
+            return leer_ultimas_lineas(log_file, lineas)
             
         except Exception as e:
             return [f"Error al leer logs: {str(e)}"]
     
+    def seguir_logs(self, posicion=None):
+        """Líneas añadidas al log desde `posicion` y la posición para la próxima llamada.
+        
+        Sin posición no devuelve líneas, solo la del final actual del archivo.
+        """
+        log_file = self._ruta_log()
+        if not os.path.exists(log_file):
+            return [], None
+        if posicion is None:
+            estado = os.stat(log_file)
+            return [], (estado.st_ino, estado.st_size)
+        
+        return leer_desde(log_file, posicion)
+    
     def crear_backup_logs(self):
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
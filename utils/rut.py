@@ -0,0 +1,101 @@
+import random
+
+DIGITOS_POR_BLOQUE = 4
+TAMAÑO_BLOQUE = 10 ** DIGITOS_POR_BLOQUE
+CUERPO_MAXIMO_TABLAS = TAMAÑO_BLOQUE ** 3 - 1
+
+def _tabla_bloque(posicion_inicial):
+    p = [2 + (posicion_inicial + i) % 6 for i in range(DIGITOS_POR_BLOQUE)]
+    bajos = [(n % 10) * p[0] + (n // 10) * p[1] for n in range(100)]
+    altos = [(n % 10) * p[2] + (n // 10) * p[3] for n in range(100)]
+    return bytes([(alto + bajo) % 11 for alto in altos for bajo in bajos])
+
+# Los pesos del Módulo 11 (2..7) se repiten cada 6 dígitos, así que tres
+# tablas de bloques de 4 dígitos cubren cualquier posición del cuerpo.
+_TABLAS = (_tabla_bloque(0), _tabla_bloque(4), _tabla_bloque(8))
+_T0, _T1, _T2 = _TABLAS
+
+# Índice: suma de los residuos de los tres bloques (0..30).
+_DV_POR_SUMA = bytes(b"0K987654321"[s % 11] for s in range(31))
+
+def digito_verificador(cuerpo):
+    cuerpo = int(cuerpo)
+    if cuerpo < 0:
+        raise ValueError("El cuerpo del RUT no puede ser negativo")
+
+    if cuerpo <= CUERPO_MAXIMO_TABLAS:
+        suma = (_T0[cuerpo % TAMAÑO_BLOQUE] + _T1[cuerpo // TAMAÑO_BLOQUE % TAMAÑO_BLOQUE]
+                + _T2[cuerpo // (TAMAÑO_BLOQUE * TAMAÑO_BLOQUE)])
+        return chr(_DV_POR_SUMA[suma])
+
+    suma, bloque = 0, 0
+    while cuerpo:
+        suma += _TABLAS[bloque % 3][cuerpo % TAMAÑO_BLOQUE]
+        cuerpo //= TAMAÑO_BLOQUE
+        bloque += 1
+    return chr(_DV_POR_SUMA[suma % 11])
+
+def calcular_digitos_verificadores(cuerpos):
+    """Devuelve un bytes con un dígito verificador (b'0'-b'9' o b'K') por cuerpo."""
+    if not isinstance(cuerpos, (list, tuple)):
+        cuerpos = list(cuerpos)
+    if cuerpos and min(cuerpos) < 0:
+        raise ValueError("El cuerpo del RUT no puede ser negativo")
+
+    n, n2, dv = TAMAÑO_BLOQUE, TAMAÑO_BLOQUE * TAMAÑO_BLOQUE, _DV_POR_SUMA
+    try:
+        return bytes([dv[_T0[c % n] + _T1[c // n % n] + _T2[c // n2]] for c in cuerpos])
+    except (IndexError, TypeError):
+        return "".join(digito_verificador(c) for c in cuerpos).encode('ascii')
+
+def validar_cuerpos_lote(cuerpos, digitos):
+    """Compara cada cuerpo con su dígito verificador; devuelve un bytearray de 0/1."""
+    if isinstance(digitos, str):
+        digitos = digitos.encode('ascii')
+    calculados = calcular_digitos_verificadores(cuerpos)
+    if len(calculados) != len(digitos):
+        raise ValueError("Cantidad de cuerpos y dígitos verificadores distinta")
+    return bytearray(map(int.__eq__, calculados, bytes(digitos).upper()))
+
+def validar_ruts_lote(ruts):
+    """Valida RUTs en texto ("12.345.678-5", "123456785"); devuelve un bytearray de 0/1."""
+    n, n2, dv = TAMAÑO_BLOQUE, TAMAÑO_BLOQUE * TAMAÑO_BLOQUE, _DV_POR_SUMA
+    resultado = bytearray()
+    agregar = resultado.append
+
+    for rut in ruts:
+        try:
+            limpio = rut.replace('.', '').replace('-', '').replace(' ', '')
+            cuerpo = limpio[:-1]
+            if not cuerpo.isdigit():
+                agregar(0)
+                continue
+            c = int(cuerpo)
+            if c <= CUERPO_MAXIMO_TABLAS:
+                calculado = dv[_T0[c % n] + _T1[c // n % n] + _T2[c // n2]]
+            else:
+                calculado = ord(digito_verificador(c))
+            agregar(calculado == ord(limpio[-1].upper()))
+        except (AttributeError, ValueError, TypeError):
+            agregar(0)
+
+    return resultado
+
+def formatear_rut(cuerpo, dv):
+    return f"{int(cuerpo):,}".replace(",", ".") + "-" + dv
+
+def generar_ruts(cantidad, minimo=1000000, maximo=30000000, semilla=None,
+                 formateado=True, tamaño_lote=10000):
+    generador = random.Random(semilla)
+
+    for inicio in range(0, cantidad, tamaño_lote):
+        cuerpos = [generador.randint(minimo, maximo)
+                   for _ in range(min(tamaño_lote, cantidad - inicio))]
+        digitos = calcular_digitos_verificadores(cuerpos).decode('ascii')
+
+        if formateado:
+            for cuerpo, dv in zip(cuerpos, digitos):
+                yield formatear_rut(cuerpo, dv)
+        else:
+            for cuerpo, dv in zip(cuerpos, digitos):
+                yield f"{cuerpo}-{dv}"
@@ -1,17 +1,41 @@
 import re
-try:
-    import phonenumbers
-except ImportError:
-    phonenumbers = None
 from datetime import datetime
+from utils.cache_validacion import cache_validacion, estadisticas_caches, invalidar_caches
+from utils.rut import digito_verificador, formatear_rut, validar_ruts_lote
+
+PATRON_EMAIL = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+PATRON_PUNTOS_CONSECUTIVOS = re.compile(r'[\.]{2,}')
+PATRON_NO_TELEFONO = re.compile(r'[^\d+]')
+PATRON_SEPARADORES_TELEFONO = re.compile(r'[\s\-\(\)\.]')
+PATRON_NO_RUT = re.compile(r'[^\dkK]')
+
+_phonenumbers = False
+
+def _cargar_phonenumbers():
+    global _phonenumbers
+    if _phonenumbers is False:
+        try:
+            import phonenumbers
+            _phonenumbers = phonenumbers
+        except ImportError:
+            _phonenumbers = None
+    return _phonenumbers
 
 class Validators:
     
     @staticmethod
+    def estadisticas_cache():
+        return estadisticas_caches()
+    
+    @staticmethod
+    def invalidar_cache(nombre=None):
+        invalidar_caches(nombre)
+    
+    @staticmethod
+    @cache_validacion("email", normalizar=lambda email: email.lower())
     def validar_email_avanzado(email):
         try:
-            patron = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-            if not re.match(patron, email):
+            if not PATRON_EMAIL.match(email):
                 return False, "Formato de email inválido"
             
             if len(email) > 254:
@@ -25,7 +49,7 @@ class Validators:
             if domain.startswith('.') or domain.endswith('.'):
                 return False, "Dominio inválido"
             
-            if re.search(r'[\.]{2,}', local_part):
+            if PATRON_PUNTOS_CONSECUTIVOS.search(local_part):
                 return False, "Puntos consecutivos no permitidos"
             
             if local_part.startswith('.') or local_part.endswith('.'):
@@ -37,7 +61,12 @@ class Validators:
             return False, f"Error en validación: {str(e)}"
     
     @staticmethod
+    @cache_validacion("telefono", normalizar=lambda telefono, pais="CL": (
+        PATRON_SEPARADORES_TELEFONO.sub('', telefono), pais.upper()))
     def validar_telefono_avanzado(telefono, pais="CL"):
+        # La caché normaliza el país a mayúsculas, así que el resultado no puede depender de ellas
+        pais = pais.upper()
+        phonenumbers = _cargar_phonenumbers()
         if phonenumbers:
             try:
                 numero = phonenumbers.parse(telefono, pais)
@@ -58,7 +87,7 @@ class Validators:
             except phonenumbers.phonenumberutil.NumberParseException:
                 pass
             
-        telefono_limpio = re.sub(r'[^\d+]', '', telefono)
+        telefono_limpio = PATRON_NO_TELEFONO.sub('', telefono)
         
         if len(telefono_limpio) < 8:
             return False, "Teléfono demasiado corto"
@@ -72,9 +101,10 @@ class Validators:
         return True, telefono_limpio
     
     @staticmethod
+    @cache_validacion("rut", normalizar=lambda rut: PATRON_NO_RUT.sub('', str(rut)).upper())
     def validar_rut(rut):
         try:
-            rut_limpio = re.sub(r'[^\dkK]', '', str(rut))
+            rut_limpio = PATRON_NO_RUT.sub('', str(rut))
             
             if len(rut_limpio) < 2:
                 return False, "RUT demasiado corto"
@@ -85,34 +115,18 @@ class Validators:
             if not cuerpo.isdigit():
                 return False, "Cuerpo del RUT debe ser numérico"
             
-            suma = 0
-            multiplo = 2
-            
-            for c in reversed(cuerpo):
-                suma += int(c) * multiplo
-                multiplo += 1
-                if multiplo == 8:
-                    multiplo = 2
-            
-            residuo = suma % 11
-            resultado = 11 - residuo
-            
-            if resultado == 11:
-                dv_calculado = '0'
-            elif resultado == 10:
-                dv_calculado = 'K'
-            else:
-                dv_calculado = str(resultado)
-            
-            if dv == dv_calculado:
-                rut_formateado = f"{int(cuerpo):,}".replace(",", ".") + "-" + dv
-                return True, f"RUT válido: {rut_formateado}"
+            if dv == digito_verificador(cuerpo):
+                return True, f"RUT válido: {formatear_rut(cuerpo, dv)}"
             else:
                 return False, "Dígito verificador inválido"
                 
         except Exception as e:
             return False, f"Error en validación RUT: {str(e)}"
     
+    @staticmethod
+    def validar_ruts_lote(ruts):
+        return validar_ruts_lote(ruts)
+    
     @staticmethod
     def validar_direccion_completa(direccion):
         try: